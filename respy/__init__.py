@@ -5,7 +5,10 @@ try:
 except ImportError:
     pass
 
+from respy.python.shared.shared_context import run_context
+from respy.estimate import estimate_multistart
 from respy.estimate import estimate
+from respy.evaluate import evaluate
 from respy.simulate import simulate
 from respy.clsRespy import RespyCls
 
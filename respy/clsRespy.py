@@ -7,6 +7,7 @@ import pandas as pd
 import numpy as np
 
 from respy.python.shared.shared_auxiliary import replace_missing_values
+from respy.python.shared.shared_constants import EMAX_MEMORY_BUDGET
 from respy.python.shared.shared_auxiliary import check_model_parameters
 from respy.python.shared.shared_auxiliary import cholesky_to_coeffs
 from respy.python.shared.shared_auxiliary import print_init_dict
@@ -23,7 +24,8 @@ SOLUTION_ATTR = ['periods_payoffs_systematic', 'states_number_period']
 SOLUTION_ATTR += ['mapping_state_idx', 'periods_emax', 'states_all']
 
 # Full list of admissible optimizers
-OPTIMIZERS = ['SCIPY-BFGS', 'SCIPY-POWELL', 'FORT-NEWUOA', 'FORT-BFGS']
+OPTIMIZERS = ['SCIPY-BFGS', 'SCIPY-POWELL', 'PYTH-BHHH', 'FORT-NEWUOA',
+    'FORT-BFGS']
 
 
 class RespyCls(object):
@@ -96,6 +98,12 @@ class RespyCls(object):
 
         self.attr['maxfun'] = None
 
+        self.attr['cache'] = None
+
+        self.attr['chunk_sim'] = None
+
+        self.attr['memory_budget'] = None
+
         self.attr['delta'] = None
 
         self.attr['tau'] = None
@@ -116,6 +124,8 @@ class RespyCls(object):
 
         self.attr['states_all'] = None
 
+        self.attr['solution_hash'] = None
+
         # Initialization
         self._update_core_attributes()
 
@@ -343,6 +353,8 @@ class RespyCls(object):
         for label in SOLUTION_ATTR:
             self.attr[label] = None
 
+        self.attr['solution_hash'] = None
+
         self.attr['is_solved'] = False
 
     def check_equal_solution(self, other):
@@ -353,7 +365,8 @@ class RespyCls(object):
 
         for key_ in SOLUTION_ATTR:
             try:
-                np.testing.assert_almost_equal(self.attr[key_], other.attr[key_])
+                np.testing.assert_almost_equal(np.array(self.attr[key_]),
+                    np.array(other.attr[key_]))
             except AssertionError:
                 return False
 
@@ -422,6 +435,21 @@ class RespyCls(object):
         self.attr['scaling'][0] = init_dict['SCALING']['flag']
         self.attr['scaling'][1] = init_dict['SCALING']['minimum']
 
+        # The cache of the criterion function is not part of the
+        # initialization file. It is disabled by default and holds the
+        # maximum number of values and the file to store them.
+        self.attr['cache'] = [0, None]
+
+        # The size of the chunks for the simulation is not part of the
+        # initialization file either. By default, all agents are simulated
+        # at once.
+        self.attr['chunk_sim'] = 0
+
+        # The memory budget in megabytes for the temporary arrays of the
+        # PYTHON version is not part of the initialization file either. It
+        # allows to increase the number of draws on nodes with little memory.
+        self.attr['memory_budget'] = EMAX_MEMORY_BUDGET
+
         # Initialize model parameters
         self.attr['model_paras'] = dict()
 
@@ -551,6 +579,12 @@ class RespyCls(object):
 
         maxfun = self.attr['maxfun']
 
+        cache = self.attr['cache']
+
+        chunk_sim = self.attr['chunk_sim']
+
+        memory_budget = self.attr['memory_budget']
+
         delta = self.attr['delta']
 
         tau = self.attr['tau']
@@ -562,7 +596,7 @@ class RespyCls(object):
         assert (is_parallel in [True, False])
         assert (num_procs > 0)
         if is_parallel:
-            assert (version == 'FORTRAN')
+            assert (num_procs > 1)
 
         # Status of optimization parameters
         assert isinstance(paras_fixed, list)
@@ -621,7 +655,7 @@ class RespyCls(object):
         assert (delta >= 0.00)
 
         # Version version of package
-        assert (version in ['FORTRAN', 'PYTHON'])
+        assert (version in ['FORTRAN', 'PYTHON', 'NUMBA'])
 
         # Shock distribution
         assert (isinstance(shocks_cholesky, np.ndarray))
@@ -642,8 +676,7 @@ class RespyCls(object):
         assert (maxfun >= 0)
 
         # Optimizers
-        assert (optimizer_used in ['SCIPY-BFGS', 'SCIPY-POWELL',
-            'FORT-NEWUOA', 'FORT-BFGS'])
+        assert (optimizer_used in OPTIMIZERS)
 
         # Scaling
         assert (scaling[0] in [True, False])
@@ -651,15 +684,37 @@ class RespyCls(object):
         assert (scaling[1] > 0.0)
 
         # Derivatives
-        assert (derivatives[0] in ['FORWARD-DIFFERENCES'])
+        assert (derivatives[0] in ['FORWARD-DIFFERENCES',
+            'CENTRAL-DIFFERENCES'])
         assert (isinstance(derivatives[1], float))
         assert (derivatives[1] > 0.0)
 
+        # Cache
+        assert (isinstance(cache[0], int))
+        assert (cache[0] >= 0)
+        assert (cache[1] is None) or isinstance(cache[1], str)
+        if cache[0] > 0:
+            assert (version in ['PYTHON', 'NUMBA'])
+
+        # Chunks
+        assert (isinstance(chunk_sim, int))
+        assert (chunk_sim >= 0)
+        if chunk_sim > 0:
+            assert (version in ['PYTHON', 'NUMBA'])
+
+        # Memory budget. This is only relevant for the PYTHON version, as the
+        # JIT-compiled kernels of the NUMBA version do not require any large
+        # temporary arrays.
+        assert (isinstance(memory_budget, (float, int)))
+        assert (not isinstance(memory_budget, bool))
+        assert (np.isfinite(memory_budget))
+        assert (memory_budget > 0.0)
+
     def _check_integrity_results(self):
         """ This methods check the integrity of the results.
         """
         # Check if solution attributes well maintained.
-        for label in SOLUTION_ATTR:
+        for label in SOLUTION_ATTR + ['solution_hash']:
             if self.attr['is_solved']:
                 assert (self.attr[label] is not None)
             else:
@@ -684,9 +739,11 @@ class RespyCls(object):
         states_all = self.attr['states_all']
 
         # Replace missing value with NAN. This allows to easily select the
-        # valid subsets of the containers
+        # valid subsets of the containers. The compact mapping of the state
+        # space is expanded to the dense array for these checks.
         if mapping_state_idx is not None:
-            mapping_state_idx = replace_missing_values(mapping_state_idx)
+            mapping_state_idx = replace_missing_values(
+                np.array(mapping_state_idx))
         if states_all is not None:
             states_all = replace_missing_values(states_all)
         if periods_payoffs_systematic is not None:
@@ -765,13 +822,11 @@ class RespyCls(object):
                 # Subsetting valid indices
                 indices = states_all[period, :states_number_period[
                     period], :].astype('int')
-                for index in indices:
-                    # Check for finite value at admissible state
-                    assert (np.isfinite(mapping_state_idx[period, index[0],
-                        index[1], index[2], index[3]]))
-                    # Record finite value
-                    is_infinite[
-                        period, index[0], index[1], index[2], index[3]] = True
+                indices = (period,) + tuple(indices.T)
+                # Check for finite value at admissible states
+                assert (np.all(np.isfinite(mapping_state_idx[indices])))
+                # Record finite values
+                is_infinite[indices] = True
             # Check that all admissible states are finite
             assert (np.all(np.isfinite(mapping_state_idx[is_infinite == True])))
 
@@ -789,21 +844,21 @@ class RespyCls(object):
             # infinite for all others.
             is_infinite = np.tile(False, reps=periods_payoffs_systematic.shape)
             for period in range(num_periods):
-                # Loop over all possible states
-                for k in range(states_number_period[period]):
-                    # Check that wages are all positive
-                    assert (np.all(periods_payoffs_systematic[period, k, :2] >= 0.0))
-                    # Check for finite value at admissible state
-                    assert (np.all(np.isfinite(periods_payoffs_systematic[
-                    period, k, :])))
-                    # Record finite value
-                    is_infinite[period, k, :] = True
-                # Check that all admissible states are finite
+                # Subsetting all possible states
+                k = states_number_period[period]
+                # Check that wages are all positive
+                assert (np.all(periods_payoffs_systematic[period, :k, :2] >= 0.0))
+                # Check for finite value at admissible states
                 assert (np.all(np.isfinite(periods_payoffs_systematic[
-                    is_infinite == True])))
-                # Check that all inadmissible states are infinite
-                if num_periods > 1:
-                    assert (np.all(np.isfinite(periods_payoffs_systematic[is_infinite == False])) == False)
+                    period, :k, :])))
+                # Record finite values
+                is_infinite[period, :k, :] = True
+            # Check that all admissible states are finite
+            assert (np.all(np.isfinite(periods_payoffs_systematic[
+                is_infinite == True])))
+            # Check that all inadmissible states are infinite
+            if num_periods > 1:
+                assert (np.all(np.isfinite(periods_payoffs_systematic[is_infinite == False])) == False)
 
         # Check the expected future value
         is_applicable = (periods_emax is not None)
@@ -813,19 +868,19 @@ class RespyCls(object):
             # infinite for all others.
             is_infinite = np.tile(False, reps=periods_emax.shape)
             for period in range(num_periods):
-                # Loop over all possible states
-                for k in range(states_number_period[period]):
-                    # Check for finite value at admissible state
-                    assert (np.all(np.isfinite(periods_emax[period, k])))
-                    # Record finite value
-                    is_infinite[period, k] = True
-                # Check that all admissible states are finite
-                assert (np.all(np.isfinite(periods_emax[is_infinite == True])))
-                # Check that all inadmissible states are infinite
-                if num_periods == 1:
-                    assert (len(periods_emax[is_infinite == False]) == 0)
-                else:
-                    assert (np.all(np.isfinite(periods_emax[is_infinite == False])) == False)
+                # Subsetting all possible states
+                k = states_number_period[period]
+                # Check for finite value at admissible states
+                assert (np.all(np.isfinite(periods_emax[period, :k])))
+                # Record finite values
+                is_infinite[period, :k] = True
+            # Check that all admissible states are finite
+            assert (np.all(np.isfinite(periods_emax[is_infinite == True])))
+            # Check that all inadmissible states are infinite
+            if num_periods == 1:
+                assert (len(periods_emax[is_infinite == False]) == 0)
+            else:
+                assert (np.all(np.isfinite(periods_emax[is_infinite == False])) == False)
 
     def _check_key(self, key):
         """ Check that key is present.
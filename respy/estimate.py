@@ -1,8 +1,20 @@
+from multiprocessing.sharedctypes import RawArray
+import multiprocessing as mp
+import pandas as pd
+import numpy as np
+import copy
 import os
 
+from respy.python.estimate.estimate_multistart import initialize_multistart
+from respy.python.estimate.estimate_multistart import MULTISTART
+from respy.python.shared.shared_auxiliary import dist_class_attributes
 from respy.python.shared.shared_auxiliary import check_dataset
 from respy.python.shared.shared_auxiliary import process_est_log
+from respy.python.solve.solve_auxiliary import pyth_create_state_space
 from respy.python.process.process_python import process
+from respy.python.shared.shared_context import run_context
+from respy.python.shared.shared_context import get_outdir
+from respy.python.shared.shared_context import get_path
 from respy.fortran.interface import resfort_interface
 from respy.python.interface import respy_interface
 
@@ -17,8 +29,8 @@ def estimate(respy_obj):
 
     # Cleanup
     for fname in ['est.respy.log', 'est.respy.info']:
-        if os.path.exists(fname):
-            os.unlink(fname)
+        if os.path.exists(get_path(fname)):
+            os.unlink(get_path(fname))
 
     # Antibugging.
     assert _check_input(respy_obj, data_frame)
@@ -27,7 +39,7 @@ def estimate(respy_obj):
     version = respy_obj.get_attr('version')
 
     # Select appropriate interface
-    if version in ['PYTHON']:
+    if version in ['PYTHON', 'NUMBA']:
         respy_interface(respy_obj, 'estimate', data_array)
     elif version in ['FORTRAN']:
         resfort_interface(respy_obj, 'estimate', data_array)
@@ -41,6 +53,123 @@ def estimate(respy_obj):
     return x, val
 
 
+def estimate_multistart(respy_obj, starts, num_workers, margin=np.inf,
+        dirname='multistart'):
+    """ Estimate the model from multiple starting values. The starts are
+    estimated concurrently by separate worker processes, each in its own
+    subdirectory. A start is stopped early once the best value of its
+    criterion function exceeds the best value of any other start by more than
+    the margin. The final values of the criterion function and the parameters
+    are returned for each start. Starts of the FORTRAN version are never
+    stopped early.
+    """
+    # Antibugging
+    starts = np.array(starts, dtype='float', ndmin=2)
+
+    assert (starts.shape[1] == 26)
+    assert (isinstance(num_workers, int))
+    assert (num_workers > 0)
+    assert (margin >= 0)
+
+    # Distribute class attributes
+    version, num_periods, edu_start, edu_max, min_idx = \
+        dist_class_attributes(respy_obj, 'version', 'num_periods',
+            'edu_start', 'edu_max', 'min_idx')
+
+    # The FORTRAN version does not check for dominated starts.
+    if version == 'FORTRAN':
+        assert (margin == np.inf)
+
+    # Read in estimation dataset. It is shared by all workers.
+    data_frame = process(respy_obj)
+    data_array = data_frame.as_matrix()
+
+    assert _check_input(respy_obj, data_frame)
+
+    # The state space does not depend on the starting values, so it is also
+    # created only once and shared by all workers.
+    state_space = None
+    if version in ['PYTHON', 'NUMBA']:
+        state_space = pyth_create_state_space(num_periods, edu_start, edu_max,
+            min_idx, version == 'NUMBA')
+
+    # The cores are used for the starts, so each estimation runs without a
+    # pool of workers on its own.
+    respy_obj = copy.deepcopy(respy_obj)
+    respy_obj.unlock()
+    respy_obj.set_attr('is_parallel', False)
+    respy_obj.lock()
+
+    # The best values of the criterion function are shared across all
+    # workers.
+    num_starts = starts.shape[0]
+
+    crit_vals = RawArray('d', num_starts)
+    np.frombuffer(crit_vals)[:] = np.inf
+
+    tasks = []
+    for i in range(num_starts):
+        subdir = os.path.join(get_outdir(), dirname, 'start_{:03d}'.format(i))
+        tasks += [(respy_obj, starts[i, :], subdir, i)]
+
+    pool = mp.Pool(num_workers, initialize_multistart, (crit_vals, margin,
+        data_array, state_space))
+
+    rslts = pool.map(_estimate_start, tasks, chunksize=1)
+
+    pool.close()
+    pool.join()
+
+    # Construct table of results
+    table = pd.DataFrame([rslt[1] for rslt in rslts])
+    table.insert(0, 'Dominated', [rslt[2] for rslt in rslts])
+    table.insert(0, 'Criterion', [rslt[0] for rslt in rslts])
+    table.index.name = 'Start'
+
+    # Finishing
+    return table
+
+
+def _estimate_start(task):
+    """ Estimate the model for a single start. This is the task of the
+    workers, which find the estimation dataset and the state space available
+    from their start.
+    """
+    # Distribute task
+    respy_obj, x, subdir, idx = task
+
+    respy_obj.unlock()
+    respy_obj.update_model_paras(x)
+    respy_obj.lock()
+
+    # Distribute class attributes
+    version, maxfun = dist_class_attributes(respy_obj, 'version', 'maxfun')
+
+    # A single evaluation at the starting values is never stopped early.
+    MULTISTART['is_dominated'] = False
+    MULTISTART['idx'] = idx if (maxfun > 0) else None
+
+    # The logs of each start are written to its own directory.
+    with run_context(subdir):
+
+        for fname in ['est.respy.log', 'est.respy.info']:
+            if os.path.exists(get_path(fname)):
+                os.unlink(get_path(fname))
+
+        if version in ['PYTHON', 'NUMBA']:
+            respy_interface(respy_obj, 'estimate', MULTISTART['data_array'],
+                state_space=MULTISTART['state_space'])
+        elif version in ['FORTRAN']:
+            resfort_interface(respy_obj, 'estimate', MULTISTART['data_array'])
+        else:
+            raise NotImplementedError
+
+        rslt = process_est_log()
+
+    # Finishing
+    return rslt['value_final'], rslt['paras_final'], MULTISTART['is_dominated']
+
+
 def _check_input(respy_obj, data_frame):
     """ Check input arguments.
     """
@@ -103,6 +232,17 @@ def _check_input(respy_obj, data_frame):
         assert isinstance(gtol, float)
         assert (gtol > 0)
 
+    if 'PYTH-BHHH' in optimizer_options.keys():
+
+        maxiter = optimizer_options['PYTH-BHHH']['maxiter']
+        gtol = optimizer_options['PYTH-BHHH']['gtol']
+
+        assert isinstance(maxiter, int)
+        assert (maxiter > 0)
+
+        assert isinstance(gtol, float)
+        assert (gtol > 0)
+
     if 'SCIPY-POWELL' in optimizer_options.keys():
 
         maxiter = optimizer_options['SCIPY-POWELL']['maxiter']
@@ -0,0 +1,53 @@
+import numpy as np
+import copy
+
+from respy.python.shared.shared_auxiliary import dist_class_attributes
+from respy.python.shared.shared_auxiliary import check_dataset
+from respy.python.process.process_python import process
+from respy.fortran.interface import resfort_interface
+from respy.python.interface import respy_interface
+
+
+def evaluate(respy_obj, x=None, level='agent'):
+    """ Evaluate the likelihood contributions of the estimation sample. The
+    model parameters are taken from the class instance unless all parameters
+    are provided in x. The contributions are returned for each agent or for
+    each observation.
+    """
+    # Antibugging
+    assert level in ['agent', 'observation']
+    assert respy_obj.get_attr('is_locked')
+
+    # Read in estimation dataset. It only reads in the number of agents
+    # requested for the estimation.
+    data_frame = process(respy_obj)
+    data_array = data_frame.as_matrix()
+
+    check_dataset(data_frame, respy_obj, 'est')
+
+    # The parameters of the class instance remain unchanged.
+    if x is not None:
+        respy_obj = copy.deepcopy(respy_obj)
+        respy_obj.unlock()
+        respy_obj.update_model_paras(x)
+        respy_obj.lock()
+
+    # Distribute class attributes
+    version, num_agents_est, num_periods = dist_class_attributes(respy_obj,
+        'version', 'num_agents_est', 'num_periods')
+
+    # Select appropriate interface
+    if version in ['PYTHON', 'NUMBA']:
+        contribs = respy_interface(respy_obj, 'evaluate', data_array)
+    elif version in ['FORTRAN']:
+        contribs = resfort_interface(respy_obj, 'evaluate', data_array)
+    else:
+        raise NotImplementedError
+
+    # The contribution of an agent is the product of the contributions over
+    # all periods.
+    if level == 'agent':
+        contribs = np.prod(contribs.reshape(num_agents_est, num_periods), 1)
+
+    # Finishing
+    return contribs
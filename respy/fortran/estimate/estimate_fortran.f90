@@ -137,6 +137,80 @@ SUBROUTINE fort_estimate(crit_val, success, message, coeffs_a, coeffs_b, coeffs_
 
     CALL record_estimation()
 
+END SUBROUTINE
+!******************************************************************************
+!******************************************************************************
+SUBROUTINE fort_batch(crit_vals, x_batch, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky)
+
+    !/* external objects    */
+
+    REAL(our_dble), INTENT(OUT)     :: crit_vals(:)
+
+    REAL(our_dble), INTENT(IN)      :: shocks_cholesky(4, 4)
+    REAL(our_dble), INTENT(IN)      :: x_batch(:, :)
+    REAL(our_dble), INTENT(IN)      :: coeffs_home(1)
+    REAL(our_dble), INTENT(IN)      :: coeffs_edu(3)
+    REAL(our_dble), INTENT(IN)      :: coeffs_a(6)
+    REAL(our_dble), INTENT(IN)      :: coeffs_b(6)
+
+    !/* internal objects    */
+
+    INTEGER(our_int)                :: i
+
+    LOGICAL, PARAMETER              :: all_free(26) = .False.
+!------------------------------------------------------------------------------
+! Algorithm
+!------------------------------------------------------------------------------
+
+    ! The state space is created once and shared across all evaluations of the criterion function. The fixed parameters are taken from the starting values.
+    CALL get_free_optim_paras(x_all_start, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, all_free)
+
+    CALL fort_create_state_space(states_all, states_number_period, mapping_state_idx, edu_start, edu_max)
+
+    ! All evaluations are recorded in order, but the MAXFUN restriction of the estimation does not apply to the batch.
+    maxfun = zero_int
+
+    DO i = 1, SIZE(x_batch, 2)
+        crit_vals(i) = fort_criterion(x_batch(:, i))
+    END DO
+
+END SUBROUTINE
+!******************************************************************************
+!******************************************************************************
+SUBROUTINE fort_gradient(grad, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky)
+
+    !/* external objects    */
+
+    REAL(our_dble), INTENT(OUT)     :: grad(num_free)
+
+    REAL(our_dble), INTENT(IN)      :: shocks_cholesky(4, 4)
+    REAL(our_dble), INTENT(IN)      :: coeffs_home(1)
+    REAL(our_dble), INTENT(IN)      :: coeffs_edu(3)
+    REAL(our_dble), INTENT(IN)      :: coeffs_a(6)
+    REAL(our_dble), INTENT(IN)      :: coeffs_b(6)
+
+    !/* internal objects    */
+
+    REAL(our_dble)                  :: x_free_start(num_free)
+
+    LOGICAL, PARAMETER              :: all_free(26) = .False.
+!------------------------------------------------------------------------------
+! Algorithm
+!------------------------------------------------------------------------------
+
+    CALL get_free_optim_paras(x_all_start, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, all_free)
+
+    CALL fort_create_state_space(states_all, states_number_period, mapping_state_idx, edu_start, edu_max)
+
+    CALL get_free_optim_paras(x_free_start, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, paras_fixed)
+
+    ! The perturbed evaluations are not recorded. Outside of an estimation, this requires MAXFUN to differ from zero.
+    crit_estimation = .False.
+
+    maxfun = HUGE(maxfun)
+
+    grad = fort_dcriterion(x_free_start)
+
 END SUBROUTINE
 !******************************************************************************
 !******************************************************************************
@@ -226,8 +300,8 @@ FUNCTION fort_dcriterion(x)
     ! Initialize containers
     ei = zero_dble
 
-    ! Evaluate baseline
-    f0 = fort_criterion(x)
+    ! Evaluate baseline, which is not required for central differences.
+    IF (.NOT. is_central) f0 = fort_criterion(x)
 
     DO j = 1, num_free
 
@@ -237,7 +311,17 @@ FUNCTION fort_dcriterion(x)
 
         f1 = fort_criterion(x + d)
 
-        fort_dcriterion(j) = (f1 - f0) / d(j)
+        IF (is_central) THEN
+
+            f0 = fort_criterion(x - d)
+
+            fort_dcriterion(j) = (f1 - f0) / (two_dble * d(j))
+
+        ELSE
+
+            fort_dcriterion(j) = (f1 - f0) / d(j)
+
+        END IF
 
         ei(j) = zero_dble
 
@@ -8,12 +8,15 @@ import os
 
 from respy.python.shared.shared_auxiliary import dist_class_attributes
 from respy.python.shared.shared_auxiliary import dist_model_paras
+from respy.python.shared.shared_mapping import MappingStateIdxCls
 from respy.python.shared.shared_constants import OPTIMIZERS_FORT
 from respy.python.shared.shared_constants import HUGE_FLOAT
 from respy.python.shared.shared_constants import EXEC_DIR
+from respy.python.shared.shared_context import get_outdir
+from respy.python.shared.shared_context import get_path
 
 
-def resfort_interface(respy_obj, request, data_array=None):
+def resfort_interface(respy_obj, request, data_array=None, x_batch=None):
     """ This function provides the interface to the FORTRAN functionality.
     """
     # Add mock specification for FORTRAN optimizers if not defined by user.
@@ -37,6 +40,7 @@ def resfort_interface(respy_obj, request, data_array=None):
                                             'derivatives', 'scaling')
 
     dfunc_eps = derivatives[1]
+    is_central = (derivatives[0] == 'CENTRAL-DIFFERENCES')
     is_scaled, scale_minimum = scaling
 
     if request == 'estimate':
@@ -44,12 +48,29 @@ def resfort_interface(respy_obj, request, data_array=None):
         if maxfun > 0:
             assert optimizer_used in OPTIMIZERS_FORT
 
+    if request in ['estimate', 'evaluate', 'gradient', 'batch']:
         assert data_array is not None
         # If an evaluation is requested, then a specially formatted dataset is
         # written to a scratch file. This eases the reading of the dataset in
         # FORTRAN.
         write_dataset(data_array)
 
+    if request == 'batch':
+        assert x_batch is not None
+        write_batch(x_batch)
+
+    # A solution attached to the class instance is up to date, as it is
+    # removed otherwise. It is then passed in for the simulation instead of
+    # solving the model again.
+    is_solved = respy_obj.get_attr('is_solved')
+
+    if (request == 'simulate') and is_solved:
+        solution = dist_class_attributes(respy_obj,
+            'periods_payoffs_systematic', 'states_number_period',
+            'mapping_state_idx', 'periods_emax', 'states_all')
+        write_solution(*solution)
+        request = 'resimulate'
+
     # Distribute model parameters
     coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky = \
         dist_model_paras(model_paras, is_debug)
@@ -60,24 +81,37 @@ def resfort_interface(respy_obj, request, data_array=None):
 
     args = args + (num_draws_prob, num_agents_est, num_agents_sim, seed_prob,
     seed_emax, tau, num_procs, request, seed_sim, optimizer_options,
-    optimizer_used, maxfun, paras_fixed, dfunc_eps, is_scaled, scale_minimum)
+    optimizer_used, maxfun, paras_fixed, dfunc_eps, is_central, is_scaled,
+    scale_minimum)
 
     write_resfort_initialization(*args)
 
-    # Call executable
-    if not is_parallel:
+    # Call executable. The evaluation of the likelihood contributions and the
+    # simulation from an existing solution are only available in the scalar
+    # executable.
+    # The executables read and write all files in the output directory.
+    if (not is_parallel) or (request in ['evaluate', 'resimulate']):
         cmd = [EXEC_DIR + '/resfort_scalar']
-        subprocess.check_call(cmd)
+        subprocess.check_call(cmd, cwd=get_outdir())
     else:
         cmd = ['mpiexec', '-n', '1', EXEC_DIR + '/resfort_parallel_master']
-        subprocess.check_call(cmd)
+        subprocess.check_call(cmd, cwd=get_outdir())
 
     # Return arguments depends on the request.
     if request == 'simulate':
         results = get_results(num_periods, min_idx, num_agents_sim, 'simulate')
         args = (results[:-1], results[-1])
+    elif request == 'resimulate':
+        shape = (num_periods * num_agents_sim, 8)
+        args = (solution, read_data('simulated', shape))
     elif request == 'estimate':
         args = None
+    elif request == 'evaluate':
+        args = read_contributions(num_periods * num_agents_est)
+    elif request == 'gradient':
+        args = read_gradient(paras_fixed.count(False))
+    elif request == 'batch':
+        args = read_crit_vals(x_batch.shape[0])
     else:
         raise AssertionError
 
@@ -123,12 +157,11 @@ def get_results(num_periods, min_idx, num_agents_sim, which):
     # Get the maximum number of states. The special treatment is required as
     # it informs about the dimensions of some of the arrays that are
     # processed below.
-    max_states_period = int(np.loadtxt('.max_states_period.resfort.dat'))
+    file_ = get_path('.max_states_period.resfort.dat')
 
-    os.unlink('.max_states_period.resfort.dat')
+    max_states_period = int(np.loadtxt(file_))
 
-    shape = (num_periods, num_periods, num_periods, min_idx, 2)
-    mapping_state_idx = read_data('mapping_state_idx', shape).astype('int')
+    os.unlink(file_)
 
     shape = (num_periods,)
     states_number_period = \
@@ -137,6 +170,11 @@ def get_results(num_periods, min_idx, num_agents_sim, which):
     shape = (num_periods, max_states_period, 4)
     states_all = read_data('states_all', shape).astype('int')
 
+    # The mapping of the state space to the array indices is not written to
+    # disk as it is fully determined by the admissible states.
+    mapping_state_idx = MappingStateIdxCls(states_all, states_number_period,
+        min_idx)
+
     shape = (num_periods, max_states_period, 4)
     periods_payoffs_systematic = read_data('periods_payoffs_systematic', shape)
 
@@ -161,7 +199,7 @@ def get_results(num_periods, min_idx, num_agents_sim, which):
 def read_data(label, shape):
     """ Read results
     """
-    file_ = '.' + label + '.resfort.dat'
+    file_ = get_path('.' + label + '.resfort.dat')
 
     # This special treatment is required as it is crucial for this data
     # to stay of integer type. All other data is transformed to float in
@@ -180,17 +218,85 @@ def read_data(label, shape):
     return data
 
 
+def read_contributions(num_obs):
+    """ Read the likelihood contributions. These are stored as unformatted
+    binary data, so there is no loss in precision.
+    """
+    file_ = get_path('.contribs.resfort.dat')
+
+    contribs = np.fromfile(file_, dtype=np.float64, count=num_obs)
+
+    # Cleanup
+    os.unlink(file_)
+
+    # Finishing
+    return contribs
+
+
+def read_crit_vals(num_evals):
+    """ Read the values of the criterion function for a batch of parameter
+    vectors.
+    """
+    file_ = get_path('.crit_vals.resfort.dat')
+
+    crit_vals = np.fromfile(file_, dtype=np.float64, count=num_evals)
+
+    # Cleanup
+    os.unlink(file_)
+
+    # Finishing
+    return crit_vals
+
+
+def read_gradient(num_free):
+    """ Read the gradient of the criterion function with respect to the free
+    parameters.
+    """
+    file_ = get_path('.grad.resfort.dat')
+
+    grad = np.fromfile(file_, dtype=np.float64, count=num_free)
+
+    # Cleanup
+    os.unlink(file_)
+
+    # Finishing
+    return grad
+
+
+def write_batch(x_batch):
+    """ Write the batch of free parameter vectors to a temporary file. Each
+    row is a parameter vector, which FORTRAN reads as a column.
+    """
+    x_batch = np.ascontiguousarray(x_batch, dtype=np.float64)
+    x_batch.tofile(get_path('.batch.resfort.dat'))
+
+
+def write_solution(periods_payoffs_systematic, states_number_period,
+        mapping_state_idx, periods_emax, states_all):
+    """ Write the systematic payoffs and the expected future values of the
+    solution to a temporary file. FORTRAN creates the remaining objects with
+    the state space and reads the arrays in column-major order.
+    """
+    # Antibugging
+    assert (periods_emax.shape[1] == max(states_number_period))
+
+    with open(get_path('.solution.resfort.dat'), 'wb') as out_file:
+        for obj in [periods_payoffs_systematic, periods_emax]:
+            np.ravel(obj, order='F').astype(np.float64).tofile(out_file)
+
+
 def write_resfort_initialization(coeffs_a, coeffs_b, coeffs_edu, coeffs_home,
         shocks_cholesky, is_interpolated, num_draws_emax, num_periods,
         num_points_interp, is_myopic, edu_start, is_debug, edu_max, min_idx, delta,
         num_draws_prob, num_agents_est, num_agents_sim, seed_prob, seed_emax,
         tau, num_procs, request, seed_sim, optimizer_options, optimizer_used,
-                                 maxfun, paras_fixed, dfunc_eps, is_scaled, scale_minimum):
+                                 maxfun, paras_fixed, dfunc_eps, is_central, is_scaled,
+                                 scale_minimum):
     """ Write out model request to hidden file .model.resfort.ini.
     """
 
     # Write out to link file
-    with open('.model.resfort.ini', 'w') as file_:
+    with open(get_path('.model.resfort.ini'), 'w') as file_:
 
         # BASICS
         line = '{0:10d}\n'.format(num_periods)
@@ -264,6 +370,9 @@ def write_resfort_initialization(coeffs_a, coeffs_b, coeffs_edu, coeffs_home,
         line = '{0:15.10f}\n'.format(dfunc_eps)
         file_.write(line)
 
+        line = '{0}\n'.format(is_central)
+        file_.write(line)
+
         # SCALING
         line = '{0}\n'.format(is_scaled)
         file_.write(line)
@@ -333,11 +442,11 @@ def write_dataset(data_array):
     # HUGE FLOAT. The numpy array is passed in to align the interfaces across
     # implementations
     data_frame = pd.DataFrame(data_array)
-    with open('.data.resfort.dat', 'w') as file_:
+    with open(get_path('.data.resfort.dat'), 'w') as file_:
         data_frame.to_string(file_, index=False,
             header=None, na_rep=str(HUGE_FLOAT))
 
     # An empty line is added as otherwise this might lead to problems on the
     # TRAVIS servers. The FORTRAN routine read_dataset() raises an error.
-    with open('.data.resfort.dat', 'a') as file_:
+    with open(get_path('.data.resfort.dat'), 'a') as file_:
         file_.write('\n')
\ No newline at end of file
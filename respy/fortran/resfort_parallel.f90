@@ -31,7 +31,10 @@ PROGRAM resfort_parallel
     REAL(our_dble)                  :: crit_val
 
     REAL(our_dble), ALLOCATABLE     :: periods_draws_sims(:, :, :)
+    REAL(our_dble), ALLOCATABLE     :: crit_vals(:)
+    REAL(our_dble), ALLOCATABLE     :: x_batch(:, :)
     REAL(our_dble), ALLOCATABLE     :: data_sim(:, :)
+    REAL(our_dble), ALLOCATABLE     :: grad(:)
 
     INTEGER(our_int)                :: newuoa_maxfun
     INTEGER(our_int)                :: bfgs_maxiter
@@ -53,7 +56,7 @@ PROGRAM resfort_parallel
 ! Algorithm
 !------------------------------------------------------------------------------
 
-    CALL read_specification(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, edu_start, edu_max, delta, tau, seed_sim, seed_emax, seed_prob, num_procs, num_slaves, is_debug, is_interpolated, is_myopic, request, exec_dir, maxfun, paras_fixed, num_free, is_scaled, scaled_minimum, optimizer_used, dfunc_eps, newuoa_npt, newuoa_maxfun, newuoa_rhobeg, newuoa_rhoend, bfgs_gtol, bfgs_stpmx, bfgs_maxiter)
+    CALL read_specification(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, edu_start, edu_max, delta, tau, seed_sim, seed_emax, seed_prob, num_procs, num_slaves, is_debug, is_interpolated, is_myopic, request, exec_dir, maxfun, paras_fixed, num_free, is_scaled, scaled_minimum, optimizer_used, dfunc_eps, is_central, newuoa_npt, newuoa_maxfun, newuoa_rhobeg, newuoa_rhoend, bfgs_gtol, bfgs_stpmx, bfgs_maxiter)
 
     CALL MPI_INIT(ierr)
 
@@ -63,6 +66,24 @@ PROGRAM resfort_parallel
 
         CALL fort_estimate_parallel(crit_val, success, message, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, paras_fixed, optimizer_used, maxfun, is_scaled, scaled_minimum, newuoa_npt, newuoa_rhobeg, newuoa_rhoend, newuoa_maxfun, bfgs_gtol, bfgs_maxiter, bfgs_stpmx)
 
+    ELSE IF (request == 'batch') THEN
+
+        CALL read_batch(x_batch)
+
+        ALLOCATE(crit_vals(SIZE(x_batch, 2)))
+
+        CALL fort_batch_parallel(crit_vals, x_batch, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky)
+
+        CALL store_batch(crit_vals)
+
+    ELSE IF (request == 'gradient') THEN
+
+        ALLOCATE(grad(num_free))
+
+        CALL fort_gradient_parallel(grad, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky)
+
+        CALL store_gradient(grad)
+
     ELSE IF (request == 'simulate') THEN
 
         CALL fort_solve_parallel(periods_payoffs_systematic, states_number_period, mapping_state_idx, periods_emax, states_all, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, edu_start, edu_max)
@@ -73,7 +94,7 @@ PROGRAM resfort_parallel
 
     END IF
 
-    CALL store_results(request, mapping_state_idx, states_all, periods_payoffs_systematic, states_number_period, periods_emax, data_sim)
+    CALL store_results(request, states_all, periods_payoffs_systematic, states_number_period, periods_emax, data_sim)
 
     CALL MPI_Bcast(1, 1, MPI_INT, MPI_ROOT, SLAVECOMM, ierr)
     CALL MPI_FINALIZE(ierr)
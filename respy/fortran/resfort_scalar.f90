@@ -25,6 +25,10 @@ PROGRAM resfort_scalar
     REAL(our_dble)                  :: crit_val
 
     REAL(our_dble), ALLOCATABLE     :: periods_draws_sims(:, :, :)
+    REAL(our_dble), ALLOCATABLE     :: crit_vals(:)
+    REAL(our_dble), ALLOCATABLE     :: x_batch(:, :)
+    REAL(our_dble), ALLOCATABLE     :: grad(:)
+    REAL(our_dble), ALLOCATABLE     :: contribs(:)
     REAL(our_dble), ALLOCATABLE     :: data_sim(:, :)
 
     INTEGER(our_int)                :: newuoa_maxfun
@@ -48,7 +52,7 @@ PROGRAM resfort_scalar
 ! Algorithm
 !------------------------------------------------------------------------------
 
-    CALL read_specification(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, edu_start, edu_max, delta, tau, seed_sim, seed_emax, seed_prob, num_procs, num_slaves, is_debug, is_interpolated, is_myopic, request, exec_dir, maxfun, paras_fixed, num_free, is_scaled, scaled_minimum, optimizer_used, dfunc_eps, newuoa_npt, newuoa_maxfun, newuoa_rhobeg, newuoa_rhoend, bfgs_gtol, bfgs_stpmx, bfgs_maxiter)
+    CALL read_specification(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, edu_start, edu_max, delta, tau, seed_sim, seed_emax, seed_prob, num_procs, num_slaves, is_debug, is_interpolated, is_myopic, request, exec_dir, maxfun, paras_fixed, num_free, is_scaled, scaled_minimum, optimizer_used, dfunc_eps, is_central, newuoa_npt, newuoa_maxfun, newuoa_rhobeg, newuoa_rhoend, bfgs_gtol, bfgs_stpmx, bfgs_maxiter)
 
     CALL create_draws(periods_draws_emax, num_draws_emax, seed_emax, is_debug)
 
@@ -60,6 +64,46 @@ PROGRAM resfort_scalar
 
         CALL fort_estimate(crit_val, success, message, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, paras_fixed, optimizer_used, maxfun, is_scaled, scaled_minimum, newuoa_npt, newuoa_rhobeg, newuoa_rhoend, newuoa_maxfun, bfgs_gtol, bfgs_maxiter, bfgs_stpmx)
 
+    ELSE IF (request == 'evaluate') THEN
+
+        CALL create_draws(periods_draws_prob, num_draws_prob, seed_prob, is_debug)
+
+        CALL read_dataset(data_est, num_agents_est)
+
+        CALL fort_solve(periods_payoffs_systematic, states_number_period, mapping_state_idx, periods_emax, states_all, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, periods_draws_emax, delta, is_debug, is_interpolated, is_myopic, edu_start, edu_max)
+
+        ALLOCATE(contribs(num_agents_est * num_periods))
+
+        CALL fort_contributions(contribs, periods_payoffs_systematic, mapping_state_idx, periods_emax, states_all, shocks_cholesky, data_est, periods_draws_prob, delta, tau, edu_start, edu_max)
+
+        CALL store_contributions(contribs)
+
+    ELSE IF (request == 'batch') THEN
+
+        CALL create_draws(periods_draws_prob, num_draws_prob, seed_prob, is_debug)
+
+        CALL read_dataset(data_est, num_agents_est)
+
+        CALL read_batch(x_batch)
+
+        ALLOCATE(crit_vals(SIZE(x_batch, 2)))
+
+        CALL fort_batch(crit_vals, x_batch, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky)
+
+        CALL store_batch(crit_vals)
+
+    ELSE IF (request == 'gradient') THEN
+
+        CALL create_draws(periods_draws_prob, num_draws_prob, seed_prob, is_debug)
+
+        CALL read_dataset(data_est, num_agents_est)
+
+        ALLOCATE(grad(num_free))
+
+        CALL fort_gradient(grad, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky)
+
+        CALL store_gradient(grad)
+
     ELSE IF (request == 'simulate') THEN
 
         CALL fort_solve(periods_payoffs_systematic, states_number_period, mapping_state_idx, periods_emax, states_all, coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, periods_draws_emax, delta, is_debug, is_interpolated, is_myopic, edu_start, edu_max)
@@ -68,10 +112,20 @@ PROGRAM resfort_scalar
 
         CALL fort_simulate(data_sim, periods_payoffs_systematic, mapping_state_idx, periods_emax, states_all, num_agents_sim, periods_draws_sims, shocks_cholesky, delta, edu_start, edu_max, seed_sim)
 
+    ELSE IF (request == 'resimulate') THEN
+
+        CALL fort_create_state_space(states_all, states_number_period, mapping_state_idx, edu_start, edu_max)
+
+        CALL read_solution(periods_payoffs_systematic, periods_emax)
+
+        CALL create_draws(periods_draws_sims, num_agents_sim, seed_sim, is_debug)
+
+        CALL fort_simulate(data_sim, periods_payoffs_systematic, mapping_state_idx, periods_emax, states_all, num_agents_sim, periods_draws_sims, shocks_cholesky, delta, edu_start, edu_max, seed_sim)
+
     END IF
 
 
-    CALL store_results(request, mapping_state_idx, states_all, periods_payoffs_systematic, states_number_period, periods_emax, data_sim)
+    CALL store_results(request, states_all, periods_payoffs_systematic, states_number_period, periods_emax, data_sim)
 
 !******************************************************************************
 !******************************************************************************
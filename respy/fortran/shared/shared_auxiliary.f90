@@ -533,12 +533,11 @@ FUNCTION determinant(A)
 END FUNCTION
 !******************************************************************************
 !******************************************************************************
-SUBROUTINE store_results(request, mapping_state_idx, states_all, periods_payoffs_systematic, states_number_period, periods_emax, data_sim)
+SUBROUTINE store_results(request, states_all, periods_payoffs_systematic, states_number_period, periods_emax, data_sim)
 
     !/* external objects        */
 
 
-    INTEGER(our_int), INTENT(IN)    :: mapping_state_idx(num_periods, num_periods, num_periods, min_idx, 2)
     INTEGER(our_int), INTENT(IN)    :: states_all(num_periods, max_states_period, 4)
     INTEGER(our_int), INTENT(IN)    :: states_number_period(num_periods)
 
@@ -552,8 +551,6 @@ SUBROUTINE store_results(request, mapping_state_idx, states_all, periods_payoffs
 
     INTEGER(our_int)                :: period
     INTEGER(our_int)                :: i
-    INTEGER(our_int)                :: j
-    INTEGER(our_int)                :: k
 
 !------------------------------------------------------------------------------
 ! Algorithm
@@ -561,24 +558,7 @@ SUBROUTINE store_results(request, mapping_state_idx, states_all, periods_payoffs
 
     IF (request == 'simulate') THEN
 
-        ! Write out results for the store results.
-        1800 FORMAT(5(1x,i5))
-
-        OPEN(UNIT=99, FILE='.mapping_state_idx.resfort.dat', ACTION='WRITE')
-
-        DO period = 1, num_periods
-            DO i = 1, num_periods
-                DO j = 1, num_periods
-                    DO k = 1, min_idx
-                        WRITE(99, 1800) mapping_state_idx(period, i, j, k, :)
-                    END DO
-                END DO
-            END DO
-        END DO
-
-        CLOSE(99)
-
-
+        ! Write out results for the store results. The mapping of the state space to the array indices is not written as it is fully determined by the admissible states.
         2000 FORMAT(4(1x,i5))
 
         OPEN(UNIT=99, FILE='.states_all.resfort.dat', ACTION='WRITE')
@@ -636,7 +616,7 @@ SUBROUTINE store_results(request, mapping_state_idx, states_all, periods_payoffs
 
     END IF
 
-    IF (request == 'simulate') THEN
+    IF ((request == 'simulate') .OR. (request == 'resimulate')) THEN
 
         OPEN(UNIT=99, FILE='.simulated.resfort.dat', ACTION='WRITE')
 
@@ -655,7 +635,128 @@ SUBROUTINE store_results(request, mapping_state_idx, states_all, periods_payoffs
 END SUBROUTINE
 !******************************************************************************
 !******************************************************************************
-SUBROUTINE read_specification(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, edu_start, edu_max, delta, tau, seed_sim, seed_emax, seed_prob, num_procs, num_slaves, is_debug, is_interpolated, is_myopic, request, exec_dir, maxfun, paras_fixed, num_free, is_scaled, scaled_minimum, optimizer_used, dfunc_eps, newuoa_npt, newuoa_maxfun, newuoa_rhobeg, newuoa_rhoend, bfgs_gtol, bfgs_stpmx, bfgs_maxiter)
+SUBROUTINE store_contributions(contribs)
+
+    !
+    !   The likelihood contributions are written to an unformatted stream. This
+    !   avoids the loss of precision in the formatted output and allows to read
+    !   them directly into a NUMPY array.
+    !
+
+    !/* external objects        */
+
+    REAL(our_dble), INTENT(IN)      :: contribs(num_agents_est * num_periods)
+
+!------------------------------------------------------------------------------
+! Algorithm
+!------------------------------------------------------------------------------
+
+    OPEN(UNIT=99, FILE='.contribs.resfort.dat', ACCESS='STREAM', FORM='UNFORMATTED', STATUS='REPLACE', ACTION='WRITE')
+
+    WRITE(99) contribs
+
+    CLOSE(99)
+
+END SUBROUTINE
+!******************************************************************************
+!******************************************************************************
+SUBROUTINE read_batch(x_batch)
+
+    !
+    !   The batch of free parameter vectors is read from an unformatted stream, which is removed afterwards. Each parameter vector is a column of the array.
+    !
+
+    !/* external objects        */
+
+    REAL(our_dble), ALLOCATABLE, INTENT(INOUT)  :: x_batch(:, :)
+
+    !/* internal objects        */
+
+    INTEGER(our_int)                            :: num_bytes
+
+!------------------------------------------------------------------------------
+! Algorithm
+!------------------------------------------------------------------------------
+
+    INQUIRE(FILE='.batch.resfort.dat', SIZE=num_bytes)
+
+    ALLOCATE(x_batch(num_free, num_bytes / (8 * num_free)))
+
+    OPEN(UNIT=99, FILE='.batch.resfort.dat', ACCESS='STREAM', FORM='UNFORMATTED', ACTION='READ')
+
+    READ(99) x_batch
+
+    CLOSE(99, STATUS='delete')
+
+END SUBROUTINE
+!******************************************************************************
+!******************************************************************************
+SUBROUTINE read_solution(periods_payoffs_systematic, periods_emax)
+
+    !
+    !   The systematic payoffs and the expected future values of an existing solution are read from an unformatted stream, which is removed afterwards. The state space needs to be created beforehand.
+    !
+
+    !/* external objects        */
+
+    REAL(our_dble), ALLOCATABLE, INTENT(INOUT)  :: periods_payoffs_systematic(:, :, :)
+    REAL(our_dble), ALLOCATABLE, INTENT(INOUT)  :: periods_emax(:, :)
+
+!------------------------------------------------------------------------------
+! Algorithm
+!------------------------------------------------------------------------------
+
+    ALLOCATE(periods_payoffs_systematic(num_periods, max_states_period, 4))
+    ALLOCATE(periods_emax(num_periods, max_states_period))
+
+    OPEN(UNIT=99, FILE='.solution.resfort.dat', ACCESS='STREAM', FORM='UNFORMATTED', ACTION='READ')
+
+    READ(99) periods_payoffs_systematic, periods_emax
+
+    CLOSE(99, STATUS='delete')
+
+END SUBROUTINE
+!******************************************************************************
+!******************************************************************************
+SUBROUTINE store_batch(crit_vals)
+
+    !/* external objects        */
+
+    REAL(our_dble), INTENT(IN)      :: crit_vals(:)
+
+!------------------------------------------------------------------------------
+! Algorithm
+!------------------------------------------------------------------------------
+
+    OPEN(UNIT=99, FILE='.crit_vals.resfort.dat', ACCESS='STREAM', FORM='UNFORMATTED', STATUS='REPLACE', ACTION='WRITE')
+
+    WRITE(99) crit_vals
+
+    CLOSE(99)
+
+END SUBROUTINE
+!******************************************************************************
+!******************************************************************************
+SUBROUTINE store_gradient(grad)
+
+    !/* external objects        */
+
+    REAL(our_dble), INTENT(IN)      :: grad(num_free)
+
+!------------------------------------------------------------------------------
+! Algorithm
+!------------------------------------------------------------------------------
+
+    OPEN(UNIT=99, FILE='.grad.resfort.dat', ACCESS='STREAM', FORM='UNFORMATTED', STATUS='REPLACE', ACTION='WRITE')
+
+    WRITE(99) grad
+
+    CLOSE(99)
+
+END SUBROUTINE
+!******************************************************************************
+!******************************************************************************
+SUBROUTINE read_specification(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky, edu_start, edu_max, delta, tau, seed_sim, seed_emax, seed_prob, num_procs, num_slaves, is_debug, is_interpolated, is_myopic, request, exec_dir, maxfun, paras_fixed, num_free, is_scaled, scaled_minimum, optimizer_used, dfunc_eps, is_central, newuoa_npt, newuoa_maxfun, newuoa_rhobeg, newuoa_rhoend, bfgs_gtol, bfgs_stpmx, bfgs_maxiter)
 
     !
     !   This function serves as the replacement for the RespyCls and reads in
@@ -701,6 +802,7 @@ SUBROUTINE read_specification(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shock
 
     LOGICAL, INTENT(OUT)            :: is_interpolated
     LOGICAL, INTENT(OUT)            :: paras_fixed(26)
+    LOGICAL, INTENT(OUT)            :: is_central
     LOGICAL, INTENT(OUT)            :: is_scaled
     LOGICAL, INTENT(OUT)            :: is_myopic
     LOGICAL, INTENT(OUT)            :: is_debug
@@ -766,6 +868,7 @@ SUBROUTINE read_specification(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shock
 
         ! DERIVATIVES
         READ(99, 1500) dfunc_eps
+        READ(99, *) is_central
 
         ! SCALING
         READ(99, *) is_scaled
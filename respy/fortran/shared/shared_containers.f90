@@ -35,6 +35,7 @@ MODULE shared_containers
     INTEGER(our_int)                :: edu_max   
 
     LOGICAL                         :: is_interpolated
+    LOGICAL                         :: is_central
     LOGICAL                         :: paras_fixed(26)
     LOGICAL                         :: is_myopic
     LOGICAL                         :: is_debug
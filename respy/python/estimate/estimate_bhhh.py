@@ -0,0 +1,99 @@
+""" This module contains the BHHH algorithm for the maximization of the
+likelihood function. It exploits that the criterion function is the average of
+the agents' log-likelihood contributions.
+"""
+import numpy as np
+
+from respy.python.shared.shared_constants import HUGE_FLOAT
+
+# Maximum number of step halvings in the line search
+MAX_HALVINGS = 20
+
+
+def fmin_bhhh(func, fprime, x0, args, num_agents_est, num_periods, gtol,
+        maxiter):
+    """ Minimize the criterion function with the BHHH algorithm. The Hessian
+    is approximated by the outer product of the agents' scores. The function
+    to minimize returns the likelihood contributions of all observations and
+    its derivative returns the scores of all observations.
+    """
+    # Auxiliary objects
+    num_obs = num_agents_est * num_periods
+
+    x = np.array(x0, dtype='float')
+
+    contribs = get_agent_contribs(func(x, *args), num_agents_est, num_periods)
+    fval = -np.sum(contribs) / num_obs
+
+    num_iter, warnflag = 0, 0
+
+    while True:
+
+        scores = get_agent_scores(fprime(x, *args), num_agents_est,
+            num_periods)
+
+        # The criterion function is the negative average over all
+        # observations.
+        grad = -np.sum(scores, axis=0) / num_obs
+
+        if np.max(np.abs(grad)) < gtol:
+            break
+
+        if num_iter == maxiter:
+            warnflag = 1
+            break
+
+        # Determine the direction of the next step. The cutoff for small
+        # singular values is set explicitly, as rcond=None is not available
+        # before numpy 1.14.
+        hess = np.dot(scores.T, scores) / num_obs
+        direc = -np.linalg.lstsq(hess, grad, rcond=-1)[0]
+
+        # The step is halved until the criterion function improves.
+        is_improved, step = False, 1.0
+        for _ in range(MAX_HALVINGS):
+
+            x_new = x + step * direc
+
+            contribs_new = get_agent_contribs(func(x_new, *args),
+                num_agents_est, num_periods)
+            fval_new = -np.sum(contribs_new) / num_obs
+
+            if fval_new < fval:
+                is_improved = True
+                break
+
+            step = step / 2.0
+
+        if not is_improved:
+            warnflag = 2
+            break
+
+        x, fval, contribs = x_new, fval_new, contribs_new
+
+        num_iter += 1
+
+    # Finishing
+    return x, fval, num_iter, warnflag
+
+
+def get_agent_scores(scores, num_agents_est, num_periods):
+    """ Aggregate the scores of all observations to the scores of the agents,
+    as the log-likelihood contribution of an agent is the sum over all
+    periods.
+    """
+    scores = scores.reshape(num_agents_est, num_periods, -1)
+
+    # Finishing
+    return np.sum(scores, axis=1)
+
+
+def get_agent_contribs(contribs, num_agents_est, num_periods):
+    """ Aggregate the likelihood contributions of all observations to the
+    log-likelihood contributions of the agents. The truncation aligns with
+    get_log_likl.
+    """
+    contribs = np.clip(np.log(contribs), -HUGE_FLOAT, HUGE_FLOAT)
+
+    # Finishing
+    return np.sum(contribs.reshape(num_agents_est, num_periods), axis=1)
@@ -0,0 +1,100 @@
+""" This module contains the cache for the values of the criterion function.
+The optimizers evaluate identical parameter vectors repeatedly, for example at
+the endpoints of a bracket or after resuming an estimation. Each repetition
+would otherwise require to solve the model and evaluate the likelihood again.
+"""
+from collections import OrderedDict
+
+import pickle as pkl
+import numpy as np
+import os
+
+
+class CacheCls(object):
+    """ This class manages a cache of the most recently used values of the
+    criterion function. It is keyed on the exact bytes of the full parameter
+    vector and the seeds of the draws and the interpolation points. The cache
+    is optionally stored on disk after each update, so it is available when
+    resuming an estimation.
+    """
+
+    def __init__(self, size, seeds, fname=None):
+
+        # Antibugging
+        assert (isinstance(size, int))
+        assert (size > 0)
+
+        # Constitutive attributes
+        self.seeds = np.array(seeds, dtype=np.int64).tobytes()
+        self.fname = fname
+        self.size = size
+
+        # Updated attributes
+        self.container = OrderedDict()
+
+        if (fname is not None) and os.path.exists(fname):
+            self._load()
+
+    def get(self, x_all_current):
+        """ Get the value of the criterion function, which is None if not
+        available.
+        """
+        key = self._get_key(x_all_current)
+
+        fval = self.container.pop(key, None)
+
+        # The value is now the most recently used one.
+        if fval is not None:
+            self.container[key] = fval
+
+        # Finishing
+        return fval
+
+    def set(self, x_all_current, fval):
+        """ Add the value of the criterion function and remove the least
+        recently used values if required.
+        """
+        self.set_batch([x_all_current], [fval])
+
+    def set_batch(self, x_all_batch, fvals):
+        """ Add the values of the criterion function for a batch of parameter
+        vectors. The cache is stored only once for the whole batch.
+        """
+        for x_all_current, fval in zip(x_all_batch, fvals):
+            key = self._get_key(x_all_current)
+
+            self.container.pop(key, None)
+            self.container[key] = fval
+
+        while len(self.container) > self.size:
+            self.container.popitem(last=False)
+
+        if self.fname is not None:
+            self._store()
+
+    def _get_key(self, x_all_current):
+        """ Construct the key from the full parameter vector and the seeds.
+        """
+        x_all_current = np.ascontiguousarray(x_all_current, dtype=np.float64)
+
+        # Finishing
+        return x_all_current.tobytes() + self.seeds
+
+    def _store(self):
+        """ Store the cache. The file is replaced only once it is complete.
+        """
+        fname_tmp = self.fname + '.tmp'
+
+        with open(fname_tmp, 'wb') as out_file:
+            pkl.dump(list(self.container.items()), out_file)
+
+        os.rename(fname_tmp, self.fname)
+
+    def _load(self):
+        """ Load the cache.
+        """
+        with open(self.fname, 'rb') as in_file:
+            items = pkl.load(in_file)
+
+        for key, fval in items[-self.size:]:
+            self.container[key] = fval
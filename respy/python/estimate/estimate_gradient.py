@@ -0,0 +1,162 @@
+""" This module contains the approximation of the gradient of the criterion
+function by finite differences. All evaluations at the perturbed parameter
+vectors are independent of each other, so they are distributed across the
+pool of workers, if available.
+"""
+import numpy as np
+
+from respy.python.shared.shared_constants import EMAX_MEMORY_BUDGET
+from respy.python.estimate.estimate_python import pyth_contributions
+from respy.python.estimate.estimate_python import pyth_criterion
+from respy.python.shared.shared_context import silent_context
+from respy.python.shared.shared_parallel import WORKER
+
+# The evaluations that are available for the perturbed parameter vectors.
+EVALUATIONS = dict()
+EVALUATIONS['criterion'] = pyth_criterion
+EVALUATIONS['contributions'] = pyth_contributions
+
+
+def pyth_gradient(x_all, paras_fixed, derivatives, *args):
+    """ Approximate the gradient of the criterion function with respect to the
+    free parameters.
+    """
+    x_perturbed = get_perturbations(x_all, paras_fixed, derivatives)
+
+    crit_vals = get_crit_vals(x_perturbed, *args)
+
+    grad = get_gradient(crit_vals, derivatives)
+
+    # Finishing
+    return grad
+
+
+def get_perturbations(x_all, paras_fixed, derivatives):
+    """ Construct the parameter vectors required for the approximation of the
+    gradient. For forward differences, the first vector is the baseline.
+    """
+    # Distribute derivatives
+    version, dfunc_eps = derivatives
+
+    # Auxiliary objects
+    free = np.where(np.logical_not(paras_fixed))[0]
+    num_free = len(free)
+
+    perturbations = np.zeros((num_free, 26))
+    perturbations[range(num_free), free] = dfunc_eps
+
+    if version == 'FORWARD-DIFFERENCES':
+        x_perturbed = np.vstack((x_all, x_all + perturbations))
+    elif version == 'CENTRAL-DIFFERENCES':
+        x_perturbed = np.vstack((x_all + perturbations, x_all - perturbations))
+    else:
+        raise AssertionError
+
+    # Finishing
+    return x_perturbed
+
+
+def get_gradient(crit_vals, derivatives):
+    """ Construct the gradient from the values of the criterion function at
+    the perturbed parameter vectors. The values may also be arrays, e.g. the
+    likelihood contributions, with one row for each parameter vector.
+    """
+    # Distribute derivatives
+    version, dfunc_eps = derivatives
+
+    if version == 'FORWARD-DIFFERENCES':
+        grad = (crit_vals[1:] - crit_vals[0]) / dfunc_eps
+    elif version == 'CENTRAL-DIFFERENCES':
+        num_free = len(crit_vals) // 2
+        grad = (crit_vals[:num_free] - crit_vals[num_free:]) / (2 * dfunc_eps)
+    else:
+        raise AssertionError
+
+    # Finishing
+    return grad
+
+
+def get_crit_vals(x_perturbed, *args):
+    """ Evaluate the criterion function at all parameter vectors.
+    """
+    crit_vals = _evaluate_perturbations(x_perturbed, 'criterion', *args)
+
+    # Finishing
+    return crit_vals
+
+
+def get_contribs(x_perturbed, *args):
+    """ Evaluate the likelihood contributions of all observations at all
+    parameter vectors. There is one row for each parameter vector.
+    """
+    contribs = _evaluate_perturbations(x_perturbed, 'contributions', *args)
+
+    # Finishing
+    return contribs
+
+
+def _evaluate_perturbations(x_perturbed, which, is_interpolated,
+        num_draws_emax, num_periods, num_points_interp, is_myopic, edu_start,
+        is_debug, edu_max, min_idx, delta, data_array, num_agents_est,
+        num_draws_prob, tau, periods_draws_emax, periods_draws_prob,
+        state_space=None, is_jit=False, pool=None, obs_index=None,
+        memory_budget=EMAX_MEMORY_BUDGET):
+    """ Evaluate the criterion function or the likelihood contributions at
+    all parameter vectors. If a pool of workers is available, each of them
+    evaluates a subset of the parameter vectors on its own.
+    """
+    num_evals = x_perturbed.shape[0]
+
+    # The interpolation points are drawn from a random state that is reset
+    # for each solution, so the workers and the master evaluate the same
+    # values of the criterion function also in the case of interpolation.
+    if pool is not None:
+        tasks = []
+        for i in range(num_evals):
+            tasks += [(x_perturbed[i, :], which, is_interpolated,
+                num_draws_emax, num_periods, num_points_interp, is_myopic,
+                edu_start, is_debug, edu_max, min_idx, delta, num_agents_est,
+                num_draws_prob, tau, is_jit, memory_budget / pool.num_slaves)]
+
+        rslts = pool.map(_evaluate_slave, tasks)
+
+    else:
+        args = (is_interpolated, num_draws_emax, num_periods,
+            num_points_interp, is_myopic, edu_start, is_debug, edu_max,
+            min_idx, delta, data_array, num_agents_est, num_draws_prob, tau,
+            periods_draws_emax, periods_draws_prob, state_space, is_jit, None,
+            obs_index, memory_budget)
+
+        func = EVALUATIONS[which]
+
+        rslts = []
+        for i in range(num_evals):
+            rslts += [func(x_perturbed[i, :], *args)]
+
+    # Finishing
+    return np.array(rslts)
+
+
+def _evaluate_slave(task):
+    """ Evaluate the criterion function or the likelihood contributions. This
+    is the task of the workers, which find the draws, the state space, and the
+    observation index available from their start. The model is solved by each
+    worker on its own, so the log of the solution is left to the master.
+    """
+    # Distribute task
+    x, which, is_interpolated, num_draws_emax, num_periods, \
+        num_points_interp, is_myopic, edu_start, is_debug, edu_max, min_idx, \
+        delta, num_agents_est, num_draws_prob, tau, is_jit, memory_budget = \
+        task
+
+    with silent_context():
+        rslt = EVALUATIONS[which](x, is_interpolated, num_draws_emax,
+            num_periods, num_points_interp, is_myopic, edu_start, is_debug,
+            edu_max, min_idx, delta, None, num_agents_est, num_draws_prob, tau,
+            WORKER['periods_draws_emax'], WORKER['periods_draws_prob'],
+            WORKER['state_space'], is_jit, None, WORKER['obs_index'],
+            memory_budget)
+
+    # Finishing
+    return rslt
+
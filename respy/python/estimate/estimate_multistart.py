@@ -0,0 +1,48 @@
+""" This module contains the infrastructure for the estimation from multiple
+starting values. Each start is estimated by a separate worker process in its
+own directory. The best values of the criterion function are exchanged
+between the workers through shared memory, so a start can be stopped early
+once it is dominated by another one.
+"""
+import numpy as np
+
+# The objects available to a worker. These are set once during its
+# initialization, only the current start changes between the tasks.
+MULTISTART = dict()
+
+
+def initialize_multistart(crit_vals, margin, data_array, state_space):
+    """ Initialize a worker of the multistart estimation. The state space is
+    not available for the FORTRAN version.
+    """
+    MULTISTART['crit_vals'] = np.frombuffer(crit_vals)
+    MULTISTART['state_space'] = state_space
+    MULTISTART['data_array'] = data_array
+    MULTISTART['margin'] = margin
+
+    MULTISTART['is_dominated'] = False
+    MULTISTART['idx'] = None
+
+
+def check_dominance(fval):
+    """ Record the value of the criterion function for the current start and
+    check whether it is dominated by any other start.
+    """
+    # This is only relevant inside a multistart estimation.
+    if MULTISTART.get('idx', None) is None:
+        return
+
+    crit_vals, idx = MULTISTART['crit_vals'], MULTISTART['idx']
+
+    crit_vals[idx] = min(crit_vals[idx], fval)
+
+    if crit_vals[idx] > np.min(crit_vals) + MULTISTART['margin']:
+        MULTISTART['is_dominated'] = True
+        raise DominatedError
+
+
+class DominatedError(Exception):
+    """ This custom-error class allows to stop the estimation of a start once
+    it is dominated, independent of the optimizer used.
+    """
+    pass
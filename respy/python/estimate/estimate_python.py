@@ -1,4 +1,5 @@
 from respy.python.shared.shared_auxiliary import dist_optim_paras
+from respy.python.shared.shared_constants import EMAX_MEMORY_BUDGET
 from respy.python.evaluate.evaluate_python import pyth_evaluate
 from respy.python.shared.shared_auxiliary import get_log_likl
 
@@ -6,13 +7,36 @@ from respy.python.shared.shared_auxiliary import get_log_likl
 def pyth_criterion(x, is_interpolated, num_draws_emax, num_periods,
         num_points_interp, is_myopic, edu_start, is_debug, edu_max, min_idx, delta,
         data_array, num_agents_est, num_draws_prob, tau, periods_draws_emax,
-        periods_draws_prob):
+        periods_draws_prob, state_space=None, is_jit=False, pool=None,
+        obs_index=None, memory_budget=EMAX_MEMORY_BUDGET):
     """ This function provides the wrapper for optimization routines.
     """
     args = (is_interpolated, num_draws_emax, num_periods, num_points_interp,
         is_myopic, edu_start, is_debug, edu_max, min_idx, delta, data_array,
         num_agents_est, num_draws_prob, tau, periods_draws_emax,
-        periods_draws_prob)
+        periods_draws_prob, state_space, is_jit, pool, obs_index,
+        memory_budget)
+
+    contribs = pyth_contributions(x, *args)
+
+    crit_val = get_log_likl(contribs)
+
+    return crit_val
+
+
+def pyth_contributions(x, is_interpolated, num_draws_emax, num_periods,
+        num_points_interp, is_myopic, edu_start, is_debug, edu_max, min_idx, delta,
+        data_array, num_agents_est, num_draws_prob, tau, periods_draws_emax,
+        periods_draws_prob, state_space=None, is_jit=False, pool=None,
+        obs_index=None, memory_budget=EMAX_MEMORY_BUDGET):
+    """ This function returns the likelihood contributions of all observations
+    for the full set of parameters.
+    """
+    args = (is_interpolated, num_draws_emax, num_periods, num_points_interp,
+        is_myopic, edu_start, is_debug, edu_max, min_idx, delta, data_array,
+        num_agents_est, num_draws_prob, tau, periods_draws_emax,
+        periods_draws_prob, state_space, is_jit, pool, obs_index,
+        memory_budget)
 
     coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky \
         = dist_optim_paras(x, is_debug)
@@ -20,6 +44,4 @@ def pyth_criterion(x, is_interpolated, num_draws_emax, num_periods,
     contribs = pyth_evaluate(coeffs_a, coeffs_b, coeffs_edu, coeffs_home,
         shocks_cholesky, *args)
 
-    crit_val = get_log_likl(contribs)
-
-    return crit_val
+    return contribs
@@ -1,9 +1,17 @@
 import numpy as np
 
 from respy.python.record.record_estimation import record_estimation_eval
+from respy.python.estimate.estimate_gradient import get_perturbations
+from respy.python.estimate.estimate_multistart import check_dominance
+from respy.python.estimate.estimate_python import pyth_contributions
+from respy.python.estimate.estimate_gradient import get_crit_vals
+from respy.python.estimate.estimate_gradient import get_contribs
+from respy.python.estimate.estimate_gradient import get_gradient
 from respy.python.estimate.estimate_python import pyth_criterion
+from respy.python.shared.shared_auxiliary import get_log_likl
 from respy.python.shared.shared_auxiliary import get_cholesky
 from respy.python.record.record_warning import record_warning
+from respy.python.shared.shared_constants import HUGE_FLOAT
 
 
 class OptimizationClass(object):
@@ -19,8 +27,12 @@ class OptimizationClass(object):
         # Constitutive attributes
         self.x_all_start = None
         self.paras_fixed = None
+        self.derivatives = None
         self.maxfun = np.inf
 
+        # The cache of the criterion function is optional.
+        self.cache = None
+
         # Updated attributes
         self.x_container = np.tile(np.nan, (26, 3))
         self.crit_vals = np.tile(np.inf, 3)
@@ -33,8 +45,124 @@ class OptimizationClass(object):
         """
         # Evaluate criterion function
         x_all_current = self._construct_all_current_values(x)
-        fval = pyth_criterion(x_all_current, *args)
 
+        fval = None
+        if self.cache is not None:
+            fval = self.cache.get(x_all_current)
+
+        if fval is None:
+            fval = pyth_criterion(x_all_current, *args)
+            if self.cache is not None:
+                self.cache.set(x_all_current, fval)
+
+        self._update_progress(x_all_current, fval)
+
+        # Finishing
+        return fval
+
+    def contribs_func(self, x, *args):
+        """ This method returns the likelihood contributions of all
+        observations. Each call counts as an evaluation of the criterion
+        function.
+        """
+        # Evaluate likelihood contributions
+        x_all_current = self._construct_all_current_values(x)
+        contribs = pyth_contributions(x_all_current, *args)
+
+        fval = get_log_likl(contribs)
+
+        self._update_progress(x_all_current, fval)
+
+        # Finishing
+        return contribs
+
+    def grad_func(self, x, *args):
+        """ This method approximates the gradient of the criterion function by
+        finite differences. The perturbed evaluations are distributed across
+        the pool of workers, if available. Each of them counts as an
+        evaluation of the criterion function.
+        """
+        # Evaluate criterion function at perturbed parameters
+        x_all_current = self._construct_all_current_values(x)
+        x_perturbed = get_perturbations(x_all_current, self.paras_fixed,
+            self.derivatives)
+
+        crit_vals = self._evaluate_batch(x_perturbed, *args)
+
+        grad = get_gradient(crit_vals, self.derivatives)
+
+        # Finishing
+        return grad
+
+    def scores_func(self, x, *args):
+        """ This method approximates the scores of all observations, i.e. the
+        derivatives of the logarithm of their likelihood contributions, by
+        finite differences. The perturbed evaluations are distributed across
+        the pool of workers, if available. They do not count as evaluations
+        of the criterion function.
+        """
+        # Evaluate likelihood contributions at perturbed parameters
+        x_all_current = self._construct_all_current_values(x)
+        x_perturbed = get_perturbations(x_all_current, self.paras_fixed,
+            self.derivatives)
+
+        contribs = get_contribs(x_perturbed, *args)
+
+        # The truncation aligns with get_log_likl.
+        contribs = np.clip(np.log(contribs), -HUGE_FLOAT, HUGE_FLOAT)
+
+        scores = get_gradient(contribs, self.derivatives).T
+
+        # Finishing
+        return scores
+
+    def crit_func_batch(self, x_batch, *args):
+        """ This method evaluates the criterion function for a batch of free
+        parameter vectors, one in each row. The evaluations are distributed
+        across the pool of workers, if available, and recorded in order.
+        """
+        # Construct the full set of values for all parameter vectors
+        x_all_batch = np.tile(np.nan, (len(x_batch), 26))
+        for i, x in enumerate(x_batch):
+            x_all_batch[i, :] = self._construct_all_current_values(x)
+
+        crit_vals = self._evaluate_batch(x_all_batch, *args)
+
+        # Finishing
+        return crit_vals
+
+    def _evaluate_batch(self, x_all_batch, *args):
+        """ Evaluate the criterion function for a batch of full parameter
+        vectors. Each evaluation counts as an evaluation of the criterion
+        function, even if its value is taken from the cache.
+        """
+        crit_vals = np.tile(np.nan, len(x_all_batch))
+
+        if self.cache is not None:
+            for i, x_all_current in enumerate(x_all_batch):
+                fval = self.cache.get(x_all_current)
+                if fval is not None:
+                    crit_vals[i] = fval
+
+        # Only the remaining parameter vectors are evaluated.
+        is_missing = np.isnan(crit_vals)
+        if np.any(is_missing):
+            crit_vals[is_missing] = get_crit_vals(x_all_batch[is_missing, :],
+                *args)
+
+            if self.cache is not None:
+                self.cache.set_batch(x_all_batch[is_missing, :],
+                    crit_vals[is_missing])
+
+        for i, fval in enumerate(crit_vals):
+            self._update_progress(x_all_batch[i, :], fval)
+
+        # Finishing
+        return crit_vals
+
+    def _update_progress(self, x_all_current, fval):
+        """ Update and record the progress of the estimation.
+        """
         # Identify events
         is_start = (self.num_eval == 0)
         is_step = (self.crit_vals[1] > fval)
@@ -67,8 +195,9 @@ class OptimizationClass(object):
         if self.maxfun == self.num_eval:
             raise MaxfunError
 
-        # Finishing
-        return fval
+        # Stop the estimation if dominated by another start of a multistart
+        # estimation.
+        check_dominance(fval)
 
     def _construct_all_current_values(self, x):
         """ Construct the full set of current values.
@@ -4,23 +4,107 @@ criterion function.
 import numpy as np
 
 from respy.python.shared.shared_auxiliary import check_dataset
+from respy.python.shared.shared_constants import MISSING_FLOAT
 from respy.python.shared.shared_constants import HUGE_FLOAT
 
 
 def get_smoothed_probability(total_payoffs, idx, tau):
-    """ Construct the smoothed choice probabilities.
+    """ Construct the smoothed choice probabilities. The total values of the
+    alternatives are in the last dimension, all leading dimensions are
+    handled at once.
     """
-    maxim_payoff = max(total_payoffs)
+    maxim_payoff = np.max(total_payoffs, axis=-1, keepdims=True)
 
     smoot_payoff = np.clip(np.exp((total_payoffs - maxim_payoff)/tau), 0.0,
         HUGE_FLOAT)
 
-    prob_choice = smoot_payoff[idx] / sum(smoot_payoff)
+    is_choice = (np.arange(4) == np.expand_dims(idx, -1))
+
+    prob_choice = np.sum(smoot_payoff * is_choice, axis=-1) / \
+        np.sum(smoot_payoff, axis=-1)
 
     # Finishing
     return prob_choice
 
 
+def get_normal_pdf(x, mean, sd):
+    """ Evaluate the density of the normal distribution. This aligns with the
+    computation in scipy.stats.norm.pdf, but avoids its overhead.
+    """
+    x = (x - mean) / sd
+
+    # Finishing
+    return np.exp(-x ** 2 / 2.0) / np.sqrt(2 * np.pi) / sd
+
+
+def get_obs_index(data_array, mapping_state_idx, num_agents_est, num_periods,
+        edu_start):
+    """ Construct the observation index. The estimation sample does not
+    depend on the model parameters, so it is mapped to the state space only
+    once. The observations are ordered by agents and then periods. The
+    logarithm of the wages is only available for working observations.
+    Observations in the same cell share the same period, state, choice, and
+    wage and thus have identical contributions.
+    """
+    # Construct auxiliary objects
+    num_obs = num_agents_est * num_periods
+
+    # Distribute the dataset
+    exp_a, exp_b, edu, edu_lagged = data_array[:num_obs, 4:].astype(int).T
+    choices = data_array[:num_obs, 2].astype(int)
+    wages = data_array[:num_obs, 3]
+
+    # Transform total years of education to additional years of education.
+    edu = edu - edu_start
+
+    periods = np.tile(np.arange(num_periods), num_agents_est)
+
+    # Get state indicator to obtain the systematic component of the agents
+    # payoffs.
+    states = mapping_state_idx[periods, exp_a, exp_b, edu, edu_lagged]
+
+    is_working = np.in1d(choices, [1, 2])
+
+    wages_log = np.tile(MISSING_FLOAT, num_obs)
+    wages_log[is_working] = np.clip(np.log(wages[is_working]), -HUGE_FLOAT,
+        HUGE_FLOAT)
+
+    # All agents face the same draws in a period. So the contributions only
+    # differ between agents if their state, choice, or wage differs.
+    cells = get_cells(periods, states, choices, wages_log)
+
+    # Collect compact arrays
+    obs_index = dict()
+    obs_index['periods'] = periods.astype(np.int32)
+    obs_index['states'] = states.astype(np.int32)
+    obs_index['choices'] = choices.astype(np.int32)
+    obs_index['is_working'] = is_working
+    obs_index['wages_log'] = wages_log
+    obs_index['cells'] = cells.astype(np.int32)
+
+    # Finishing
+    return obs_index
+
+
+def get_cells(*columns):
+    """ Number the distinct rows of the columns in lexicographic order and
+    assign each observation the number of its row.
+    """
+    # Sort the observations, the first column is the primary key.
+    order = np.lexsort(columns[::-1])
+
+    is_new = np.tile(False, order.size)
+    is_new[:1] = True
+    for column in columns:
+        is_new[1:] |= (np.diff(column[order]) != 0)
+
+    cells = np.empty(order.size, dtype=np.int64)
+    cells[order] = np.cumsum(is_new) - 1
+
+    # Finishing
+    return cells
+
+
 def check_output(crit_val):
     """ Check integrity of criterion function.
     """
@@ -0,0 +1,151 @@
+""" This module contains the JIT-compiled kernels for the evaluation of the
+criterion function.
+"""
+import numpy as np
+
+from respy.python.shared.shared_jit import jit_transform_disturbances
+from respy.python.shared.shared_jit import jit_get_total_value
+from respy.python.shared.shared_constants import SMALL_FLOAT
+from respy.python.shared.shared_constants import HUGE_FLOAT
+from respy.python.shared.shared_jit import jit
+
+
+@jit
+def jit_evaluate(periods_payoffs_systematic, periods_successors,
+        periods_inadmissible, periods_emax, shocks_cholesky,
+        periods_draws_prob, num_periods, num_draws_prob, delta, tau,
+        is_deterministic, obs_periods, obs_states, obs_choices,
+        obs_is_working, obs_wages_log):
+    """ Evaluate the likelihood contributions. This is the counterpart to
+    get_contributions. The observations are taken from the observation index.
+    """
+    # Initialize auxiliary objects
+    num_obs = obs_periods.shape[0]
+    contribs = np.full(num_obs, -HUGE_FLOAT)
+
+    draws_stan = np.zeros(4)
+    draws = np.zeros(4)
+    total_payoffs = np.zeros(4)
+    counts = np.zeros(4, dtype=np.int64)
+
+    # Calculate the probability over agents and time.
+    for j in range(num_obs):
+
+        # Distribute observation
+        period, k, choice = obs_periods[j], obs_states[j], obs_choices[j]
+
+        is_working = obs_is_working[j]
+        idx = choice - 1
+
+        payoffs_systematic = periods_payoffs_systematic[period, k, :]
+
+        # If an agent is observed working, then the the labor market shocks
+        # are observed and the conditional distribution is used to determine
+        # the choice probabilities.
+        dist = 0.0
+        if is_working:
+            dist = obs_wages_log[j] - min(max(np.log(
+                payoffs_systematic[idx]), -HUGE_FLOAT), HUGE_FLOAT)
+
+            # If there is no random variation in payoffs, then the observed
+            # wages need to be identical their systematic components.
+            if is_deterministic and (dist > SMALL_FLOAT):
+                contribs[:] = 1
+                return contribs
+
+        # Simulate the conditional distribution of alternative-specific
+        # value functions and determine the choice probabilities.
+        counts[:] = 0
+        prob_obs = 0.0
+
+        for s in range(num_draws_prob):
+
+            # Extract the standard normal deviates sample for the iteration.
+            draws_stan[:] = periods_draws_prob[period, s, :]
+
+            # Construct independent normal draws implied by the agents state
+            # experience.
+            if is_working:
+                if is_deterministic:
+                    prob_wage = HUGE_FLOAT
+                else:
+                    if choice == 1:
+                        draws_stan[0] = dist / shocks_cholesky[idx, idx]
+                        mean = 0.0
+                        sd = abs(shocks_cholesky[idx, idx])
+                    else:
+                        draws_stan[1] = (dist - shocks_cholesky[idx, 0] *
+                            draws_stan[0]) / shocks_cholesky[idx, idx]
+                        mean = shocks_cholesky[idx, 0] * draws_stan[0]
+                        sd = abs(shocks_cholesky[idx, idx])
+
+                    prob_wage = _normal_pdf(dist, mean, sd)
+
+            else:
+                prob_wage = 1.0
+
+            # Create the conditional draws and transform labor market shocks.
+            jit_transform_disturbances(draws_stan, shocks_cholesky, draws)
+
+            # Calculate total payoff.
+            jit_get_total_value(period, num_periods, delta,
+                payoffs_systematic, draws, periods_successors,
+                periods_inadmissible, periods_emax, k, total_payoffs)
+
+            # Record optimal choices
+            counts[np.argmax(total_payoffs)] += 1
+
+            # Get the smoothed choice probability.
+            prob_choice = _get_smoothed_probability(total_payoffs, idx, tau)
+            prob_obs += prob_choice * prob_wage
+
+        # Determine relative shares
+        prob_obs = prob_obs / num_draws_prob
+
+        # If there is no random variation in payoffs, then this implies that
+        # the observed choice in the dataset is the only choice.
+        if is_deterministic and (not (counts[idx] == num_draws_prob)):
+            contribs[:] = 1
+            return contribs
+
+        # Adjust  and record likelihood contribution
+        contribs[j] = prob_obs
+
+    # If there is no random variation in payoffs and no agent violated the
+    # implications of observed wages and choices, then the evaluation return
+    # a value of one.
+    if is_deterministic:
+        contribs[:] = np.exp(1.0)
+
+    # Finishing
+    return contribs
+
+
+@jit
+def _get_smoothed_probability(total_payoffs, idx, tau):
+    """ Construct the smoothed choice probabilities. This is the counterpart to
+    get_smoothed_probability.
+    """
+    maxim_payoff = total_payoffs.max()
+
+    sum_payoff, smoot_idx = 0.0, 0.0
+    for j in range(4):
+        smoot_payoff = min(max(np.exp((total_payoffs[j] - maxim_payoff) /
+            tau), 0.0), HUGE_FLOAT)
+        sum_payoff += smoot_payoff
+        if j == idx:
+            smoot_idx = smoot_payoff
+
+    # Finishing
+    return smoot_idx / sum_payoff
+
+
+@jit
+def _normal_pdf(x, mean, sd):
+    """ Evaluate the density of the normal distribution. This aligns with the
+    computation in scipy.stats.norm.pdf.
+    """
+    x = (x - mean) / sd
+
+    # Finishing
+    return np.exp(-x ** 2 / 2.0) / np.sqrt(2 * np.pi) / sd
@@ -1,22 +1,32 @@
-from scipy.stats import norm
 import numpy as np
 
 from respy.python.evaluate.evaluate_auxiliary import get_smoothed_probability
+from respy.python.shared.shared_constants import EMAX_MEMORY_BUDGET
+from respy.python.evaluate.evaluate_auxiliary import get_normal_pdf
+from respy.python.evaluate.evaluate_auxiliary import get_obs_index
+from respy.python.solve.solve_auxiliary import get_block_size
 from respy.python.shared.shared_auxiliary import get_total_value
+from respy.python.shared.shared_parallel import distribute_workload
+from respy.python.evaluate.evaluate_jit import jit_evaluate
 from respy.python.shared.shared_constants import SMALL_FLOAT
 from respy.python.shared.shared_constants import HUGE_FLOAT
 from respy.python.solve.solve_python import pyth_solve
+from respy.python.shared.shared_parallel import WORKER
 
 
 def pyth_evaluate(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky,
         is_interpolated, num_draws_emax, num_periods, num_points_interp,
         is_myopic, edu_start, is_debug,  edu_max, min_idx, delta, data_array,
         num_agents_est, num_draws_prob, tau, periods_draws_emax,
-        periods_draws_prob):
+        periods_draws_prob, state_space=None, is_jit=False, pool=None,
+        obs_index=None, memory_budget=EMAX_MEMORY_BUDGET):
     """ Evaluate criterion function. This code allows for a deterministic
     model, where there is no random variation in the rewards. If that is the
     case and all agents have corresponding experiences, then one is returned.
     If a single agent violates the implications, then the zero is returned.
+    The JIT-compiled kernel is used for the NUMBA version. Both the solution
+    of the model and the evaluation of the likelihood contributions are
+    distributed across the pool of workers, if available.
     """
     # Construct auxiliary object
     shocks_cov = np.matmul(shocks_cholesky, shocks_cholesky.T)
@@ -28,124 +38,120 @@ def pyth_evaluate(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky,
         is_myopic, edu_start, is_debug, edu_max, min_idx, delta)
 
     periods_payoffs_systematic, _, mapping_state_idx, periods_emax, \
-        states_all = pyth_solve(*base_args + (periods_draws_emax, ))
+        states_all = pyth_solve(*base_args + (periods_draws_emax,
+        state_space, is_jit, pool, memory_budget))
+
+    # Distribute the observations across the pool of workers, if available.
+    # The shares are contiguous, so the contributions are collected in the
+    # original order.
+    num_obs = num_agents_est * num_periods
+
+    if obs_index is None:
+        obs_index = get_obs_index(data_array, mapping_state_idx,
+            num_agents_est, num_periods, edu_start)
+
+    if pool is not None:
+        pool.shared['periods_payoffs_systematic'][:, :, :] = \
+            periods_payoffs_systematic
+        pool.shared['periods_emax'][:, :] = periods_emax
+
+        tasks = []
+        for slice_ in distribute_workload(num_obs, pool.num_slaves):
+            if slice_.start == slice_.stop:
+                continue
+            tasks += [(slice_.start, slice_.stop, shocks_cholesky, num_periods,
+                num_draws_prob, edu_start, edu_max, delta, tau, is_jit,
+                memory_budget / pool.num_slaves)]
+
+        pool.map(_evaluate_slave, tasks)
+
+        contribs = pool.shared['contribs'][:num_obs].copy()
+
+        # If a single observation violates the implications of a model
+        # without random variation in payoffs, this applies to all of them.
+        if is_deterministic and np.any(contribs == 1):
+            contribs[:] = 1
+
+    else:
+        contribs = get_contributions(0, num_obs, periods_payoffs_systematic,
+            mapping_state_idx, periods_emax, states_all, shocks_cholesky,
+            obs_index, periods_draws_prob, num_periods, num_draws_prob,
+            edu_start, edu_max, delta, tau, is_jit, memory_budget)
+
+    # Finishing
+    return contribs
+
+
+def get_contributions(lower_bound, upper_bound, periods_payoffs_systematic,
+        mapping_state_idx, periods_emax, states_all, shocks_cholesky,
+        obs_index, periods_draws_prob, num_periods, num_draws_prob,
+        edu_start, edu_max, delta, tau, is_jit=False,
+        memory_budget=EMAX_MEMORY_BUDGET):
+    """ Evaluate the likelihood contributions for a share of the observations.
+    The contribution of each cell of identical observations is only
+    evaluated once. All cells of a period are evaluated for all draws at
+    once. They are processed in blocks to respect the memory budget. The
+    JIT-compiled kernel is used for the NUMBA version.
+    """
+    # Construct auxiliary object
+    is_deterministic = (np.count_nonzero(shocks_cholesky) == 0)
+
+    # Distribute the observations. Only the first observation of each cell
+    # is evaluated and its contribution is then assigned to all others.
+    share = slice(lower_bound, upper_bound)
+
+    _, j_unique, j_inverse = np.unique(obs_index['cells'][share],
+        return_index=True, return_inverse=True)
+
+    obs_periods = obs_index['periods'][share][j_unique]
+    obs_states = obs_index['states'][share][j_unique]
+    obs_choices = obs_index['choices'][share][j_unique]
+    obs_is_working = obs_index['is_working'][share][j_unique]
+    obs_wages_log = obs_index['wages_log'][share][j_unique]
+
+    if is_jit:
+        contribs = jit_evaluate(periods_payoffs_systematic,
+            mapping_state_idx.periods_successors,
+            mapping_state_idx.periods_inadmissible, periods_emax,
+            shocks_cholesky, periods_draws_prob, num_periods, num_draws_prob,
+            delta, tau, is_deterministic, obs_periods, obs_states,
+            obs_choices, obs_is_working, obs_wages_log)
+
+        return contribs[j_inverse]
 
     # Initialize auxiliary objects
-    contribs = np.tile(-HUGE_FLOAT, (num_agents_est * num_periods))
-    j = 0
+    contribs = np.tile(-HUGE_FLOAT, j_unique.size)
+
+    block_size = get_block_size(num_draws_prob, memory_budget)
 
     # Calculate the probability over agents and time.
-    for _ in range(num_agents_est):
-        for period in range(num_periods):
-            # Extract observable components of state space as well as agent
-            # decision.
-            exp_a, exp_b, edu, edu_lagged = data_array[j, 4:].astype(int)
-            choice = data_array[j, 2].astype(int)
-            is_working = choice in [1, 2]
-
-            # Transform total years of education to additional years of
-            # education and create an index from the choice.
-            edu, idx = edu - edu_start, choice - 1
-
-            # Get state indicator to obtain the systematic component of the
-            # agents payoffs. These feed into the simulation of choice
-            # probabilities.
-            k = mapping_state_idx[period, exp_a, exp_b, edu, edu_lagged]
-            payoffs_systematic = periods_payoffs_systematic[period, k, :]
-
-            # Extract relevant deviates from standard normal distribution.
-            # The same set of baseline draws are used for each agent and period.
-            draws_prob_raw = periods_draws_prob[period, :, :].copy()
-
-            # If an agent is observed working, then the the labor market shocks
-            # are observed and the conditional distribution is used to determine
-            # the choice probabilities.
-            if is_working:
-                # Calculate the disturbance which are implied by the model
-                # and the observed wages.
-                dist = np.clip(np.log(data_array[j, 3]), -HUGE_FLOAT, HUGE_FLOAT) - \
-                       np.clip(np.log(payoffs_systematic[idx]), -HUGE_FLOAT,
-                           HUGE_FLOAT)
-
-                # If there is no random variation in payoffs, then the
-                # observed wages need to be identical their systematic
-                # components. The discrepancy between the observed wages and
-                # their systematic components might be small due to the
-                # reading in of the dataset (FORTRAN only).
-                if is_deterministic and (dist > SMALL_FLOAT):
-                    contribs[:] = 1
-                    return contribs
-
-            # Simulate the conditional distribution of alternative-specific
-            # value functions and determine the choice probabilities.
-            counts, prob_obs = np.tile(0, 4), 0.0
-
-            for s in range(num_draws_prob):
-
-                # Extract the standard normal deviates sample for the iteration.
-                draws_stan = draws_prob_raw[s, :]
-
-                # Construct independent normal draws implied by the agents
-                # state experience. This is need to maintain the correlation
-                # structure of the disturbances.  Special care is needed in case
-                # of a deterministic model, as otherwise a zero division error
-                # occurs.
-                if is_working:
-                    if is_deterministic:
-                        prob_wage = HUGE_FLOAT
-                    else:
-                        if choice == 1:
-                            draws_stan[0] = dist / shocks_cholesky[idx, idx]
-                            mean = 0.0
-                            sd = abs(shocks_cholesky[idx, idx])
-                        else:
-                            draws_stan[1] = (dist - shocks_cholesky[idx, 0] *
-                                draws_stan[0]) / shocks_cholesky[idx, idx]
-                            mean = shocks_cholesky[idx, 0] * draws_stan[0]
-                            sd = abs(shocks_cholesky[idx, idx])
-
-                        prob_wage = norm.pdf(dist, mean, sd)
-
-                else:
-                    prob_wage = 1.0
-
-                # As deviates are aligned with the state experiences, create
-                # the conditional draws. Note, that the realization of the
-                # random component of wages align withe their observed
-                # counterpart in the data.
-                draws_cond = np.dot(shocks_cholesky, draws_stan.T).T
-
-                # Extract deviates from (un-)conditional normal distributions
-                # and transform labor market shocks.
-                draws = draws_cond[:]
-                draws[:2] = np.clip(np.exp(draws[:2]), 0.0, HUGE_FLOAT)
-
-                # Calculate total payoff.
-                total_payoffs = get_total_value(period, num_periods,
-                    delta, payoffs_systematic, draws, edu_max, edu_start,
-                    mapping_state_idx, periods_emax, k, states_all)
-
-                # Record optimal choices
-                counts[np.argmax(total_payoffs)] += 1
-
-                # Get the smoothed choice probability.
-                prob_choice = get_smoothed_probability(total_payoffs, idx, tau)
-                prob_obs += prob_choice * prob_wage
-
-            # Determine relative shares
-            prob_obs = prob_obs / num_draws_prob
-
-            # If there is no random variation in payoffs, then this implies
-            # that the observed choice in the dataset is the only choice.
-            if is_deterministic and (not (counts[idx] == num_draws_prob)):
+    for period in range(num_periods):
+
+        # The same set of baseline draws are used for each agent in the
+        # period.
+        j_period = np.where(obs_periods == period)[0]
+
+        for start in range(0, j_period.size, block_size):
+
+            j = j_period[start:start + block_size]
+
+            prob_obs, is_violated = get_probabilities(period, num_periods,
+                obs_states[j], obs_choices[j], obs_wages_log[j],
+                periods_payoffs_systematic, periods_draws_prob,
+                num_draws_prob, shocks_cholesky, is_deterministic, tau,
+                delta, edu_max, edu_start, mapping_state_idx, periods_emax,
+                states_all)
+
+            # If there is no random variation in payoffs, then the observed
+            # wages need to be identical to their systematic components and
+            # the observed choice in the dataset is the only choice.
+            if is_violated:
                 contribs[:] = 1
-                return contribs
+                return contribs[j_inverse]
 
-            # Adjust  and record likelihood contribution
+            # Record likelihood contributions
             contribs[j] = prob_obs
 
-            j += 1
-
     # If there is no random variation in payoffs and no agent violated the
     # implications of observed wages and choices, then the evaluation return
     # a value of one.
@@ -153,5 +159,112 @@ def pyth_evaluate(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky,
         contribs[:] = np.exp(1.0)
 
     # Finishing
-    return contribs
+    return contribs[j_inverse]
+
+
+def get_probabilities(period, num_periods, k, choices, wages_log,
+        periods_payoffs_systematic, periods_draws_prob, num_draws_prob,
+        shocks_cholesky, is_deterministic, tau, delta, edu_max, edu_start,
+        mapping_state_idx, periods_emax, states_all):
+    """ Simulate the probabilities of the observed choices and wages for a
+    group of observations in the same period. The first dimension of all
+    arrays refers to the observations and the second to the draws.
+    """
+    # Construct auxiliary objects
+    num_obs = k.size
+    idx = choices - 1
+
+    is_violated = False
+
+    payoffs_systematic = periods_payoffs_systematic[period, k, :]
+
+    # Extract relevant deviates from standard normal distribution.
+    draws_stan = np.tile(periods_draws_prob[period, :num_draws_prob, :],
+        (num_obs, 1, 1))
+
+    prob_wage = np.ones((num_obs, num_draws_prob))
+
+    # If an agent is observed working, then the the labor market shocks are
+    # observed and the conditional distribution is used to determine the
+    # choice probabilities. The independent normal draws implied by the
+    # agents state experience are constructed to maintain the correlation
+    # structure of the disturbances.
+    for choice in [1, 2]:
+
+        is_working = (choices == choice)
+        if not np.any(is_working):
+            continue
+
+        i = choice - 1
+
+        # Calculate the disturbance which are implied by the model and the
+        # observed wages.
+        dist = wages_log[is_working] - np.clip(np.log(
+            payoffs_systematic[is_working, i]), -HUGE_FLOAT, HUGE_FLOAT)
+
+        # Special care is needed in case of a deterministic model, as
+        # otherwise a zero division error occurs. The discrepancy between
+        # the observed wages and their systematic components might be small
+        # due to the reading in of the dataset (FORTRAN only).
+        if is_deterministic:
+            is_violated = is_violated or np.any(dist > SMALL_FLOAT)
+            prob_wage[is_working, :] = HUGE_FLOAT
+            continue
+
+        dist = dist[:, None]
+
+        if choice == 1:
+            draws_stan[is_working, :, 0] = dist / shocks_cholesky[i, i]
+            mean = 0.0
+        else:
+            draws_stan[is_working, :, 1] = (dist - shocks_cholesky[i, 0] *
+                draws_stan[is_working, :, 0]) / shocks_cholesky[i, i]
+            mean = shocks_cholesky[i, 0] * draws_stan[is_working, :, 0]
+
+        sd = abs(shocks_cholesky[i, i])
+
+        prob_wage[is_working, :] = get_normal_pdf(dist, mean, sd)
+
+    # As deviates are aligned with the state experiences, create the
+    # conditional draws and transform labor market shocks.
+    draws = np.dot(draws_stan, shocks_cholesky.T)
+    draws[..., :2] = np.clip(np.exp(draws[..., :2]), 0.0, HUGE_FLOAT)
+
+    # Calculate total payoff.
+    total_payoffs = get_total_value(period, num_periods, delta,
+        payoffs_systematic[:, None, :], draws, edu_max, edu_start,
+        mapping_state_idx, periods_emax, k[:, None], states_all)
+
+    # If there is no random variation in payoffs, then this implies that the
+    # observed choice in the dataset is the only choice.
+    if is_deterministic:
+        is_optimal = (np.argmax(total_payoffs, axis=2) == idx[:, None])
+        is_violated = is_violated or (not np.all(is_optimal))
+
+    # Get the smoothed choice probability and determine relative shares.
+    prob_choice = get_smoothed_probability(total_payoffs, idx[:, None], tau)
+
+    prob_obs = np.sum(prob_choice * prob_wage, axis=1) / num_draws_prob
+
+    # Finishing
+    return prob_obs, is_violated
+
+
+def _evaluate_slave(task):
+    """ Evaluate the likelihood contributions for a share of the observations.
+    This is the task of the workers, which find the solution of the model in
+    shared memory. The observation index is available from their start.
+    """
+    # Distribute task
+    lower_bound, upper_bound, shocks_cholesky, num_periods, num_draws_prob, \
+        edu_start, edu_max, delta, tau, is_jit, memory_budget = task
+
+    contribs = get_contributions(lower_bound, upper_bound,
+        WORKER['periods_payoffs_systematic'], WORKER['mapping_state_idx'],
+        WORKER['periods_emax'], WORKER['states_all'], shocks_cholesky,
+        WORKER['obs_index'], WORKER['periods_draws_prob'], num_periods,
+        num_draws_prob, edu_start, edu_max, delta, tau, is_jit,
+        memory_budget)
 
+    # Store results
+    WORKER['contribs'][lower_bound:upper_bound] = contribs
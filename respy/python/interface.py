@@ -6,40 +6,69 @@ from respy.python.record.record_estimation import record_estimation_final
 from respy.python.shared.shared_auxiliary import dist_class_attributes
 from respy.python.estimate.estimate_auxiliary import get_optim_paras
 from respy.python.estimate.estimate_wrapper import OptimizationClass
+from respy.python.evaluate.evaluate_auxiliary import get_obs_index
+from respy.python.evaluate.evaluate_python import pyth_evaluate
 from respy.python.shared.shared_auxiliary import dist_model_paras
 from respy.python.shared.shared_constants import OPTIMIZERS_PYTH
+from respy.python.shared.shared_constants import SEED_INTERP
+from respy.python.simulate.simulate_python import pyth_simulate_chunks
+from respy.python.shared.shared_auxiliary import create_draws_memmap
 from respy.python.simulate.simulate_python import pyth_simulate
+from respy.python.estimate.estimate_multistart import DominatedError
 from respy.python.estimate.estimate_wrapper import MaxfunError
+from respy.python.estimate.estimate_gradient import pyth_gradient
+from respy.python.estimate.estimate_bhhh import fmin_bhhh
+from respy.python.estimate.estimate_cache import CacheCls
 from respy.python.shared.shared_auxiliary import create_draws
+from respy.python.shared.shared_parallel import start_pool
+from respy.python.shared.shared_context import get_path
+from respy.python.solve.solve_auxiliary import pyth_create_state_space
 from respy.python.solve.solve_python import pyth_solve
 
 
-def respy_interface(respy_obj, request, data_array=None):
-    """ This function provides the interface to the PYTHOn functionality.
+def respy_interface(respy_obj, request, data_array=None, x_batch=None,
+        state_space=None):
+    """ This function provides the interface to the PYTHON functionality. It
+    also serves the NUMBA version, which replaces the most costly loops with
+    JIT-compiled kernels. In the case of a parallel request, a pool of
+    workers is started once and then used throughout. The state space is
+    created unless it is passed in.
     """
     # Distribute class attributes
     model_paras, num_periods, num_agents_est, edu_start, is_debug, edu_max, \
         delta, num_draws_prob, seed_prob, num_draws_emax, seed_emax, \
         min_idx, is_myopic, is_interpolated, num_points_interp, maxfun, \
         optimizer_used, tau, paras_fixed, optimizer_options, seed_sim, \
-        num_agents_sim, derivatives = dist_class_attributes( respy_obj,
-            'model_paras', 'num_periods', 'num_agents_est', 'edu_start',
-            'is_debug', 'edu_max', 'delta', 'num_draws_prob', 'seed_prob',
-            'num_draws_emax', 'seed_emax', 'min_idx', 'is_myopic',
-            'is_interpolated', 'num_points_interp', 'maxfun', 'optimizer_used',
-            'tau', 'paras_fixed', 'optimizer_options', 'seed_sim',
-            'num_agents_sim', 'derivatives')
+        num_agents_sim, derivatives, version, is_parallel, num_procs, \
+        cache, chunk_sim, memory_budget, is_solved = \
+        dist_class_attributes(respy_obj, 'model_paras', 'num_periods',
+            'num_agents_est', 'edu_start', 'is_debug', 'edu_max', 'delta',
+            'num_draws_prob', 'seed_prob', 'num_draws_emax', 'seed_emax',
+            'min_idx', 'is_myopic', 'is_interpolated', 'num_points_interp',
+            'maxfun', 'optimizer_used', 'tau', 'paras_fixed',
+            'optimizer_options', 'seed_sim', 'num_agents_sim', 'derivatives',
+            'version', 'is_parallel', 'num_procs', 'cache', 'chunk_sim',
+            'memory_budget', 'is_solved')
 
     # Auxiliary objects
-    dfunc_eps = derivatives[1]
+    is_jit = (version == 'NUMBA')
+
+    # The values of the criterion function in the cache depend on the draws
+    # and, in the case of interpolation, on the interpolation points.
+    cache_seeds = (seed_emax, seed_prob, SEED_INTERP,
+        num_points_interp if is_interpolated else 0)
 
     coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky = \
         dist_model_paras(model_paras, is_debug)
 
-    if request == 'estimate':
-        # Check that selected optimizer is in line with version of program.
-        if maxfun > 0:
-            assert optimizer_used in OPTIMIZERS_PYTH
+    # Check that selected optimizer is in line with version of program. This
+    # is done before any workers are started.
+    if (request == 'estimate') and (maxfun > 0):
+        assert optimizer_used in OPTIMIZERS_PYTH
+
+    pool = None
+
+    if request in ['estimate', 'evaluate', 'gradient', 'batch']:
 
         periods_draws_prob = create_draws(num_periods, num_draws_prob,
             seed_prob, is_debug)
@@ -48,111 +77,261 @@ def respy_interface(respy_obj, request, data_array=None):
         periods_draws_emax = create_draws(num_periods, num_draws_emax,
             seed_emax, is_debug)
 
-        # Construct starting values
-        x_free_start = get_optim_paras(coeffs_a, coeffs_b, coeffs_edu,
-            coeffs_home, shocks_cholesky, 'free', paras_fixed, is_debug)
-
-        x_all_start = get_optim_paras(coeffs_a, coeffs_b, coeffs_edu,
-            coeffs_home, shocks_cholesky, 'all', paras_fixed, is_debug)
-
-        # Collect arguments that are required for the criterion function. These
-        # must be in the correct order already.
-        args = (is_interpolated, num_draws_emax, num_periods, num_points_interp,
-            is_myopic, edu_start, is_debug, edu_max, min_idx, delta,
-            data_array, num_agents_est, num_draws_prob, tau,
-            periods_draws_emax, periods_draws_prob)
-
-        # Special case where just an evaluation at the starting values is
-        # requested is accounted for. Note, that the relevant value of the
-        # criterion function is always the one indicated by the class
-        # attribute and not the value returned by the optimization algorithm.
-        opt_obj = OptimizationClass()
-
-        opt_obj.maxfun = maxfun
-        opt_obj.paras_fixed = paras_fixed
-        opt_obj.x_all_start = x_all_start
-
-        if maxfun == 0:
-            opt_obj.crit_func(x_free_start, *args)
-            success = True
-            message = 'Single evaluation of criterion function at starting ' \
-                      'values.'
-
-        elif optimizer_used == 'SCIPY-BFGS':
-
-            bfgs_maxiter = optimizer_options['SCIPY-BFGS']['maxiter']
-            bfgs_gtol = optimizer_options['SCIPY-BFGS']['gtol']
-
-            try:
-                rslt = fmin_bfgs(opt_obj.crit_func, x_free_start, args=args,
-                    gtol=bfgs_gtol, epsilon=dfunc_eps, maxiter=bfgs_maxiter,
-                    full_output=True, disp=False)
-
-                success = (rslt[6] not in [1, 2])
-                rslt = 'Optimization terminated successfully.'
-                if rslt[5] == 1:
+        # The state space does not depend on the model parameters. It is
+        # created only once and then shared across all evaluations of the
+        # criterion function. This aligns the PYTHON with the FORTRAN
+        # implementation.
+        if state_space is None:
+            state_space = pyth_create_state_space(num_periods, edu_start,
+                edu_max, min_idx, is_jit)
+
+        # The same holds for the mapping of the observations to the state
+        # space.
+        obs_index = get_obs_index(data_array, state_space[2], num_agents_est,
+            num_periods, edu_start)
+
+        if is_parallel:
+            pool = start_pool(num_procs, num_draws_emax, state_space,
+                obs_index, periods_draws_prob, periods_draws_emax)
+
+    # The workers hold the shared memory, so they are shut down even if the
+    # request fails.
+    try:
+        if request == 'estimate':
+            # Construct starting values
+            x_free_start = get_optim_paras(coeffs_a, coeffs_b, coeffs_edu,
+                coeffs_home, shocks_cholesky, 'free', paras_fixed, is_debug)
+
+            x_all_start = get_optim_paras(coeffs_a, coeffs_b, coeffs_edu,
+                coeffs_home, shocks_cholesky, 'all', paras_fixed, is_debug)
+
+            # Collect arguments that are required for the criterion function.
+            # These must be in the correct order already.
+            args = (is_interpolated, num_draws_emax, num_periods,
+                num_points_interp, is_myopic, edu_start, is_debug, edu_max,
+                min_idx, delta, data_array, num_agents_est, num_draws_prob,
+                tau, periods_draws_emax, periods_draws_prob, state_space,
+                is_jit, pool, obs_index, memory_budget)
+
+            # Special case where just an evaluation at the starting values is
+            # requested is accounted for. Note, that the relevant value of the
+            # criterion function is always the one indicated by the class
+            # attribute and not the value returned by the optimization
+            # algorithm.
+            opt_obj = OptimizationClass()
+
+            opt_obj.maxfun = maxfun
+            opt_obj.paras_fixed = paras_fixed
+            opt_obj.derivatives = derivatives
+            opt_obj.x_all_start = x_all_start
+
+            # The values of the criterion function are only cached on request.
+            if cache[0] > 0:
+                opt_obj.cache = CacheCls(cache[0], cache_seeds, cache[1])
+
+            if maxfun == 0:
+                opt_obj.crit_func(x_free_start, *args)
+                success = True
+                message = 'Single evaluation of criterion function at ' \
+                          'starting values.'
+
+            elif optimizer_used == 'SCIPY-BFGS':
+
+                bfgs_maxiter = optimizer_options['SCIPY-BFGS']['maxiter']
+                bfgs_gtol = optimizer_options['SCIPY-BFGS']['gtol']
+
+                try:
+                    rslt = fmin_bfgs(opt_obj.crit_func, x_free_start,
+                        opt_obj.grad_func, args=args, gtol=bfgs_gtol,
+                        maxiter=bfgs_maxiter, full_output=True, disp=False)
+
+                    success = (rslt[6] not in [1, 2])
+                    message = 'Optimization terminated successfully.'
+                    if rslt[6] == 1:
+                        message = 'Maximum number of iterations exceeded.'
+                    elif rslt[6] == 2:
+                        message = 'Gradient and/or function calls not ' \
+                                  'changing.'
+
+                except MaxfunError:
+                    success = False
                     message = 'Maximum number of iterations exceeded.'
-                elif rslt == 2:
-                    message = 'Gradient and/or function calls not changing.'
 
-            except MaxfunError:
-                success = False
-                message = 'Maximum number of iterations exceeded.'
+                except DominatedError:
+                    success = False
+                    message = 'Dominated by another start.'
 
-        elif optimizer_used == 'SCIPY-POWELL':
+            elif optimizer_used == 'SCIPY-POWELL':
 
-            powell_maxiter = optimizer_options['SCIPY-POWELL']['maxiter']
-            powell_maxfun = optimizer_options['SCIPY-POWELL']['maxfun']
-            powell_xtol = optimizer_options['SCIPY-POWELL']['xtol']
-            powell_ftol = optimizer_options['SCIPY-POWELL']['ftol']
+                powell_maxiter = optimizer_options['SCIPY-POWELL']['maxiter']
+                powell_maxfun = optimizer_options['SCIPY-POWELL']['maxfun']
+                powell_xtol = optimizer_options['SCIPY-POWELL']['xtol']
+                powell_ftol = optimizer_options['SCIPY-POWELL']['ftol']
 
-            try:
-                rslt = fmin_powell(opt_obj.crit_func, x_free_start, args,
-                    powell_xtol, powell_ftol, powell_maxiter, powell_maxfun,
-                    disp=0)
+                try:
+                    rslt = fmin_powell(opt_obj.crit_func, x_free_start, args,
+                        powell_xtol, powell_ftol, powell_maxiter,
+                        powell_maxfun, disp=0)
 
-                success = (rslt[5] not in [1, 2])
-                message = 'Optimization terminated successfully.'
-                if rslt[5] == 1:
-                    message = 'Maximum number of function evaluations.'
-                elif rslt[5] == 2:
-                    message = 'Maximum number of iterations.'
+                    success = (rslt[5] not in [1, 2])
+                    message = 'Optimization terminated successfully.'
+                    if rslt[5] == 1:
+                        message = 'Maximum number of function evaluations.'
+                    elif rslt[5] == 2:
+                        message = 'Maximum number of iterations.'
 
-            except MaxfunError:
-                success = False
-                message = 'Maximum number of iterations exceeded.'
+                except MaxfunError:
+                    success = False
+                    message = 'Maximum number of iterations exceeded.'
 
-        record_estimation_final(opt_obj, success, message)
-        record_estimation_stop()
+                except DominatedError:
+                    success = False
+                    message = 'Dominated by another start.'
 
-    elif request == 'simulate':
+            elif optimizer_used == 'PYTH-BHHH':
 
-        # Draw draws for the simulation.
-        periods_draws_sims = create_draws(num_periods, num_agents_sim, seed_sim, is_debug)
+                bhhh_maxiter = optimizer_options['PYTH-BHHH']['maxiter']
+                bhhh_gtol = optimizer_options['PYTH-BHHH']['gtol']
 
-        # Draw standard normal deviates for the solution and evaluation step.
-        periods_draws_emax = create_draws(num_periods, num_draws_emax,
-            seed_emax, is_debug)
+                try:
+                    rslt = fmin_bhhh(opt_obj.contribs_func,
+                        opt_obj.scores_func, x_free_start, args,
+                        num_agents_est, num_periods, bhhh_gtol, bhhh_maxiter)
+
+                    success = (rslt[3] not in [1, 2])
+                    message = 'Optimization terminated successfully.'
+                    if rslt[3] == 1:
+                        message = 'Maximum number of iterations exceeded.'
+                    elif rslt[3] == 2:
+                        message = 'Line search failed to improve criterion ' \
+                                  'function.'
+
+                except MaxfunError:
+                    success = False
+                    message = 'Maximum number of iterations exceeded.'
 
-        # Collect arguments to pass in different implementations of the
-        # simulation.
-        periods_payoffs_systematic, states_number_period, mapping_state_idx, \
-            periods_emax, states_all = pyth_solve(coeffs_a, coeffs_b,
-            coeffs_edu, coeffs_home, shocks_cholesky, is_interpolated,
-            num_draws_emax, num_periods, num_points_interp, is_myopic,
-            edu_start, is_debug, edu_max, min_idx, delta, periods_draws_emax)
-
-        solution = (periods_payoffs_systematic, states_number_period,
-            mapping_state_idx, periods_emax, states_all)
-
-        data_array = pyth_simulate(periods_payoffs_systematic,
-            mapping_state_idx, periods_emax, states_all, shocks_cholesky,
-            num_periods, edu_start, edu_max, delta, num_agents_sim,
-            periods_draws_sims, seed_sim)
-
-        args = (solution, data_array)
-    else:
-        raise AssertionError
+                except DominatedError:
+                    success = False
+                    message = 'Dominated by another start.'
+
+            record_estimation_final(opt_obj, success, message)
+            record_estimation_stop()
+
+        elif request == 'gradient':
+
+            x_all_start = get_optim_paras(coeffs_a, coeffs_b, coeffs_edu,
+                coeffs_home, shocks_cholesky, 'all', paras_fixed, is_debug)
+
+            # The gradient is returned for the free parameters.
+            args = pyth_gradient(x_all_start, paras_fixed, derivatives,
+                is_interpolated, num_draws_emax, num_periods,
+                num_points_interp, is_myopic, edu_start, is_debug, edu_max,
+                min_idx, delta, data_array, num_agents_est, num_draws_prob,
+                tau, periods_draws_emax, periods_draws_prob, state_space,
+                is_jit, pool, obs_index, memory_budget)
+
+        elif request == 'batch':
+
+            x_all_start = get_optim_paras(coeffs_a, coeffs_b, coeffs_edu,
+                coeffs_home, shocks_cholesky, 'all', paras_fixed, is_debug)
+
+            # The batch is evaluated in full, so the MAXFUN restriction of the
+            # estimation does not apply.
+            opt_obj = OptimizationClass()
+
+            opt_obj.paras_fixed = paras_fixed
+            opt_obj.x_all_start = x_all_start
+
+            if cache[0] > 0:
+                opt_obj.cache = CacheCls(cache[0], cache_seeds, cache[1])
+
+            # The values of the criterion function are returned for each row of
+            # free parameters.
+            args = opt_obj.crit_func_batch(x_batch, is_interpolated,
+                num_draws_emax, num_periods, num_points_interp, is_myopic,
+                edu_start, is_debug, edu_max, min_idx, delta, data_array,
+                num_agents_est, num_draws_prob, tau, periods_draws_emax,
+                periods_draws_prob, state_space, is_jit, pool, obs_index,
+                memory_budget)
+
+        elif request == 'evaluate':
+
+            # The likelihood contributions are returned for all observations.
+            args = pyth_evaluate(coeffs_a, coeffs_b, coeffs_edu, coeffs_home,
+                shocks_cholesky, is_interpolated, num_draws_emax, num_periods,
+                num_points_interp, is_myopic, edu_start, is_debug, edu_max,
+                min_idx, delta, data_array, num_agents_est, num_draws_prob,
+                tau, periods_draws_emax, periods_draws_prob, state_space,
+                is_jit, pool, obs_index, memory_budget)
+
+        elif request == 'simulate':
+
+            # Draw draws for the simulation. These are kept on disk if the
+            # sample is simulated in chunks.
+            if chunk_sim > 0:
+                periods_draws_sims = create_draws_memmap(num_periods,
+                    num_agents_sim, seed_sim, is_debug,
+                    get_path('.draws_sims.respy.dat'))
+            else:
+                periods_draws_sims = create_draws(num_periods, num_agents_sim,
+                    seed_sim, is_debug)
+
+            # A solution attached to the class instance is up to date, as it is
+            # removed otherwise. The model is then not solved again.
+            if is_solved:
+                periods_payoffs_systematic, states_number_period, \
+                    mapping_state_idx, periods_emax, states_all = \
+                    dist_class_attributes(respy_obj,
+                        'periods_payoffs_systematic', 'states_number_period',
+                        'mapping_state_idx', 'periods_emax', 'states_all')
+
+            else:
+                # Draw standard normal deviates for the solution and evaluation
+                # step.
+                periods_draws_emax = create_draws(num_periods, num_draws_emax,
+                    seed_emax, is_debug)
+
+                # The pool of workers requires the state space at its start.
+                state_space = None
+                if is_parallel:
+                    state_space = pyth_create_state_space(num_periods,
+                        edu_start, edu_max, min_idx, is_jit)
+                    pool = start_pool(num_procs, num_draws_emax, state_space)
+
+                # Collect arguments to pass in different implementations of
+                # the simulation.
+                periods_payoffs_systematic, states_number_period, \
+                    mapping_state_idx, periods_emax, states_all = pyth_solve(
+                    coeffs_a, coeffs_b, coeffs_edu, coeffs_home,
+                    shocks_cholesky, is_interpolated, num_draws_emax,
+                    num_periods, num_points_interp, is_myopic, edu_start,
+                    is_debug, edu_max, min_idx, delta, periods_draws_emax,
+                    state_space, is_jit, pool, memory_budget)
+
+            solution = (periods_payoffs_systematic, states_number_period,
+                mapping_state_idx, periods_emax, states_all)
+
+            # The chunks of the sample are only simulated once they are
+            # requested.
+            if chunk_sim > 0:
+                data_array = pyth_simulate_chunks(periods_payoffs_systematic,
+                    mapping_state_idx, periods_emax, states_all,
+                    shocks_cholesky, num_periods, edu_start, edu_max, delta,
+                    num_agents_sim, periods_draws_sims, seed_sim, chunk_sim,
+                    is_jit)
+            else:
+                data_array = pyth_simulate(periods_payoffs_systematic,
+                    mapping_state_idx, periods_emax, states_all,
+                    shocks_cholesky, num_periods, edu_start, edu_max, delta,
+                    num_agents_sim, periods_draws_sims, seed_sim, is_jit)
+
+            args = (solution, data_array)
+        else:
+            raise AssertionError
+
+    finally:
+        if pool is not None:
+            pool.terminate()
 
     return args
 
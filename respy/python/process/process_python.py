@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
 
@@ -27,11 +29,19 @@ def process(respy_obj):
     if is_debug:
         assert check_process(file_est, respy_obj)
 
-    # Process dataset from files.
-    data_frame = pd.read_csv(file_est, delim_whitespace=True,
-        header=-1, na_values='.', dtype={0: np.int, 1: np.int, 2: np.int,
-        3: np.float, 4: np.int, 5: np.int, 6: np.int, 7: np.int},
-        nrows=num_rows)
+    # Process dataset from files. The binary format is selected by the file
+    # extension, it is memory-mapped and only the requested rows are read.
+    if file_est.endswith('.npy'):
+        records = np.load(file_est, mmap_mode='r')[:num_rows]
+
+        data_frame = pd.DataFrame(OrderedDict((i, records[name]) for i, name
+            in enumerate(records.dtype.names)))
+
+    else:
+        data_frame = pd.read_csv(file_est, delim_whitespace=True,
+            header=-1, na_values='.', dtype={0: np.int, 1: np.int, 2: np.int,
+            3: np.float, 4: np.int, 5: np.int, 6: np.int, 7: np.int},
+            nrows=num_rows)
 
     # Check the dataset against the initialization files.
     check_dataset(data_frame, respy_obj, 'est')
@@ -3,6 +3,7 @@ import sys
 import os
 
 from respy.python.shared.shared_constants import EXEC_DIR
+from respy.python.shared.shared_constants import IS_NUMBA
 
 # Hard coded structure of admissible groups and flags in the
 # initialization file.
@@ -28,6 +29,7 @@ STRUCTURE['PARALLELISM'] = ['flag', 'procs']
 STRUCTURE['INTERPOLATION'] = ['flag', 'points']
 STRUCTURE['SCIPY-BFGS'] = ['gtol', 'maxiter']
 STRUCTURE['SCIPY-POWELL'] = ['maxfun', 'xtol', 'ftol', 'maxiter']
+STRUCTURE['PYTH-BHHH'] = ['gtol', 'maxiter']
 STRUCTURE['FORT-NEWUOA'] = ['maxfun', 'npt', 'rhobeg', 'rhoend']
 STRUCTURE['FORT-BFGS'] = ['maxiter', 'stpmx', 'gtol']
 
@@ -83,18 +85,19 @@ def check_line(group, flag, value):
             if flag in ['debug']:
                 assert (value in [True, False])
             if flag in ['version']:
-                assert (value in ['FORTRAN', 'PYTHON'])
+                assert (value in ['FORTRAN', 'PYTHON', 'NUMBA'])
                 if value == 'FORTRAN':
                     fname = EXEC_DIR + '/resfort_scalar'
                     assert os.path.exists(fname)
+                if value == 'NUMBA':
+                    assert IS_NUMBA
             if flag in ['procs']:
                 assert isinstance(value, int)
                 assert value > 0
 
         if group == 'PARALLELISM':
-            if flag in ['flag'] and value:
-                fname = EXEC_DIR + '/resfort_parallel_master'
-                assert os.path.exists(fname)
+            if flag in ['flag']:
+                assert (value in [True, False])
             if flag in ['procs']:
                 assert isinstance(value, int)
                 assert value > 0
@@ -106,9 +109,10 @@ def check_line(group, flag, value):
             if flag in ['file']:
                 assert isinstance(value, str)
 
-        if group == 'DERIVATIVE':
+        if group == 'DERIVATIVES':
             if flag in ['version']:
-                assert (value in ['forward-differences'])
+                assert (value in ['FORWARD-DIFFERENCES',
+                    'CENTRAL-DIFFERENCES'])
             if flag in ['eps']:
                 assert isinstance(value, float)
                 assert (value > 0)
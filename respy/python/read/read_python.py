@@ -3,6 +3,7 @@ import shlex
 import sys
 import os
 
+from respy.python.shared.shared_constants import IS_PARALLEL
 from respy.python.read.read_auxiliary import check_line
 
 
@@ -176,9 +177,10 @@ def _check_integrity_complete(dict_):
 
     try:
         if dict_['PARALLELISM']['flag']:
-            assert (dict_['PROGRAM']['version'] == 'FORTRAN')
+            if dict_['PROGRAM']['version'] == 'FORTRAN':
+                assert IS_PARALLEL
     except AssertionError:
-        msg = '\n Parallelism only available with FORTRAN implementation.\n'
+        msg = '\n Parallel FORTRAN executables not available.\n'
         sys.exit(msg)
 
     try:
@@ -4,10 +4,11 @@ import time
 from respy.python.shared.shared_auxiliary import dist_optim_paras
 from respy.python.record.record_warning import record_warning
 from respy.python.shared.shared_constants import LARGE_FLOAT
+from respy.python.shared.shared_context import get_path
 
 
 def record_estimation_stop():
-    with open('est.respy.info', 'a') as out_file:
+    with open(get_path('est.respy.info'), 'a') as out_file:
         out_file.write('\n TERMINATED\n')
 
 
@@ -17,7 +18,7 @@ def record_estimation_eval(opt_obj, fval):
     """
 
     # Now we turn to est.respy.info
-    with open('est.respy.log', 'a') as out_file:
+    with open(get_path('est.respy.log'), 'a') as out_file:
         fmt_ = ' {0:>4}{1:>13}' + ' ' * 10 + '{2:>4}{3:>10}\n\n'
         line = ['EVAL', opt_obj.num_eval, 'STEP', opt_obj.num_step]
         out_file.write(fmt_.format(*line))
@@ -67,7 +68,7 @@ def record_estimation_final(opt_obj, success, message):
     """ We summarize the results of the estimation.
     """
     fval = opt_obj.crit_vals[1]
-    with open('est.respy.log', 'a') as out_file:
+    with open(get_path('est.respy.log'), 'a') as out_file:
         out_file.write(' ESTIMATION REPORT\n\n')
         out_file.write('   Success ' + str(success) + '\n')
         out_file.write('   Message ' + message + '\n\n')
@@ -87,7 +88,7 @@ def write_est_info(num_start, value_start, paras_start, num_step,
                    value_step, paras_step, num_eval, value_current, paras_current):
 
     # Write information to file.
-    with open('est.respy.info', 'w') as out_file:
+    with open(get_path('est.respy.info'), 'w') as out_file:
         # Write out information about criterion function
         out_file.write('\n Criterion Function\n\n')
         fmt_ = '{0:>15}    {1:>15}    {2:>15}    {3:>15}\n\n'
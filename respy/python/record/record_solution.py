@@ -1,12 +1,20 @@
 import os
 
+from respy.python.shared.shared_context import is_silent
+from respy.python.shared.shared_context import get_path
 
-def record_solution_progress(indicator, period=None, num_states=None):
 
-    if indicator == 1:
-        if os.path.exists('sol.respy.log'):
-            os.unlink('sol.respy.log')
+def record_solution_progress(indicator, period=None, num_states=None,
+        path=None):
+
+    if is_silent():
+        return
 
+    if indicator in [1, 5, 6]:
+        if os.path.exists(get_path('sol.respy.log')):
+            os.unlink(get_path('sol.respy.log'))
+
+    if indicator == 1:
         line = 'Starting state space creation'
     elif indicator == 2:
         line = 'Starting calculation of systematic payoffs'
@@ -19,18 +27,24 @@ def record_solution_progress(indicator, period=None, num_states=None):
         line = '... finished\n'
     elif indicator == -2:
         line = '... not required due to myopic agents'
+    elif indicator == 5:
+        line = 'Solution loaded from ' + path
+    elif indicator == 6:
+        line = 'Solution attached to class instance is up to date'
     else:
         raise AssertionError
 
-    with open('sol.respy.log', 'a') as outfile:
+    with open(get_path('sol.respy.log'), 'a') as outfile:
         outfile.write('  ' + line + '\n\n')
 
 
 def record_prediction_model(results):
     """ Write out some basic information to the solutions log file.
     """
+    if is_silent():
+        return
 
-    with open('sol.respy.log', 'a') as outfile:
+    with open(get_path('sol.respy.log'), 'a') as outfile:
         outfile.write('    Information about Prediction Model')
 
         string = '      {:<19}' + '{:15.4f}' * 9
@@ -1,3 +1,6 @@
+from respy.python.shared.shared_context import get_path
+
+
 def record_warning(count):
     """ Sometimes the value of the criterion function is too extreme for
     pretty printing in the output files. This warning indicates that this is
@@ -5,7 +8,7 @@ def record_warning(count):
     numbering of warning messages is aligned with FORTRAN and thus starts at
     one and not zero.
     """
-    with open('est.respy.log', 'a') as out_file:
+    with open(get_path('est.respy.log'), 'a') as out_file:
 
         if count == 1:
             msg = 'Starting value of criterion function too large to write ' \
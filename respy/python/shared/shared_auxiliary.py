@@ -1,4 +1,5 @@
 import numpy as np
+import hashlib
 import shlex
 import os
 
@@ -6,7 +7,9 @@ from respy.python.shared.shared_constants import INADMISSIBILITY_PENALTY
 from respy.python.shared.shared_constants import MISSING_FLOAT
 from respy.python.record.record_warning import record_warning
 from respy.python.shared.shared_constants import HUGE_FLOAT
+from respy.python.shared.shared_constants import MISSING_INT
 from respy.python.shared.shared_constants import TINY_FLOAT
+from respy.python.shared.shared_context import get_path
 
 
 def get_log_likl(contribs):
@@ -99,23 +102,22 @@ def get_cholesky(x, info=None):
 
 def get_total_value(period, num_periods, delta, payoffs_systematic, draws,
         edu_max, edu_start, mapping_state_idx, periods_emax, k, states_all):
-    """ Get total value of all possible states.
+    """ Get total value of all possible states. The systematic payoffs and
+    the draws are broadcast against each other. If k is an array of states,
+    the leading dimensions of the systematic payoffs need to match its shape
+    and the total values for all states and draws are available at once. The
+    unused arguments are present to align the interface between the PYTHON
+    and FORTRAN implementations.
     """
-    # Initialize containers
-    payoffs_ex_post = np.tile(np.nan, 4)
-
     # Calculate ex post payoffs
-    for j in [0, 1]:
-        payoffs_ex_post[j] = payoffs_systematic[j] * draws[j]
-
-    for j in [2, 3]:
-        payoffs_ex_post[j] = payoffs_systematic[j] + draws[j]
+    payoffs_ex_post = np.concatenate((
+        payoffs_systematic[..., :2] * draws[..., :2],
+        payoffs_systematic[..., 2:] + draws[..., 2:]), axis=-1)
 
     # Get future values
     if period != (num_periods - 1):
-        payoffs_future, is_inadmissible = _get_future_payoffs(edu_max,
-            edu_start, mapping_state_idx, period, periods_emax, k,
-            states_all)
+        payoffs_future, is_inadmissible = get_future_payoffs(
+            mapping_state_idx, period, periods_emax, k)
     else:
         is_inadmissible = False
         payoffs_future = np.tile(0.0, 4)
@@ -127,44 +129,32 @@ def get_total_value(period, num_periods, delta, payoffs_systematic, draws,
     # inadmissible states. If the state is inadmissible payoffs_future takes
     # value zero. This aligns the treatment of inadmissible values with the
     # original paper.
-    if is_inadmissible:
-        total_payoffs[2] += INADMISSIBILITY_PENALTY
+    total_payoffs[..., 2] += np.where(is_inadmissible,
+        INADMISSIBILITY_PENALTY, 0.00)
 
     # Finishing
     return total_payoffs
 
 
-def _get_future_payoffs(edu_max, edu_start, mapping_state_idx, period,
-        periods_emax, k, states_all):
-    """ Get future payoffs for additional choices.
+def get_future_payoffs(mapping_state_idx, period, periods_emax, k):
+    """ Get future payoffs for additional choices. The indices of the
+    successor states are gathered from the table that is precomputed for the
+    state space. The index k can also be an array of states, in which case
+    the future payoffs are returned for all of them at once.
     """
-    # Distribute state space
-    exp_a, exp_b, edu, _ = states_all[period, k, :]
-
-    # Future utilities
-    payoffs_future = np.tile(np.nan, 4)
-
-    # Working in Occupation A
-    future_idx = mapping_state_idx[period + 1, exp_a + 1, exp_b, edu, 0]
-    payoffs_future[0] = periods_emax[period + 1, future_idx]
-
-    # Working in Occupation B
-    future_idx = mapping_state_idx[period + 1, exp_a, exp_b + 1, edu, 0]
-    payoffs_future[1] = periods_emax[period + 1, future_idx]
-
-    # Increasing schooling. Note that adding an additional year
-    # of schooling is only possible for those that have strictly
-    # less than the maximum level of additional education allowed.
-    is_inadmissible = (edu >= edu_max - edu_start)
-    if is_inadmissible:
-        payoffs_future[2] = 0.00
-    else:
-        future_idx = mapping_state_idx[period + 1, exp_a, exp_b, edu + 1, 1]
-        payoffs_future[2] = periods_emax[period + 1, future_idx]
+    # Distribute successor states
+    successors = mapping_state_idx.periods_successors[period, k, :]
+    is_inadmissible = mapping_state_idx.periods_inadmissible[period, k]
+
+    # Increasing schooling is only possible for those that have strictly
+    # less than the maximum level of additional education allowed. There
+    # is no successor state otherwise and the missing index is replaced to
+    # allow gathering the future payoffs for all choices at once.
+    successors = np.where(successors == MISSING_INT, 0, successors)
 
-    # Staying at home
-    future_idx = mapping_state_idx[period + 1, exp_a, exp_b, edu, 0]
-    payoffs_future[3] = periods_emax[period + 1, future_idx]
+    payoffs_future = periods_emax[period + 1, successors]
+    payoffs_future[..., 2] = np.where(is_inadmissible, 0.00,
+        payoffs_future[..., 2])
 
     # Finishing
     return payoffs_future, is_inadmissible
@@ -176,21 +166,47 @@ def create_draws(num_periods, num_draws, seed, is_debug):
     are drawn from a standard normal distribution and transformed later in
     the code.
     """
-    # Control randomness by setting seed value
-    np.random.seed(seed)
+    # Control randomness by setting seed value. The random state is local to
+    # the call, so concurrent runs in threads do not interfere.
+    random_state = np.random.RandomState(seed)
 
     # Draw random deviates from a standard normal distribution or read it in
     # from disk. The latter is available to allow for testing across
     # implementations.
-    if is_debug and os.path.exists('draws.txt'):
+    if is_debug and os.path.exists(get_path('draws.txt')):
         draws = read_draws(num_periods, num_draws)
     else:
-        draws = np.random.multivariate_normal(np.zeros(4),
+        draws = random_state.multivariate_normal(np.zeros(4),
                         np.identity(4), (num_periods, num_draws))
     # Finishing
     return draws
 
 
+def create_draws_memmap(num_periods, num_draws, seed, is_debug, fname):
+    """ Create the relevant set of draws in a memory map on disk. The draws
+    are identical to the ones from create_draws, but only the draws for a
+    single period are held in memory at any time.
+    """
+    # Control randomness by setting seed value
+    random_state = np.random.RandomState(seed)
+
+    # The draws from disk are only available for testing purposes.
+    if is_debug and os.path.exists(get_path('draws.txt')):
+        return read_draws(num_periods, num_draws)
+
+    draws = np.memmap(fname, dtype=np.float64, mode='w+',
+        shape=(num_periods, num_draws, 4))
+
+    for period in range(num_periods):
+        draws[period, :, :] = random_state.multivariate_normal(np.zeros(4),
+            np.identity(4), num_draws)
+
+    draws.flush()
+
+    # Finishing
+    return draws
+
+
 def cholesky_to_coeffs(shocks_cholesky):
     """ This function maps the Cholesky factor into the coefficients as
     specified in the initialization file.
@@ -209,6 +225,8 @@ def add_solution(respy_obj, periods_payoffs_systematic,
         states_number_period, mapping_state_idx, periods_emax, states_all):
     """ Add solution to class instance.
     """
+    solution_hash = get_solution_hash(respy_obj)
+
     respy_obj.unlock()
 
     respy_obj.set_attr('periods_payoffs_systematic', periods_payoffs_systematic)
@@ -221,6 +239,8 @@ def add_solution(respy_obj, periods_payoffs_systematic,
 
     respy_obj.set_attr('states_all', states_all)
 
+    respy_obj.set_attr('solution_hash', solution_hash)
+
     respy_obj.set_attr('is_solved', True)
 
     respy_obj.lock()
@@ -229,8 +249,37 @@ def add_solution(respy_obj, periods_payoffs_systematic,
     return respy_obj
 
 
+def get_solution_hash(respy_obj):
+    """ Get the hash of all attributes that determine the solution of the
+    model. The solution attached to a class instance is up to date as long
+    as this hash remains unchanged.
+    """
+    # Distribute class attributes
+    model_paras, num_periods, edu_start, edu_max, delta, is_interpolated, \
+        num_points_interp, num_draws_emax, seed_emax, is_debug, version = \
+        dist_class_attributes(respy_obj, 'model_paras', 'num_periods',
+            'edu_start', 'edu_max', 'delta', 'is_interpolated',
+            'num_points_interp', 'num_draws_emax', 'seed_emax', 'is_debug',
+            'version')
+
+    hash_ = hashlib.sha1()
+
+    for label in ['coeffs_a', 'coeffs_b', 'coeffs_edu', 'coeffs_home',
+            'shocks_cholesky']:
+        hash_.update(np.array(model_paras[label], dtype=np.float64).tobytes())
+
+    args = (num_periods, edu_start, edu_max, delta, is_interpolated,
+        num_points_interp, num_draws_emax, seed_emax, is_debug, version)
+
+    hash_.update(repr(args).encode())
+
+    # Finishing
+    return hash_.hexdigest()
+
+
 def check_dataset(data_frame, respy_obj, which):
     """ This routine runs some consistency checks on the simulated data frame.
+    A chunk of the simulated data frame covers a contiguous range of agents.
     """
     # Distribute class attributes
     num_periods = respy_obj.get_attr('num_periods')
@@ -241,6 +290,8 @@ def check_dataset(data_frame, respy_obj, which):
         num_agents = respy_obj.get_attr('num_agents_est')
     elif which == 'sim':
         num_agents = respy_obj.get_attr('num_agents_sim')
+    elif which == 'chunk':
+        num_agents = data_frame.shape[0] // num_periods
     else:
         raise AssertionError
     # Check dimension of data frame
@@ -266,6 +317,10 @@ def check_dataset(data_frame, respy_obj, which):
         if (i == 0) and (which == 'sim'):
             assert (data_frame.max(axis=0)[i] == (max_ - 1))
 
+        if (i == 0) and (which == 'chunk'):
+            assert (data_frame.max(axis=0)[i] - data_frame.min(axis=0)[i] ==
+                (max_ - 1))
+
         # Choice observation
         if i == 2:
             assert (data_frame.max(axis=0)[i] <= max_)
@@ -398,7 +453,7 @@ def read_draws(num_periods, num_draws):
     periods_draws = np.tile(np.nan, (num_periods, num_draws, 4))
 
     # Read and distribute draws
-    draws = np.array(np.genfromtxt('draws.txt'), ndmin=2)
+    draws = np.array(np.genfromtxt(get_path('draws.txt')), ndmin=2)
     for period in range(num_periods):
         lower = 0 + num_draws * period
         upper = lower + num_draws
@@ -446,8 +501,8 @@ def print_init_dict(dict_, file_name='test.respy.ini'):
     labels += ['EDUCATION', 'HOME', 'SHOCKS', 'SOLUTION']
     labels += ['SIMULATION', 'ESTIMATION', 'DERIVATIVES', 'SCALING']
     labels += ['PROGRAM', 'PARALLELISM']
-    labels += ['INTERPOLATION', 'SCIPY-BFGS', 'SCIPY-POWELL', 'FORT-NEWUOA']
-    labels += ['FORT-BFGS']
+    labels += ['INTERPOLATION', 'SCIPY-BFGS', 'SCIPY-POWELL', 'PYTH-BHHH']
+    labels += ['FORT-NEWUOA', 'FORT-BFGS']
 
     # Create initialization.
     with open(file_name, 'w') as file_:
@@ -545,7 +600,8 @@ def print_init_dict(dict_, file_name='test.respy.ini'):
 
                 file_.write('\n')
 
-            if flag in ['SCIPY-POWELL', 'SCIPY-BFGS', 'FORT-NEWUOA', 'FORT-BFGS']:
+            if flag in ['SCIPY-POWELL', 'SCIPY-BFGS', 'PYTH-BHHH', 'FORT-NEWUOA',
+                        'FORT-BFGS']:
 
                 # This function can also be used to print out initialization
                 # files without any optimization options. This is enough for
@@ -591,7 +647,7 @@ def process_est_log():
 
     is_report = False
     is_final = False
-    with open('est.respy.log') as in_file:
+    with open(get_path('est.respy.log')) as in_file:
         for _, line in enumerate(in_file.readlines()):
             list_ = shlex.split(line)
 
@@ -637,7 +693,7 @@ def get_est_info():
     rslt = dict()
 
     paras_start, paras_step, paras_current = [], [], []
-    with open('est.respy.info') as in_file:
+    with open(get_path('est.respy.info')) as in_file:
         for i, line in enumerate(in_file.readlines()):
 
             list_ = shlex.split(line)
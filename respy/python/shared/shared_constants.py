@@ -23,17 +23,42 @@ TINY_FLOAT = 1.0e-8
 # Interpolation
 INADMISSIBILITY_PENALTY = -40000.00
 
+# Memory budget in megabytes for the temporary arrays of total values during
+# the backward induction. The states of a period are processed in blocks that
+# fit into this budget.
+EMAX_MEMORY_BUDGET = 256.00
+
+# Seed for the selection of the interpolation points. The random state is
+# reset at the beginning of each backward induction, just as in the FORTRAN
+# implementation.
+SEED_INTERP = 123
+
 # Missing values. These allow to aline the treatment of missing values across
 # implementations. There is no NAN available in FORTRAN.
 MISSING_INT = -99
 MISSING_FLOAT = -99.00
 
+# Columns of the datasets in the binary format, which is used for files with
+# the extension '.npy'. Missing wages are NAN.
+DATA_DTYPE = [('agent', 'int64'), ('period', 'int64'), ('choice', 'int64'),
+    ('wage', 'float64'), ('exp_a', 'int64'), ('exp_b', 'int64'),
+    ('edu', 'int64'), ('edu_lagged', 'int64')]
+
 # Flag that indicate whether the FORTRAN executables are available.
 IS_PARALLEL = os.path.exists(EXEC_DIR + '/resfort_parallel_master')
 IS_FORTRAN = os.path.exists(EXEC_DIR + '/resfort_scalar')
 if not IS_FORTRAN:
     assert (not IS_PARALLEL)
 
+# Flag that indicates whether the JIT compiler for the NUMBA version is
+# available.
+try:
+    import numba
+except ImportError:
+    IS_NUMBA = False
+else:
+    IS_NUMBA = True
+
 # Each implementation has its own set of optimizers available.
-OPTIMIZERS_PYTH = ['SCIPY-BFGS', 'SCIPY-POWELL']
+OPTIMIZERS_PYTH = ['SCIPY-BFGS', 'SCIPY-POWELL', 'PYTH-BHHH']
 OPTIMIZERS_FORT = ['FORT-NEWUOA', 'FORT-BFGS']
\ No newline at end of file
@@ -0,0 +1,68 @@
+""" This module manages the output directory of a run. The logs, the scratch
+files of the FORTRAN implementation, and the files for testing across
+implementations are all located in this directory. It is tracked for each
+thread separately, so concurrent runs in threads or processes do not collide
+as long as each uses its own directory.
+"""
+from contextlib import contextmanager
+
+import threading
+import os
+
+# The output directory of the current run for each thread. The current
+# working directory is used unless a run context is entered.
+_CONTEXT = threading.local()
+
+
+@contextmanager
+def run_context(outdir):
+    """ Direct all output of the enclosed runs to the directory, which is
+    created if necessary. The previous directory is restored afterwards.
+    """
+    outdir = os.path.abspath(outdir)
+
+    try:
+        os.makedirs(outdir)
+    except OSError:
+        assert os.path.isdir(outdir)
+
+    outdir_previous = get_outdir()
+    _CONTEXT.outdir = outdir
+
+    try:
+        yield outdir
+    finally:
+        _CONTEXT.outdir = outdir_previous
+
+
+@contextmanager
+def silent_context():
+    """ Suppress the logs of the solution for the enclosed runs. This is
+    required for the workers that solve the model on their own, as they would
+    otherwise all write to the log of the master.
+    """
+    is_silent_previous = is_silent()
+    _CONTEXT.is_silent = True
+
+    try:
+        yield
+    finally:
+        _CONTEXT.is_silent = is_silent_previous
+
+
+def is_silent():
+    """ Check whether the logs of the solution are suppressed.
+    """
+    return getattr(_CONTEXT, 'is_silent', False)
+
+
+def get_outdir():
+    """ Get the output directory of the current run.
+    """
+    return getattr(_CONTEXT, 'outdir', os.curdir)
+
+
+def get_path(fname):
+    """ Get the path of a file in the output directory of the current run.
+    """
+    return os.path.join(get_outdir(), fname)
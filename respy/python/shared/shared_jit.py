@@ -0,0 +1,75 @@
+""" This module contains the infrastructure for the JIT-compiled kernels of the
+NUMBA version. The kernels are compiled on their first use and the results are
+cached on disk between runs.
+"""
+import numpy as np
+
+from respy.python.shared.shared_constants import INADMISSIBILITY_PENALTY
+from respy.python.shared.shared_constants import HUGE_FLOAT
+from respy.python.shared.shared_constants import MISSING_INT
+from respy.python.shared.shared_constants import IS_NUMBA
+
+if IS_NUMBA:
+    import numba
+
+
+def jit(func):
+    """ Compile the function in nopython mode. The arithmetic follows the
+    conventions of NUMPY, e.g. a division by zero returns infinity. The
+    function is returned unchanged if no JIT compiler is available. However,
+    the NUMBA version cannot be requested in that case.
+    """
+    if IS_NUMBA:
+        return numba.njit(cache=True, error_model='numpy')(func)
+    else:
+        return func
+
+
+@jit
+def jit_get_total_value(period, num_periods, delta, payoffs_systematic, draws,
+        periods_successors, periods_inadmissible, periods_emax, k,
+        total_payoffs):
+    """ Get total value of all possible states. This is the counterpart to
+    get_total_value for a single state and draw. The results are written to
+    total_payoffs to avoid repeated allocations.
+    """
+    # Calculate ex post payoffs
+    for j in range(2):
+        total_payoffs[j] = payoffs_systematic[j] * draws[j]
+
+    for j in range(2, 4):
+        total_payoffs[j] = payoffs_systematic[j] + draws[j]
+
+    # Get future values
+    if period != (num_periods - 1):
+
+        for j in range(4):
+            future_idx = periods_successors[period, k, j]
+            if future_idx != MISSING_INT:
+                total_payoffs[j] += delta * periods_emax[period + 1, future_idx]
+
+        # This is required to ensure that the agent does not choose any
+        # inadmissible states.
+        if periods_inadmissible[period, k]:
+            total_payoffs[2] += INADMISSIBILITY_PENALTY
+
+    # Finishing
+    return total_payoffs
+
+
+@jit
+def jit_transform_disturbances(draws, shocks_cholesky, draws_transformed):
+    """ Transform a single draw of standard normal deviates to the relevant
+    distribution. This is the counterpart to transform_disturbances.
+    """
+    for i in range(4):
+        draws_transformed[i] = 0.0
+        for j in range(4):
+            draws_transformed[i] += shocks_cholesky[i, j] * draws[j]
+
+    for j in range(2):
+        draws_transformed[j] = min(max(np.exp(draws_transformed[j]), 0.0),
+            HUGE_FLOAT)
+
+    # Finishing
+    return draws_transformed
@@ -0,0 +1,161 @@
+""" This module contains the compact mapping of the state space values to
+the indices of the admissible states in each period.
+"""
+import numpy as np
+
+from respy.python.shared.shared_constants import MISSING_INT
+
+
+class MappingStateIdxCls(object):
+    """ This class replaces the dense array for the mapping of state space
+    values to indices, which has dimension (num_periods, num_periods,
+    num_periods, min_idx, 2) but is almost entirely missing. Only the
+    admissible states are stored, each as the position in the raveled dense
+    array. As the states are ordered lexicographically within each period,
+    these keys are sorted and the lookup is a binary search. The lookup
+    mapping_state_idx[period, exp_a, exp_b, edu, edu_lagged] works for both
+    scalar and array arguments and returns MISSING_INT for inadmissible
+    states.
+    """
+
+    def __init__(self, states_all, states_number_period, min_idx):
+
+        # Construct auxiliary objects
+        num_periods = len(states_number_period)
+        states_number_period = np.array(states_number_period)
+
+        self.shape = (num_periods, num_periods, num_periods, min_idx, 2)
+
+        self.strides = np.cumprod((1,) + self.shape[:0:-1])[::-1].tolist()
+
+        # Position of the first state of each period in the keys.
+        self.offsets = np.hstack((0, np.cumsum(states_number_period)[:-1]))
+
+        # Collect the keys of all admissible states across periods.
+        periods = np.repeat(np.arange(num_periods), states_number_period)
+        states = np.concatenate([states_all[period, :num_states, :] for
+            period, num_states in enumerate(states_number_period)])
+
+        self.keys = self._get_keys(periods, *states.T)
+
+        # Antibugging
+        assert np.all(np.diff(self.keys) > 0)
+
+        # The successor states only depend on the current state and the
+        # choice. They are determined once for the whole state space.
+        self.periods_successors, self.periods_inadmissible = \
+            self._get_successors(states_all, states_number_period)
+
+    def __getitem__(self, index):
+        """ Get the index of the state within its period.
+        """
+        period, exp_a, exp_b, edu, edu_lagged = index
+
+        # Coordinates out of bounds would otherwise map to the key of another
+        # admissible state. The dense array raised an error instead.
+        self._check_bounds(index)
+
+        key = self._get_keys(period, exp_a, exp_b, edu, edu_lagged)
+        pos = self.keys.searchsorted(key)
+
+        # Special treatment of scalar requests, which are by far the most
+        # common ones.
+        if not isinstance(key, np.ndarray):
+            if (pos < self.keys.size) and (self.keys[pos] == key):
+                return pos - self.offsets[period]
+            else:
+                return MISSING_INT
+
+        pos = np.minimum(pos, self.keys.size - 1)
+        is_admissible = (self.keys[pos] == key)
+
+        idx = np.where(is_admissible, pos - self.offsets[period], MISSING_INT)
+
+        # Finishing
+        return idx
+
+    def __array__(self, dtype=None):
+        """ Construct the dense array. This is only required to pass the
+        mapping to the FORTRAN routines and for testing purposes.
+        """
+        mapping_state_idx = np.tile(MISSING_INT, self.shape)
+
+        idx = np.unravel_index(self.keys, self.shape)
+        periods = idx[0]
+
+        mapping_state_idx[idx] = \
+            np.arange(self.keys.size) - self.offsets[periods]
+
+        if dtype is not None:
+            mapping_state_idx = mapping_state_idx.astype(dtype)
+
+        # Finishing
+        return mapping_state_idx
+
+    def _get_successors(self, states_all, states_number_period):
+        """ Construct the indices of the successor states for each choice.
+        The indices are missing in the final period and for the choice of
+        additional schooling if the maximum level of education is already
+        attained. In the latter case the choice is inadmissible.
+        """
+        # Auxiliary objects
+        num_periods, max_states_period = states_all.shape[:2]
+
+        # Initialize containers
+        periods_successors = np.tile(MISSING_INT, (num_periods,
+            max_states_period, 4))
+        periods_inadmissible = np.tile(False, (num_periods,
+            max_states_period))
+
+        for period in range(num_periods - 1):
+
+            # Distribute state space
+            num_states = states_number_period[period]
+            exp_a, exp_b, edu, _ = states_all[period, :num_states, :].T
+
+            # Additional education is only available for those that have
+            # strictly less than the maximum level of additional education
+            # allowed. This cannot be checked by the lookup directly, as the
+            # next level of education might be out of bounds.
+            edu_next = np.minimum(edu + 1, self.shape[3] - 1)
+
+            successors = np.column_stack((
+                self[period + 1, exp_a + 1, exp_b, edu, 0],
+                self[period + 1, exp_a, exp_b + 1, edu, 0],
+                self[period + 1, exp_a, exp_b, edu_next, 1],
+                self[period + 1, exp_a, exp_b, edu, 0]))
+
+            is_inadmissible = (edu + 1 >= self.shape[3])
+            is_inadmissible |= (successors[:, 2] == MISSING_INT)
+
+            successors[is_inadmissible, 2] = MISSING_INT
+
+            periods_successors[period, :num_states, :] = successors
+            periods_inadmissible[period, :num_states] = is_inadmissible
+
+        # Finishing
+        return periods_successors, periods_inadmissible
+
+    def _check_bounds(self, index):
+        """ Check that all coordinates are within the dimensions of the dense
+        array.
+        """
+        for coord, size in zip(index, self.shape):
+            if isinstance(coord, np.ndarray):
+                is_outside = np.any((coord < 0) | (coord >= size))
+            else:
+                is_outside = not (0 <= coord < size)
+
+            if is_outside:
+                raise IndexError('index out of bounds')
+
+    def _get_keys(self, period, exp_a, exp_b, edu, edu_lagged):
+        """ Get the position of states in the raveled dense array.
+        """
+        s0, s1, s2, s3, s4 = self.strides
+
+        keys = period * s0 + exp_a * s1 + exp_b * s2 + edu * s3 + \
+            edu_lagged * s4
+
+        # Finishing
+        return keys
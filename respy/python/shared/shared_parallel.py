@@ -0,0 +1,125 @@
+""" This module contains the infrastructure for the parallel PYTHON and NUMBA
+versions. The worker processes take the role of the slaves in the parallel
+FORTRAN implementation. They are started once and then persist across all
+evaluations of the criterion function. All arrays that change between the
+tasks are exchanged with the master through shared memory.
+"""
+from multiprocessing.sharedctypes import RawArray
+import multiprocessing as mp
+import numpy as np
+
+# The objects available to the workers. These are set once during their
+# initialization and remain the same throughout.
+WORKER = dict()
+
+
+class PoolCls(object):
+    """ This class manages a persistent pool of worker processes. The shared
+    arrays are allocated before the workers are started, so both the master
+    and the workers have access to the same memory. The static objects are
+    copied to each worker only once.
+    """
+
+    def __init__(self, num_slaves, shapes, static):
+
+        # Allocate shared memory
+        buffers = dict()
+        for key_, shape in shapes.items():
+            buffers[key_] = (RawArray('d', int(np.prod(shape))), shape)
+
+        self.shared = dict()
+        for key_, (buffer_, shape) in buffers.items():
+            self.shared[key_] = _get_shared_array(buffer_, shape)
+
+        self.num_slaves = num_slaves
+
+        # Start workers
+        self._pool = mp.Pool(num_slaves, _initialize_worker, (buffers, static))
+
+    def map(self, func, tasks):
+        """ Apply the function to all tasks, each is processed by a single
+        worker.
+        """
+        return self._pool.map(func, tasks, chunksize=1)
+
+    def terminate(self):
+        """ Shut down all workers.
+        """
+        self._pool.close()
+        self._pool.join()
+
+
+def start_pool(num_procs, num_draws_emax, state_space, obs_index=None,
+        periods_draws_prob=None, periods_draws_emax=None):
+    """ Start the pool of workers for the solution of the model. As in the
+    FORTRAN implementation, one of the processors is reserved for the master
+    which distributes the work to the slaves. If an observation index is
+    provided, the workers are also prepared for the evaluation of the
+    likelihood contributions and the criterion function.
+    """
+    # Distribute state space
+    states_all, _, mapping_state_idx, max_states_period = state_space
+
+    num_periods = states_all.shape[0]
+
+    # Shared arrays
+    shapes = dict()
+    shapes['periods_emax'] = (num_periods, max_states_period)
+    shapes['payoffs_systematic'] = (max_states_period, 4)
+    shapes['draws_emax'] = (num_draws_emax, 4)
+    shapes['emax_simulated'] = (max_states_period, )
+
+    # Static objects
+    static = dict()
+    static['mapping_state_idx'] = mapping_state_idx
+    static['states_all'] = states_all
+    static['state_space'] = state_space
+
+    if obs_index is not None:
+        shapes['periods_payoffs_systematic'] = (num_periods,
+            max_states_period, 4)
+        shapes['contribs'] = (obs_index['periods'].size, )
+
+        static['periods_draws_emax'] = periods_draws_emax
+        static['periods_draws_prob'] = periods_draws_prob
+        static['obs_index'] = obs_index
+
+    pool = PoolCls(num_procs - 1, shapes, static)
+
+    # Finishing
+    return pool
+
+
+def distribute_workload(num_jobs, num_slaves):
+    """ Determine the contiguous share of jobs for each slave. This aligns
+    with the round robin assignment in the FORTRAN implementation, so the
+    first slaves take one additional job each if the jobs cannot be split
+    evenly.
+    """
+    # Determine number of jobs for each slave
+    jobs_slaves = np.tile(num_jobs // num_slaves, num_slaves)
+    jobs_slaves[:num_jobs % num_slaves] += 1
+
+    bounds = np.hstack((0, np.cumsum(jobs_slaves)))
+
+    slices = []
+    for i in range(num_slaves):
+        slices += [slice(bounds[i], bounds[i + 1])]
+
+    # Finishing
+    return slices
+
+
+def _initialize_worker(buffers, static):
+    """ Attach the worker to the shared memory and collect the static objects.
+    """
+    for key_, (buffer_, shape) in buffers.items():
+        WORKER[key_] = _get_shared_array(buffer_, shape)
+
+    WORKER.update(static)
+
+
+def _get_shared_array(buffer_, shape):
+    """ Create an array that is backed by the shared memory.
+    """
+    return np.frombuffer(buffer_, dtype='float64').reshape(shape)
@@ -0,0 +1,129 @@
+""" This module contains the store of model solutions. Each solution has its
+own directory, which is named by the hash of the attributes that determine
+it. The arrays are stored in the binary format of NUMPY, so they are
+memory-mapped when loaded and only read from disk on access. A small header
+describes the content of each directory.
+"""
+import tempfile
+import shutil
+import json
+import stat
+import os
+
+import numpy as np
+
+from respy.python.shared.shared_auxiliary import dist_class_attributes
+from respy.python.shared.shared_auxiliary import get_solution_hash
+from respy.python.shared.shared_mapping import MappingStateIdxCls
+from respy.python.shared.shared_auxiliary import add_solution
+
+# The arrays of the solution that are stored. The mapping of the state space
+# to the array indices is not stored as it is fully determined by the
+# admissible states.
+STORE_ARRAYS = ['periods_payoffs_systematic', 'states_number_period',
+    'periods_emax', 'states_all']
+
+
+def store_solution(respy_obj, dirname):
+    """ Add the solution attached to the class instance to the store, unless
+    it is already available.
+    """
+    # Antibugging
+    assert respy_obj.get_attr('is_solved')
+
+    # Distribute class attributes
+    solution_hash, num_periods, edu_start, edu_max, min_idx, seed_emax, \
+        num_draws_emax, version = dist_class_attributes(respy_obj,
+            'solution_hash', 'num_periods', 'edu_start', 'edu_max', 'min_idx',
+            'seed_emax', 'num_draws_emax', 'version')
+
+    path = os.path.join(dirname, solution_hash)
+
+    if os.path.exists(path):
+        return path
+
+    try:
+        os.makedirs(dirname)
+    except OSError:
+        assert os.path.isdir(dirname)
+
+    # The solution is written to a temporary directory first, which is only
+    # renamed once it is complete. This ensures that there are no incomplete
+    # solutions in the store, also if it is shared across concurrent runs.
+    # The temporary directory is only accessible to its owner, so it is
+    # given the permissions of the store. Otherwise, the solution would be
+    # unreadable to other users of a shared store.
+    path_tmp = tempfile.mkdtemp(dir=dirname)
+    os.chmod(path_tmp, stat.S_IMODE(os.stat(dirname).st_mode))
+
+    header = dict()
+    header['solution_hash'] = solution_hash
+    header['num_periods'] = num_periods
+    header['edu_start'] = edu_start
+    header['edu_max'] = edu_max
+    header['min_idx'] = min_idx
+    header['seed_emax'] = seed_emax
+    header['num_draws_emax'] = num_draws_emax
+    header['version'] = version
+    header['arrays'] = dict()
+
+    for label in STORE_ARRAYS:
+        array = np.ascontiguousarray(respy_obj.get_attr(label))
+        np.save(os.path.join(path_tmp, label + '.npy'), array)
+
+        header['arrays'][label] = dict()
+        header['arrays'][label]['dtype'] = array.dtype.str
+        header['arrays'][label]['shape'] = list(array.shape)
+
+    with open(os.path.join(path_tmp, 'header.json'), 'w') as out_file:
+        json.dump(header, out_file, indent=4, sort_keys=True)
+
+    try:
+        os.rename(path_tmp, path)
+    except OSError:
+        # Another run added the same solution in the meantime.
+        shutil.rmtree(path_tmp)
+
+    # Finishing
+    return path
+
+
+def load_solution(respy_obj, dirname):
+    """ Attach the solution from the store to the class instance if it is
+    available. The arrays are memory-mapped copy-on-write, so the store is
+    never modified.
+    """
+    # Antibugging
+    assert (not respy_obj.get_attr('is_solved'))
+
+    # Distribute class attributes
+    min_idx = respy_obj.get_attr('min_idx')
+
+    path = os.path.join(dirname, get_solution_hash(respy_obj))
+
+    if not os.path.exists(path):
+        return respy_obj
+
+    with open(os.path.join(path, 'header.json')) as in_file:
+        header = json.load(in_file)
+
+    solution = dict()
+    for label in STORE_ARRAYS:
+        solution[label] = np.load(os.path.join(path, label + '.npy'),
+            mmap_mode='c')
+
+        # Antibugging
+        assert (solution[label].dtype.str == header['arrays'][label]['dtype'])
+        assert (list(solution[label].shape) ==
+            header['arrays'][label]['shape'])
+
+    mapping_state_idx = MappingStateIdxCls(solution['states_all'],
+        solution['states_number_period'], min_idx)
+
+    respy_obj = add_solution(respy_obj,
+        solution['periods_payoffs_systematic'],
+        solution['states_number_period'], mapping_state_idx,
+        solution['periods_emax'], solution['states_all'])
+
+    # Finishing
+    return respy_obj
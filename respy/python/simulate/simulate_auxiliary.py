@@ -1,22 +1,144 @@
 import pandas as pd
 import numpy as np
+import os
 
+from respy.python.shared.shared_auxiliary import replace_missing_values
+from respy.python.shared.shared_auxiliary import dist_class_attributes
 from respy.python.shared.shared_auxiliary import dist_model_paras
+from respy.python.shared.shared_auxiliary import check_dataset
+from respy.python.shared.shared_constants import MISSING_FLOAT
+from respy.python.shared.shared_constants import DATA_DTYPE
+from respy.python.shared.shared_context import get_path
 
 
 def write_info(respy_obj, data_frame):
     """ Write information about the simulated economy.
     """
-    # Distribute class attributes
-    file_sim = respy_obj.get_attr('file_sim')
-
-    seed_sim = respy_obj.get_attr('seed_sim')
-
     # Get basic information
     num_agents_sim = data_frame[1].value_counts().iloc[0]
 
     num_periods = data_frame[0].value_counts().iloc[0]
 
+    # Collect the choices and outcomes for each period
+    choices_shares = np.tile(np.nan, (num_periods, 4))
+    wages_stats = [[None] * num_periods, [None] * num_periods]
+
+    for t in range(num_periods):
+
+        is_period = (data_frame[1] == t)
+
+        for j in range(4):
+            choices_shares[t, j] = np.sum((data_frame[2] == (j + 1)) &
+                is_period) / float(num_agents_sim)
+
+        for j in range(2):
+            is_working = (data_frame[2] == (j + 1)) & is_period
+            wages_stats[j][t] = _get_wages_stats(
+                data_frame[is_working].ix[:, 3].values)
+
+    # Additional information about the simulated economy
+    is_final = (data_frame.ix[:, 1] == (num_periods - 1))
+
+    averages = []
+    for j in [6, 4, 5]:
+        averages += [data_frame[is_final].ix[:, j].mean()]
+
+    _write_info(respy_obj, num_agents_sim, num_periods, choices_shares,
+        wages_stats, averages)
+
+
+def write_out_chunks(respy_obj, chunks):
+    """ Write the dataset to file as it is simulated chunk by chunk. The
+    information about the simulated economy is accumulated along the way.
+    Only the wages are collected in a memory map on disk, as their
+    percentiles require the whole sample. In debug mode, each chunk is
+    checked on its own.
+    """
+    # Distribute class attributes
+    num_agents_sim, num_periods, file_sim, is_debug = dist_class_attributes(
+        respy_obj, 'num_agents_sim', 'num_periods', 'file_sim', 'is_debug')
+
+    # Initialize containers
+    choices_counts = np.zeros((num_periods, 4))
+    sums = np.zeros(3)
+
+    wages = np.memmap(get_path('.wages_sims.respy.dat'), dtype=np.float64,
+        mode='w+', shape=(2, num_periods, num_agents_sim))
+    wages[:] = np.nan
+
+    # The binary format is selected by the file extension. The chunks are
+    # then written to their rows of the dataset directly.
+    is_binary = file_sim.endswith('.npy')
+
+    if is_binary:
+        records = np.lib.format.open_memmap(file_sim, mode='w+',
+            dtype=np.dtype(DATA_DTYPE), shape=(num_agents_sim * num_periods,))
+    else:
+        file_ = open(file_sim, 'w')
+
+    for data_array in chunks:
+
+        if is_debug:
+            check_dataset(pd.DataFrame(replace_missing_values(data_array)),
+                respy_obj, 'chunk')
+
+        # Distribute the chunk
+        agents = data_array[:, 0].astype(int)
+        periods = data_array[:, 1].astype(int)
+        choices = data_array[:, 2].astype(int)
+
+        np.add.at(choices_counts, (periods, choices - 1), 1)
+
+        for j in range(2):
+            is_working = (choices == (j + 1))
+            wages[j, periods[is_working], agents[is_working]] = \
+                data_array[is_working, 3]
+
+        is_final = (periods == (num_periods - 1))
+        sums += data_array[is_final, :][:, [6, 4, 5]].sum(axis=0)
+
+        if is_binary:
+            lower = agents[0] * num_periods
+            upper = lower + data_array.shape[0]
+            records[lower:upper] = _get_records(
+                replace_missing_values(data_array))
+        else:
+            _write_rows(file_, data_array, num_agents_sim)
+
+    if is_binary:
+        records.flush()
+        del records
+    else:
+        file_.close()
+
+    # Collect the information about the simulated economy
+    choices_shares = choices_counts / float(num_agents_sim)
+
+    wages_stats = [[None] * num_periods, [None] * num_periods]
+    for j in range(2):
+        for t in range(num_periods):
+            wages_period = np.array(wages[j, t, :])
+            wages_stats[j][t] = _get_wages_stats(
+                wages_period[np.isfinite(wages_period)])
+
+    averages = (sums / float(num_agents_sim)).tolist()
+
+    del wages
+    os.unlink(get_path('.wages_sims.respy.dat'))
+
+    _write_info(respy_obj, num_agents_sim, num_periods, choices_shares,
+        wages_stats, averages)
+
+
+def _write_info(respy_obj, num_agents_sim, num_periods, choices_shares,
+        wages_stats, averages):
+    """ Write the information about the simulated economy to file.
+    """
+    # Distribute class attributes
+    file_sim = respy_obj.get_attr('file_sim')
+
+    seed_sim = respy_obj.get_attr('seed_sim')
+
     # Determine name of output file
     fname_split = file_sim.split('.')
     if len(fname_split) > 1:
@@ -40,20 +162,8 @@ def write_info(respy_obj, data_frame):
 
         for t in range(num_periods):
 
-            work_a = np.sum((data_frame[2] == 1) &
-                            (data_frame[1] == t))/float(num_agents_sim)
-
-            work_b = np.sum((data_frame[2] == 2) & (data_frame[1] ==
-                                                    t))/float(num_agents_sim)
-
-            schooling = np.sum((data_frame[2] == 3) &
-                               (data_frame[1] == t))/float(num_agents_sim)
-
-            home = np.sum((data_frame[2] == 4) & (data_frame[1] ==
-                                                  t))/float(num_agents_sim)
-
             fmt_ = '{:>10}' + '{:14.4f}' * 4 + '\n'
-            args = [(t + 1), work_a, work_b, schooling, home]
+            args = [(t + 1)] + choices_shares[t, :].tolist()
             file_.write(fmt_.format(*args))
 
         file_.write('\n\n')
@@ -69,23 +179,10 @@ def write_info(respy_obj, data_frame):
 
             for t in range(num_periods):
 
-                is_working = (data_frame[2] == (j + 1)) & (data_frame[1] == t)
-                wages = data_frame[is_working].ix[:, 3]
-                count = wages.count()
-
-                if count > 0:
-                    mean, sd = np.mean(wages), np.sqrt(np.var(wages))
-                    percentiles = np.percentile(wages, [20, 50, 80]).tolist()
-                else:
-                    mean, sd = '---', '---'
-                    percentiles = ['---', '---', '---']
-
-                values = [t + 1]
-                values += [count, mean, sd]
-                values += percentiles
+                values = [t + 1] + wages_stats[j][t]
 
                 fmt_ = '{:>10}    ' + '{:>10}    ' * 6 + '\n'
-                if count > 0:
+                if values[1] > 0:
                     fmt_ = '{:>10}    {:>10}' + '{:14.4f}' * 5 + '\n'
                 file_.write(fmt_.format(*values))
 
@@ -97,19 +194,13 @@ def write_info(respy_obj, data_frame):
 
         file_.write('   Additional Information\n\n')
 
-        stat = data_frame[data_frame.ix[:, 1] ==
-                (num_periods - 1)].ix[:, 6].mean()
-        file_.write(string.format(['Average Education', stat]))
+        file_.write(string.format(['Average Education', averages[0]]))
 
         file_.write('\n')
 
-        stat = data_frame[data_frame.ix[:, 1] ==
-                (num_periods - 1)].ix[:, 4].mean()
-        file_.write(string.format(['Average Experience A', stat]))
+        file_.write(string.format(['Average Experience A', averages[1]]))
 
-        stat = data_frame[data_frame.ix[:, 1] ==
-                (num_periods - 1)].ix[:, 5].mean()
-        file_.write(string.format(['Average Experience B', stat]))
+        file_.write(string.format(['Average Experience B', averages[2]]))
 
         file_.write('\n\n   Parameterization\n\n')
         fmt_ = '\n\n   {0:>10}' + '    {1:>25}\n\n'
@@ -122,12 +213,33 @@ def write_info(respy_obj, data_frame):
             file_.write(fmt_.format(*[i, stat]))
 
 
+def _get_wages_stats(wages):
+    """ Get the summary statistics of the wages.
+    """
+    count = wages.size
+
+    if count > 0:
+        mean, sd = np.mean(wages), np.sqrt(np.var(wages))
+        percentiles = np.percentile(wages, [20, 50, 80]).tolist()
+    else:
+        mean, sd = '---', '---'
+        percentiles = ['---', '---', '---']
+
+    # Finishing
+    return [count, mean, sd] + percentiles
+
+
 def write_out(respy_obj, data_frame):
     """ Write dataset to file.
     """
     # Distribute class attributes
     file_sim = respy_obj.get_attr('file_sim')
 
+    # The binary format is selected by the file extension.
+    if file_sim.endswith('.npy'):
+        np.save(file_sim, _get_records(data_frame.values))
+        return
+
     formats = []
 
     formats += [_format_integer, _format_integer, _format_integer]
@@ -142,6 +254,41 @@ def write_out(respy_obj, data_frame):
                             formatters=formats)
 
 
+def _write_rows(file_, data_array, num_agents_sim):
+    """ Write the rows of a chunk of the dataset to file. The rows are
+    formatted directly, but aligned with the layout of write_out.
+    """
+    # The agent identifiers determine the width of the first column. All
+    # other columns have a fixed width unless there are extremely high wages.
+    width = max(5, len(str(num_agents_sim - 1)))
+
+    fmt_work = '%*s %-5d %-5d %10.2f %-5d %-5d %-5d %-5d\n'
+    fmt_home = '%*s %-5d %-5d          . %-5d %-5d %-5d %-5d\n'
+
+    lines = []
+    for row in data_array.tolist():
+        agent = '%-5d' % row[0]
+        if row[3] == MISSING_FLOAT:
+            lines += [fmt_home % ((width, agent, row[1], row[2]) +
+                tuple(row[4:]))]
+        else:
+            lines += [fmt_work % ((width, agent) + tuple(row[1:]))]
+
+    file_.write(''.join(lines))
+
+
+def _get_records(data_array):
+    """ Get the rows of the dataset in the binary format.
+    """
+    records = np.empty(data_array.shape[0], dtype=np.dtype(DATA_DTYPE))
+
+    for i, name in enumerate(records.dtype.names):
+        records[name] = data_array[:, i]
+
+    # Finishing
+    return records
+
+
 def _format_float(x):
     """ Pretty formatting for floats
     """
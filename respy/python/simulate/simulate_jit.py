@@ -0,0 +1,73 @@
+""" This module contains the JIT-compiled kernels for the simulation of a
+sample.
+"""
+import numpy as np
+
+from respy.python.shared.shared_jit import jit_get_total_value
+from respy.python.shared.shared_constants import MISSING_FLOAT
+from respy.python.shared.shared_jit import jit
+
+
+@jit
+def jit_simulate(periods_payoffs_systematic, periods_successors,
+        periods_inadmissible, periods_emax, states_all, num_periods,
+        edu_start, delta, num_agents_sim, periods_draws_sims_transformed):
+    """ Simulate agent experiences. This is the counterpart to the loop over
+    agents and periods in pyth_simulate. The agents traverse the decision tree
+    along the successor states of their choices.
+    """
+    # Initialize data
+    dataset = np.full((num_agents_sim * num_periods, 8), MISSING_FLOAT)
+    total_payoffs = np.zeros(4)
+
+    # Simulate agent experiences
+    count = 0
+
+    for i in range(num_agents_sim):
+
+        # All agents start in the same state.
+        k = 0
+
+        # Iterate over each period for the agent
+        for period in range(num_periods):
+
+            # Write agent identifier and current period to data frame
+            dataset[count, 0] = i
+            dataset[count, 1] = period
+
+            # Select relevant subset
+            payoffs_systematic = periods_payoffs_systematic[period, k, :]
+            draws = periods_draws_sims_transformed[period, i, :]
+
+            # Get total value of admissible states
+            jit_get_total_value(period, num_periods, delta,
+                payoffs_systematic, draws, periods_successors,
+                periods_inadmissible, periods_emax, k, total_payoffs)
+
+            # Determine optimal choice
+            max_idx = np.argmax(total_payoffs)
+
+            # Record agent decision
+            dataset[count, 2] = max_idx + 1
+
+            # Record earnings
+            if max_idx < 2:
+                dataset[count, 3] = payoffs_systematic[max_idx] * \
+                    draws[max_idx]
+
+            # Write relevant state space for period to data frame
+            for j in range(4):
+                dataset[count, 4 + j] = states_all[period, k, j]
+
+            # Special treatment for education
+            dataset[count, 6] += edu_start
+
+            # Update the state
+            if period != (num_periods - 1):
+                k = periods_successors[period, k, max_idx]
+
+            # Update row indicator
+            count += 1
+
+    # Finishing
+    return dataset
@@ -6,16 +6,69 @@ from respy.python.record.record_simulation import record_simulation_start
 from respy.python.shared.shared_auxiliary import transform_disturbances
 from respy.python.shared.shared_constants import MISSING_FLOAT
 from respy.python.shared.shared_auxiliary import get_total_value
+from respy.python.simulate.simulate_jit import jit_simulate
 
 
 def pyth_simulate(periods_payoffs_systematic, mapping_state_idx,
         periods_emax, states_all, shocks_cholesky, num_periods, edu_start, edu_max, delta,
-        num_agents_sim, periods_draws_sims, seed_sim):
-    """ Wrapper for PYTHON and F2PY implementation of sample simulation.
+        num_agents_sim, periods_draws_sims, seed_sim, is_jit=False):
+    """ Wrapper for PYTHON and F2PY implementation of sample simulation. The
+    JIT-compiled kernel is used for the NUMBA version.
     """
 
     record_simulation_start(num_agents_sim, seed_sim)
 
+    dataset = _simulate_cohort(periods_payoffs_systematic, mapping_state_idx,
+        periods_emax, states_all, shocks_cholesky, num_periods, edu_start,
+        edu_max, delta, num_agents_sim, periods_draws_sims, is_jit)
+
+    # The progress is recorded afterwards to align the logging.
+    for i in range(num_agents_sim):
+        record_simulation_progress(i)
+
+    record_simulation_stop()
+
+    # Finishing
+    return dataset
+
+
+def pyth_simulate_chunks(periods_payoffs_systematic, mapping_state_idx,
+        periods_emax, states_all, shocks_cholesky, num_periods, edu_start,
+        edu_max, delta, num_agents_sim, periods_draws_sims, seed_sim,
+        chunk_sim, is_jit=False):
+    """ Simulate the sample in chunks of consecutive agents, which are
+    yielded one at a time. Only the draws of the current chunk are accessed,
+    so these can be a memory map on disk. The chunks add up to the sample
+    from pyth_simulate.
+    """
+
+    record_simulation_start(num_agents_sim, seed_sim)
+
+    for lower in range(0, num_agents_sim, chunk_sim):
+
+        upper = min(lower + chunk_sim, num_agents_sim)
+
+        dataset = _simulate_cohort(periods_payoffs_systematic,
+            mapping_state_idx, periods_emax, states_all, shocks_cholesky,
+            num_periods, edu_start, edu_max, delta, upper - lower,
+            periods_draws_sims[:, lower:upper, :], is_jit)
+
+        # The agent identifiers continue across the chunks.
+        dataset[:, 0] += lower
+
+        for i in range(lower, upper):
+            record_simulation_progress(i)
+
+        yield dataset
+
+    record_simulation_stop()
+
+
+def _simulate_cohort(periods_payoffs_systematic, mapping_state_idx,
+        periods_emax, states_all, shocks_cholesky, num_periods, edu_start,
+        edu_max, delta, num_agents_sim, periods_draws_sims, is_jit):
+    """ Simulate the experiences of a cohort of agents.
+    """
     # Standard deviates transformed to the distributions relevant for
     # the agents actual decision making as traversing the tree.
     periods_draws_sims_transformed = np.tile(np.nan,
@@ -25,75 +78,69 @@ def pyth_simulate(periods_payoffs_systematic, mapping_state_idx,
         periods_draws_sims_transformed[period, :, :] = transform_disturbances(
             periods_draws_sims[period, :, :], shocks_cholesky)
 
-    # Simulate agent experiences
-    count = 0
-
-    # Initialize data
-    dataset = np.tile(MISSING_FLOAT, (num_agents_sim * num_periods, 8))
+    if is_jit:
+        dataset = jit_simulate(periods_payoffs_systematic,
+            mapping_state_idx.periods_successors,
+            mapping_state_idx.periods_inadmissible, periods_emax, states_all,
+            num_periods, edu_start, delta, num_agents_sim,
+            periods_draws_sims_transformed)
 
-    for i in range(num_agents_sim):
-
-        current_state = states_all[0, 0, :].copy()
-
-        dataset[count, 0] = i
-
-        record_simulation_progress(i)
+        return dataset
 
-        # Iterate over each period for the agent
-        for period in range(num_periods):
+    # The whole cohort of agents is advanced one period at a time. The rows
+    # of the dataset are still ordered by agent and then by period.
+    dataset = np.tile(MISSING_FLOAT, (num_agents_sim, num_periods, 8))
 
-            # Distribute state space
-            exp_a, exp_b, edu, edu_lagged = current_state
+    # All agents start in the same state.
+    current_states = np.tile(states_all[0, 0, :], (num_agents_sim, 1))
 
-            k = mapping_state_idx[period, exp_a, exp_b, edu, edu_lagged]
+    agents = np.arange(num_agents_sim)
 
-            # Write agent identifier and current period to data frame
-            dataset[count, :2] = i, period
+    for period in range(num_periods):
 
-            # Select relevant subset
-            payoffs_systematic = periods_payoffs_systematic[period, k, :]
-            draws = periods_draws_sims_transformed[period, i, :]
+        # Distribute state space
+        exp_a, exp_b, edu, edu_lagged = current_states.T
 
-            # Get total value of admissible states
-            total_payoffs = get_total_value(period,
-                num_periods, delta, payoffs_systematic, draws, edu_max,
-                edu_start, mapping_state_idx, periods_emax, k, states_all)
+        k = mapping_state_idx[period, exp_a, exp_b, edu, edu_lagged]
 
-            # Determine optimal choice
-            max_idx = np.argmax(total_payoffs)
+        # Select relevant subset
+        payoffs_systematic = periods_payoffs_systematic[period, k, :]
+        draws = periods_draws_sims_transformed[period, :, :]
 
-            # Record agent decision
-            dataset[count, 2] = max_idx + 1
+        # Get total value of admissible states for all agents
+        total_payoffs = get_total_value(period, num_periods, delta,
+            payoffs_systematic, draws, edu_max, edu_start, mapping_state_idx,
+            periods_emax, k, states_all)
 
-            # Record earnings
-            dataset[count, 3] = MISSING_FLOAT
-            if max_idx in [0, 1]:
-                dataset[count, 3] = payoffs_systematic[max_idx] * draws[max_idx]
+        # Determine optimal choices
+        max_idx = np.argmax(total_payoffs, axis=1)
 
-            # Write relevant state space for period to data frame
-            dataset[count, 4:8] = current_state
+        # Write agent identifier and current period to data frame
+        dataset[:, period, 0] = agents
+        dataset[:, period, 1] = period
 
-            # Special treatment for education
-            dataset[count, 6] += edu_start
+        # Record agent decisions
+        dataset[:, period, 2] = max_idx + 1
 
-            # Update work experiences and education
-            if max_idx == 0:
-                current_state[0] += 1
-            elif max_idx == 1:
-                current_state[1] += 1
-            elif max_idx == 2:
-                current_state[2] += 1
+        # Record earnings
+        is_working = (max_idx < 2)
+        dataset[is_working, period, 3] = \
+            payoffs_systematic[is_working, max_idx[is_working]] * \
+            draws[is_working, max_idx[is_working]]
 
-            # Update lagged education
-            current_state[3] = 0
+        # Write relevant state space for period to data frame
+        dataset[:, period, 4:8] = current_states
 
-            if max_idx == 2:
-                current_state[3] = 1
+        # Special treatment for education
+        dataset[:, period, 6] += edu_start
 
-            # Update row indicator
-            count += 1
+        # Update work experiences and education
+        current_states[:, 0] += (max_idx == 0)
+        current_states[:, 1] += (max_idx == 1)
+        current_states[:, 2] += (max_idx == 2)
 
-    record_simulation_stop()
+        # Update lagged education
+        current_states[:, 3] = (max_idx == 2)
 
     # Finishing
-    return dataset
+    return dataset.reshape((num_agents_sim * num_periods, 8))
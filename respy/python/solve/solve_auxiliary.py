@@ -6,93 +6,103 @@ import os
 from respy.python.record.record_solution import record_prediction_model
 from respy.python.record.record_solution import record_solution_progress
 from respy.python.shared.shared_auxiliary import transform_disturbances
+from respy.python.solve.solve_jit import jit_create_state_space
+from respy.python.solve.solve_jit import jit_get_future_value
+from respy.python.shared.shared_constants import EMAX_MEMORY_BUDGET
+from respy.python.shared.shared_parallel import distribute_workload
+from respy.python.shared.shared_mapping import MappingStateIdxCls
 from respy.python.shared.shared_auxiliary import get_total_value
 from respy.python.shared.shared_constants import MISSING_FLOAT
+from respy.python.shared.shared_constants import SEED_INTERP
 from respy.python.shared.shared_constants import HUGE_FLOAT
 from respy.python.shared.shared_constants import MISSING_INT
+from respy.python.shared.shared_context import get_path
+from respy.python.shared.shared_parallel import WORKER
 
 
-def pyth_create_state_space(num_periods, edu_start, edu_max, min_idx):
-    """ Create grid for state space.
+def pyth_create_state_space(num_periods, edu_start, edu_max, min_idx,
+        is_jit=False):
+    """ Create grid for state space. All candidate realizations of the state
+    space are enumerated for each period at once and the inadmissible ones
+    are dropped. The ordering of the admissible states is the same as for
+    nested loops over work experiences, education, and lagged education.
     """
-    # Array for possible realization of state space by period
-    states_all = np.tile(MISSING_INT, (num_periods, 100000, 4))
+    # The JIT-compiled kernel runs these nested loops directly.
+    if is_jit:
+        states_all, states_number_period = jit_create_state_space(
+            num_periods, edu_start, edu_max)
 
-    # Array for the mapping of state space values to indices in variety
-    # of matrices.
-    mapping_state_idx = np.tile(MISSING_INT, (num_periods, num_periods,
-        num_periods, min_idx, 2))
+        max_states_period = max(states_number_period)
+
+        mapping_state_idx = MappingStateIdxCls(states_all,
+            states_number_period, min_idx)
+
+        return (states_all, states_number_period, mapping_state_idx,
+            max_states_period)
 
     # Array for maximum number of realizations of state space by period
     states_number_period = np.tile(MISSING_INT, num_periods)
 
+    # Container for the admissible realizations of state space by period
+    periods_states = []
+
     # Construct state space by periods
     for period in range(num_periods):
 
-        # Count admissible realizations of state space by period
-        k = 0
-
-        # Loop over all admissible work experiences for Occupation A
-        for exp_a in range(num_periods + 1):
-
-            # Loop over all admissible work experience for Occupation B
-            for exp_b in range(num_periods + 1):
-
-                # Loop over all admissible additional education levels
-                for edu in range(num_periods + 1):
-
-                    # Agent cannot attain more additional education
-                    # than (EDU_MAX - EDU_START).
-                    if edu > (edu_max - edu_start):
-                        continue
-
-                    # Loop over all admissible values for leisure. Note that
-                    # the leisure variable takes only zero/value. The time path
-                    # does not matter.
-                    for edu_lagged in [0, 1]:
-
-                        # Check if lagged education admissible. (1) In the
-                        # first period all agents have lagged schooling equal
-                        # to one.
-                        if (edu_lagged == 0) and (period == 0):
-                            continue
-                        # (2) Whenever an agent has not acquired any additional
-                        # education and we are not in the first period,
-                        # then this cannot be the case.
-                        if (edu_lagged == 1) and (edu == 0) and (period > 0):
-                            continue
-                        # (3) Whenever an agent has only acquired additional
-                        # education, then edu_lagged cannot be zero.
-                        if (edu_lagged == 0) and (edu == period):
-                            continue
-
-                        # Check if admissible for time constraints
-                        total = edu + exp_a + exp_b
-
-                        # Note that the total number of activities does not
-                        # have is less or equal to the total possible number of
-                        # activities as the rest is implicitly filled with
-                        # leisure.
-                        if total > period:
-                            continue
-
-                        # Collect all possible realizations of state space
-                        states_all[period, k, :] = [exp_a, exp_b, edu,
-                                                    edu_lagged]
-
-                        # Collect mapping of state space to array index.
-                        mapping_state_idx[period, exp_a, exp_b, edu,
-                                          edu_lagged] = k
-
-                        # Update count
-                        k += 1
+        # Agent cannot attain more additional education than (EDU_MAX -
+        # EDU_START) and neither work experience nor additional education
+        # can exceed the number of periods passed.
+        edu_upper = min(period, edu_max - edu_start)
+
+        # Enumerate all candidate realizations (exp_a, exp_b, edu,
+        # edu_lagged). The ordering of the grid is lexicographic and thus
+        # aligned with the ordering of nested loops.
+        shape = (period + 1, period + 1, edu_upper + 1, 2)
+        exp_a, exp_b, edu, edu_lagged = \
+            [grid.ravel() for grid in np.indices(shape)]
+
+        # Check if lagged education admissible. (1) In the first period all
+        # agents have lagged schooling equal to one.
+        is_admissible = ~ ((edu_lagged == 0) & (period == 0))
+
+        # (2) Whenever an agent has not acquired any additional education
+        # and we are not in the first period, then this cannot be the case.
+        is_admissible &= ~ ((edu_lagged == 1) & (edu == 0) & (period > 0))
+
+        # (3) Whenever an agent has only acquired additional education,
+        # then edu_lagged cannot be zero.
+        is_admissible &= ~ ((edu_lagged == 0) & (edu == period))
+
+        # Check if admissible for time constraints. Note that the total
+        # number of activities does not have is less or equal to the total
+        # possible number of activities as the rest is implicitly filled
+        # with leisure.
+        is_admissible &= ((edu + exp_a + exp_b) <= period)
+
+        # Collect all possible realizations of state space
+        states = np.column_stack((exp_a, exp_b, edu, edu_lagged))
+        states = states[is_admissible]
 
         # Record maximum number of state space realizations by time period
-        states_number_period[period] = k
+        states_number_period[period] = states.shape[0]
+
+        periods_states += [states]
 
     # Auxiliary objects
     max_states_period = max(states_number_period)
 
+    # Array for possible realization of state space by period. This is
+    # allocated to exactly the maximum number of states in any period.
+    states_all = np.tile(MISSING_INT, (num_periods, max_states_period, 4))
+
+    for period, states in enumerate(periods_states):
+        states_all[period, :states_number_period[period], :] = states
+
+    # Collect mapping of state space to array index. Only the admissible
+    # states are stored.
+    mapping_state_idx = MappingStateIdxCls(states_all, states_number_period,
+        min_idx)
+
     # Collect arguments
     args = (states_all, states_number_period)
     args += (mapping_state_idx, max_states_period,)
@@ -104,50 +114,43 @@ def pyth_create_state_space(num_periods, edu_start, edu_max, min_idx):
 def pyth_calculate_payoffs_systematic(num_periods, states_number_period,
         states_all, edu_start, coeffs_a, coeffs_b, coeffs_edu, coeffs_home,
         max_states_period):
-    """ Calculate ex systematic payoffs.
+    """ Calculate ex systematic payoffs. The payoffs are determined for all
+    admissible states at once.
     """
 
     # Initialize
     shape = (num_periods, max_states_period, 4)
     periods_payoffs_systematic = np.tile(MISSING_FLOAT, shape)
 
-    # Calculate systematic instantaneous payoffs
-    for period in range(num_periods - 1, -1, -1):
-
-        # Loop over all possible states
-        for k in range(states_number_period[period]):
+    # Select all admissible states, padded entries are ignored.
+    is_admissible = (np.arange(max_states_period) <
+        np.array(states_number_period)[:, None])
 
-            # Distribute state space
-            exp_a, exp_b, edu, edu_lagged = states_all[period, k, :]
+    # Distribute state space
+    exp_a, exp_b, edu, edu_lagged = states_all[is_admissible].T
 
-            # Auxiliary objects
-            covars = [1.0, edu + edu_start, exp_a, exp_a ** 2, exp_b,
-                      exp_b ** 2]
-
-            # Calculate systematic part of wages in occupation A
-            periods_payoffs_systematic[period, k, 0] = \
-                np.clip(np.exp(np.dot(coeffs_a, covars)), 0.0, HUGE_FLOAT)
-
-            # Calculate systematic part pf wages in occupation B
-            periods_payoffs_systematic[period, k, 1] = \
-                np.clip(np.exp(np.dot(coeffs_b, covars)), 0.0, HUGE_FLOAT)
+    # Auxiliary objects
+    covars = np.column_stack((np.ones(exp_a.size), edu + edu_start, exp_a,
+        exp_a ** 2, exp_b, exp_b ** 2))
 
-            # Calculate systematic part of schooling utility
-            payoff = coeffs_edu[0]
+    payoffs = np.tile(np.nan, (exp_a.size, 4))
 
-            # Tuition cost for higher education if agents move
-            # beyond high school.
-            if edu + edu_start >= 12:
-                payoff += coeffs_edu[1]
+    # Calculate systematic part of wages in occupation A and B
+    coeffs_work = np.column_stack((coeffs_a, coeffs_b))
+    payoffs[:, :2] = np.clip(np.exp(np.dot(covars, coeffs_work)), 0.0,
+        HUGE_FLOAT)
 
-            # Psychic cost of going back to school
-            if edu_lagged == 0:
-                payoff += coeffs_edu[2]
+    # Calculate systematic part of schooling utility. There is a tuition
+    # cost for higher education if agents move beyond high school and a
+    # psychic cost of going back to school.
+    payoffs[:, 2] = coeffs_edu[0]
+    payoffs[:, 2] += np.where(edu + edu_start >= 12, coeffs_edu[1], 0.0)
+    payoffs[:, 2] += np.where(edu_lagged == 0, coeffs_edu[2], 0.0)
 
-            periods_payoffs_systematic[period, k, 2] = payoff
+    # Calculate systematic part of HOME
+    payoffs[:, 3] = coeffs_home[0]
 
-            # Calculate systematic part of HOME
-            periods_payoffs_systematic[period, k, 3] = coeffs_home[0]
+    periods_payoffs_systematic[is_admissible] = payoffs
 
     # Finishing
     return periods_payoffs_systematic
@@ -156,9 +159,13 @@ def pyth_calculate_payoffs_systematic(num_periods, states_number_period,
 def pyth_backward_induction(num_periods, max_states_period, periods_draws_emax,
         num_draws_emax, states_number_period, periods_payoffs_systematic,
         edu_max, edu_start, mapping_state_idx, states_all, delta, is_debug,
-        is_interpolated, num_points_interp, shocks_cholesky):
+        is_interpolated, num_points_interp, shocks_cholesky,
+        memory_budget=EMAX_MEMORY_BUDGET, is_jit=False, pool=None):
     """ Backward induction procedure. There are two main threads to this
-    function depending on whether interpolation is requested or not.
+    function depending on whether interpolation is requested or not. The
+    memory budget in megabytes bounds the size of the temporary arrays when
+    simulating the expected future values. The states of each period are
+    distributed across the pool of workers, if available.
     """
     # Construct auxiliary objects
     shocks_cov = np.matmul(shocks_cholesky, shocks_cholesky.T)
@@ -173,6 +180,11 @@ def pyth_backward_induction(num_periods, max_states_period, periods_draws_emax,
     # Initialize containers with missing values
     periods_emax = np.tile(MISSING_FLOAT, (num_periods, max_states_period))
 
+    # The interpolation points are drawn from a random state that is local to
+    # the backward induction. Thus, the solution does not depend on any
+    # earlier use of the random state, e.g. by other threads or workers.
+    random_state = np.random.RandomState(SEED_INTERP)
+
     # Iterate backward through all periods
     for period in range(num_periods - 1, -1, -1):
 
@@ -196,7 +208,7 @@ def pyth_backward_induction(num_periods, max_states_period, periods_draws_emax,
 
             # Get indicator for interpolation and simulation of states
             is_simulated = get_simulated_indicator(num_points_interp, num_states,
-                period, is_debug)
+                period, is_debug, random_state)
 
             # Constructing the exogenous variable for all states, including the
             # ones where simulation will take place. All information will be
@@ -211,7 +223,8 @@ def pyth_backward_induction(num_periods, max_states_period, periods_draws_emax,
             endogenous = get_endogenous_variable(period, num_periods,
                 num_states, delta, periods_payoffs_systematic, edu_max,
                 edu_start, mapping_state_idx, periods_emax, states_all,
-                is_simulated, num_draws_emax,maxe, draws_emax_transformed)
+                is_simulated, num_draws_emax, maxe, draws_emax_transformed,
+                memory_budget, is_jit, pool)
 
             # Create prediction model based on the random subset of points where
             # the EMAX is actually simulated and thus dependent and
@@ -225,31 +238,32 @@ def pyth_backward_induction(num_periods, max_states_period, periods_draws_emax,
 
         else:
 
-            # Loop over all possible states
-            for k in range(states_number_period[period]):
+            # All possible states are handled at once.
+            k = np.arange(num_states)
 
-                # Extract payoffs
-                payoffs_systematic = periods_payoffs_systematic[period, k, :]
+            # Extract payoffs
+            payoffs_systematic = periods_payoffs_systematic[period, k, :]
 
-                # Simulate the expected future value.
-                emax = get_future_value(num_periods, num_draws_emax, period, k,
-                    draws_emax_transformed, payoffs_systematic, edu_max,
-                    edu_start, periods_emax, states_all, mapping_state_idx,
-                    delta)
+            # Simulate the expected future value.
+            emax = get_future_value(num_periods, num_draws_emax, period, k,
+                draws_emax_transformed, payoffs_systematic, edu_max,
+                edu_start, periods_emax, states_all, mapping_state_idx,
+                delta, memory_budget, is_jit, pool)
 
-                # Store results
-                periods_emax[period, k] = emax
+            # Store results
+            periods_emax[period, :num_states] = emax
 
     # Finishing. Note that the last two return arguments are not available in
     # for periods, where interpolation is required.
     return periods_emax
 
 
-def get_simulated_indicator(num_points_interp, num_candidates, period, is_debug):
+def get_simulated_indicator(num_points_interp, num_candidates, period, is_debug,
+        random_state):
     """ Get the indicator for points of interpolation and simulation.
     """
     # Drawing random interpolation points
-    interpolation_points = np.random.choice(range(num_candidates),
+    interpolation_points = random_state.choice(range(num_candidates),
         size=num_points_interp, replace=False)
 
     # Constructing an indicator whether a state will be simulated or
@@ -258,9 +272,10 @@ def get_simulated_indicator(num_points_interp, num_candidates, period, is_debug)
     is_simulated[interpolation_points] = True
 
     # Check for debugging cases.
-    is_standardized = is_debug and os.path.exists('interpolation.txt')
+    fname = get_path('interpolation.txt')
+    is_standardized = is_debug and os.path.exists(fname)
     if is_standardized:
-        with open('interpolation.txt', 'r') as file_:
+        with open(fname, 'r') as file_:
             indicators = []
             for line in file_:
                 indicators += [(shlex.split(line)[period] == 'True')]
@@ -282,29 +297,28 @@ def get_exogenous_variables(period, num_periods, num_states, delta,
     """
     # Construct auxiliary objects
     exogenous = np.tile(np.nan, (num_states, 9))
-    maxe = np.tile(np.nan, num_states)
 
-    # Iterate over all states.
-    for k in range(num_states):
+    # All states are handled at once.
+    k = np.arange(num_states)
 
-        # Extract systematic payoff
-        payoffs_systematic = periods_payoffs_systematic[period, k, :]
+    # Extract systematic payoff
+    payoffs_systematic = periods_payoffs_systematic[period, k, :]
 
-        # Get total value
-        total_payoffs = get_total_value(period, num_periods, delta,
-            payoffs_systematic, shifts, edu_max, edu_start,
-            mapping_state_idx, periods_emax, k, states_all)
+    # Get total value
+    total_payoffs = get_total_value(period, num_periods, delta,
+        payoffs_systematic, np.array(shifts), edu_max, edu_start,
+        mapping_state_idx, periods_emax, k, states_all)
 
-        # Implement level shifts
-        maxe[k] = max(total_payoffs)
+    # Implement level shifts
+    maxe = np.max(total_payoffs, axis=1)
 
-        diff = maxe[k] - total_payoffs
+    diff = maxe[:, None] - total_payoffs
 
-        exogenous[k, :8] = np.hstack((diff, np.sqrt(diff)))
+    exogenous[:, :8] = np.hstack((diff, np.sqrt(diff)))
 
-        # Add intercept to set of independent variables and replace
-        # infinite values.
-        exogenous[:, 8] = 1
+    # Add intercept to set of independent variables and replace
+    # infinite values.
+    exogenous[:, 8] = 1
 
     # Finishing
     return exogenous, maxe
@@ -313,28 +327,27 @@ def get_exogenous_variables(period, num_periods, num_states, delta,
 def get_endogenous_variable(period, num_periods, num_states, delta,
         periods_payoffs_systematic, edu_max, edu_start, mapping_state_idx,
         periods_emax, states_all, is_simulated, num_draws_emax, maxe,
-        draws_emax_transformed):
+        draws_emax_transformed, memory_budget=EMAX_MEMORY_BUDGET,
+        is_jit=False, pool=None):
     """ Construct endogenous variable for the subset of interpolation points.
     """
     # Construct auxiliary objects
     endogenous_variable = np.tile(np.nan, num_states)
 
-    for k in range(num_states):
-
-        # Skip over points that will be interpolated and not simulated.
-        if not is_simulated[k]:
-            continue
+    # Skip over points that will be interpolated and not simulated.
+    k = np.arange(num_states)[np.array(is_simulated, dtype=bool)]
 
-        # Extract payoffs
-        payoffs_systematic = periods_payoffs_systematic[period, k, :]
+    # Extract payoffs
+    payoffs_systematic = periods_payoffs_systematic[period, k, :]
 
-        # Simulate the expected future value.
-        emax_simulated = get_future_value(num_periods, num_draws_emax, period, k,
-            draws_emax_transformed, payoffs_systematic, edu_max, edu_start,
-            periods_emax, states_all, mapping_state_idx, delta)
+    # Simulate the expected future value.
+    emax_simulated = get_future_value(num_periods, num_draws_emax, period, k,
+        draws_emax_transformed, payoffs_systematic, edu_max, edu_start,
+        periods_emax, states_all, mapping_state_idx, delta, memory_budget,
+        is_jit, pool)
 
-        # Construct dependent variable
-        endogenous_variable[k] = emax_simulated - maxe[k]
+    # Construct dependent variable
+    endogenous_variable[k] = emax_simulated - maxe[k]
 
     # Finishing
     return endogenous_variable
@@ -385,7 +398,7 @@ def check_prediction_model(predictions_diff, model, num_points_interp, num_state
     # Check for standardization as the following constraint is not
     # necessarily satisfied in that case. For ease of application, we do not
     # ensure that the same number of interpolation points is available.
-    if not (is_debug and os.path.exists('interpolation.txt')):
+    if not (is_debug and os.path.exists(get_path('interpolation.txt'))):
         assert (model.nobs == min(num_points_interp, num_states))
 
 
@@ -429,29 +442,111 @@ def check_input(respy_obj):
 
 def get_future_value(num_periods, num_draws_emax, period, k,
         draws_emax_transformed, payoffs_systematic, edu_max, edu_start,
-        periods_emax, states_all, mapping_state_idx, delta):
-    """ Simulate expected future value.
+        periods_emax, states_all, mapping_state_idx, delta,
+        memory_budget=EMAX_MEMORY_BUDGET, is_jit=False, pool=None):
+    """ Simulate expected future value. If k is an array of states, the
+    systematic payoffs are passed for all of them and the total values are
+    evaluated for all draws at once. The states are processed in blocks to
+    respect the memory budget. The JIT-compiled kernel does not require any
+    blocks. If a pool of workers is available, the states are distributed
+    across them.
     """
-    # Calculate maximum value
-    emax_simulated = 0.0
-    for i in range(num_draws_emax):
+    # Antibugging
+    is_scalar = (np.ndim(k) == 0)
+
+    # Construct auxiliary objects
+    k = np.atleast_1d(k)
+    payoffs_systematic = np.atleast_2d(payoffs_systematic)
+    draws_emax = draws_emax_transformed[:num_draws_emax, :]
 
-        # Select draws for this draw
-        draws = draws_emax_transformed[i, :]
+    if pool is not None:
+        # The expected future values of the next period, the systematic
+        # payoffs, and the draws are exchanged through shared memory.
+        # Only the indices of the states are sent to the workers.
+        if period != (num_periods - 1):
+            pool.shared['periods_emax'][period + 1, :] = \
+                periods_emax[period + 1, :]
 
-        # Get total value of admissible states
-        total_payoffs = get_total_value(period, num_periods, delta,
-            payoffs_systematic, draws, edu_max, edu_start, mapping_state_idx,
-            periods_emax, k, states_all)
+        pool.shared['payoffs_systematic'][:k.size, :] = payoffs_systematic
+        pool.shared['draws_emax'][:, :] = draws_emax
 
-        # Determine optimal choice
-        maximum = max(total_payoffs)
+        # The memory budget is shared by all workers.
+        memory_budget = memory_budget / pool.num_slaves
 
-        # Recording expected future value
-        emax_simulated += maximum
+        tasks = []
+        for slice_ in distribute_workload(k.size, pool.num_slaves):
+            if slice_.start == slice_.stop:
+                continue
+            tasks += [(num_periods, num_draws_emax, period, k[slice_], slice_,
+                edu_max, edu_start, delta, memory_budget, is_jit)]
+
+        pool.map(_get_future_value_slave, tasks)
+
+        emax_simulated = pool.shared['emax_simulated'][:k.size].copy()
+
+    elif is_jit:
+        emax_simulated = jit_get_future_value(num_periods, num_draws_emax,
+            period, k, draws_emax, payoffs_systematic,
+            mapping_state_idx.periods_successors,
+            mapping_state_idx.periods_inadmissible, periods_emax, delta)
+
+    else:
+        block_size = get_block_size(num_draws_emax, memory_budget)
+
+        emax_simulated = np.tile(np.nan, k.size)
+
+        for start in range(0, k.size, block_size):
+
+            # Select the states of the block and add a dimension for the
+            # draws.
+            block = slice(start, start + block_size)
+
+            # Get total value of admissible states
+            total_payoffs = get_total_value(period, num_periods, delta,
+                payoffs_systematic[block, None, :], draws_emax, edu_max,
+                edu_start, mapping_state_idx, periods_emax, k[block, None],
+                states_all)
+
+            # Determine optimal choice and average over all draws
+            emax_simulated[block] = np.mean(np.max(total_payoffs, axis=2),
+                axis=1)
+
+    # Finishing
+    if is_scalar:
+        return emax_simulated[0]
+    else:
+        return emax_simulated
+
+
+def _get_future_value_slave(task):
+    """ Simulate expected future value for a share of the states. This is
+    the task of the workers, which find all other inputs in shared memory.
+    """
+    # Distribute task
+    num_periods, num_draws_emax, period, k, slice_, edu_max, edu_start, \
+        delta, memory_budget, is_jit = task
+
+    payoffs_systematic = WORKER['payoffs_systematic'][slice_, :]
+
+    # Simulate the expected future value.
+    emax_simulated = get_future_value(num_periods, num_draws_emax, period, k,
+        WORKER['draws_emax'], payoffs_systematic, edu_max, edu_start,
+        WORKER['periods_emax'], WORKER['states_all'],
+        WORKER['mapping_state_idx'], delta, memory_budget, is_jit)
+
+    # Store results
+    WORKER['emax_simulated'][slice_] = emax_simulated
+
+
+def get_block_size(num_draws_emax, memory_budget):
+    """ Determine the number of states that are processed at once. Each state
+    requires arrays of dimension (num_draws_emax, 4) and there are up to three
+    of them alive at the same time when determining the total values.
+    """
+    # Construct auxiliary objects
+    bytes_state = 3 * num_draws_emax * 4 * np.dtype('float64').itemsize
 
-    # Scaling
-    emax_simulated = emax_simulated / num_draws_emax
+    block_size = int(memory_budget * 1e6 // bytes_state)
 
     # Finishing
-    return emax_simulated
+    return max(block_size, 1)
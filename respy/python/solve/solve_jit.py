@@ -0,0 +1,117 @@
+""" This module contains the JIT-compiled kernels for the solution of the model.
+"""
+import numpy as np
+
+from respy.python.shared.shared_jit import jit_get_total_value
+from respy.python.shared.shared_constants import MISSING_INT
+from respy.python.shared.shared_jit import jit
+
+
+@jit
+def jit_create_state_space(num_periods, edu_start, edu_max):
+    """ Create grid for state space. The admissible states are counted in a
+    first pass over all candidates, which allows to allocate the container
+    exactly before collecting them in a second pass.
+    """
+    # Array for maximum number of realizations of state space by period
+    states_number_period = np.zeros(num_periods, dtype=np.int64)
+
+    for period in range(num_periods):
+        states_number_period[period] = _collect_states(period, edu_start,
+            edu_max, np.zeros((0, 4), dtype=np.int64))
+
+    # Array for possible realization of state space by period
+    max_states_period = states_number_period.max()
+
+    states_all = np.full((num_periods, max_states_period, 4), MISSING_INT,
+        dtype=np.int64)
+
+    for period in range(num_periods):
+        _collect_states(period, edu_start, edu_max, states_all[period, :, :])
+
+    # Finishing
+    return states_all, states_number_period
+
+
+@jit
+def _collect_states(period, edu_start, edu_max, states):
+    """ Collect the admissible realizations of the state space for a period.
+    The states are only recorded if the container is large enough, the number
+    of admissible states is returned in any case.
+    """
+    # Count admissible realizations of state space by period
+    k = 0
+
+    for exp_a in range(period + 1):
+
+        for exp_b in range(period + 1):
+
+            # Agent cannot attain more additional education than
+            # (EDU_MAX - EDU_START).
+            for edu in range(min(period, edu_max - edu_start) + 1):
+
+                for edu_lagged in range(2):
+
+                    # Check if lagged education admissible. (1) In the
+                    # first period all agents have lagged schooling equal
+                    # to one.
+                    if (edu_lagged == 0) and (period == 0):
+                        continue
+                    # (2) Whenever an agent has not acquired any additional
+                    # education and we are not in the first period,
+                    # then this cannot be the case.
+                    if (edu_lagged == 1) and (edu == 0) and (period > 0):
+                        continue
+                    # (3) Whenever an agent has only acquired additional
+                    # education, then edu_lagged cannot be zero.
+                    if (edu_lagged == 0) and (edu == period):
+                        continue
+
+                    # Check if admissible for time constraints
+                    if (edu + exp_a + exp_b) > period:
+                        continue
+
+                    # Collect all possible realizations of state space
+                    if k < states.shape[0]:
+                        states[k, 0] = exp_a
+                        states[k, 1] = exp_b
+                        states[k, 2] = edu
+                        states[k, 3] = edu_lagged
+
+                    # Update count
+                    k += 1
+
+    # Finishing
+    return k
+
+
+@jit
+def jit_get_future_value(num_periods, num_draws_emax, period, k,
+        draws_emax_transformed, payoffs_systematic, periods_successors,
+        periods_inadmissible, periods_emax, delta):
+    """ Simulate expected future value for an array of states. This is the
+    counterpart to get_future_value. The total values are determined for one
+    draw at a time, so there is no need for blocks of states.
+    """
+    # Initialize containers
+    emax_simulated = np.zeros(k.shape[0])
+    total_payoffs = np.zeros(4)
+
+    for i in range(k.shape[0]):
+
+        for s in range(num_draws_emax):
+
+            # Get total value of admissible states
+            jit_get_total_value(period, num_periods, delta,
+                payoffs_systematic[i, :], draws_emax_transformed[s, :],
+                periods_successors, periods_inadmissible, periods_emax, k[i],
+                total_payoffs)
+
+            # Recording expected future value
+            emax_simulated[i] += total_payoffs.max()
+
+        # Scaling
+        emax_simulated[i] = emax_simulated[i] / num_draws_emax
+
+    # Finishing
+    return emax_simulated
@@ -1,5 +1,6 @@
 import numpy as np
 
+from respy.python.shared.shared_constants import EMAX_MEMORY_BUDGET
 from respy.python.shared.shared_constants import MISSING_FLOAT
 from respy.python.solve.solve_auxiliary import pyth_calculate_payoffs_systematic
 from respy.python.solve.solve_auxiliary import pyth_create_state_space
@@ -9,19 +10,27 @@ from respy.python.record.record_solution import record_solution_progress
 
 def pyth_solve(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky,
         is_interpolated, num_draws_emax, num_periods, num_points_interp, is_myopic,
-        edu_start, is_debug, edu_max, min_idx, delta, periods_draws_emax):
-    """ Solving the model using pure PYTHON code.
+        edu_start, is_debug, edu_max, min_idx, delta, periods_draws_emax,
+        state_space=None, is_jit=False, pool=None,
+        memory_budget=EMAX_MEMORY_BUDGET):
+    """ Solving the model using pure PYTHON code. The state space only
+    depends on the time and schooling constraints. It can thus be created
+    once and passed in, which is done for all evaluations of the criterion
+    function during an estimation. The JIT-compiled kernels are used for the
+    NUMBA version. The backward induction is distributed across the pool of
+    workers, if available, and respects the memory budget in megabytes.
     """
     # Creating the state space of the model and collect the results in the
     # package class.
     record_solution_progress(1)
 
-    # Create state space
-    states_all, states_number_period, mapping_state_idx, max_states_period = \
-        pyth_create_state_space(num_periods, edu_start, edu_max, min_idx)
+    # Create state space if not provided
+    if state_space is None:
+        state_space = pyth_create_state_space(num_periods, edu_start, edu_max,
+            min_idx, is_jit)
 
-    # Cutting to size
-    states_all = states_all[:, :max(states_number_period), :]
+    states_all, states_number_period, mapping_state_idx, max_states_period = \
+        state_space
 
     record_solution_progress(-1)
 
@@ -61,7 +70,7 @@ def pyth_solve(coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky,
             periods_draws_emax, num_draws_emax, states_number_period,
             periods_payoffs_systematic, edu_max, edu_start,
             mapping_state_idx, states_all, delta, is_debug, is_interpolated,
-            num_points_interp, shocks_cholesky)
+            num_points_interp, shocks_cholesky, memory_budget, is_jit, pool)
 
         record_solution_progress(-1)
 
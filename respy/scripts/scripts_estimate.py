@@ -5,77 +5,38 @@ import argparse
 import os
 
 from respy.python.shared.shared_auxiliary import dist_class_attributes
-from respy.python.estimate.estimate_auxiliary import get_optim_paras
-from respy.python.shared.shared_auxiliary import dist_model_paras
+from respy.python.process.process_python import process
 from respy.python.shared.shared_auxiliary import get_est_info
+from respy.python.shared.shared_context import get_path
+from respy.python.interface import respy_interface
+from respy.fortran.interface import resfort_interface
 from respy import estimate
 from respy import RespyCls
 
 
 def add_gradient_information(respy_obj):
     """ This function adds information about the gradient to the information
-    files. It is not part of the estimation _modules as it breaks the design
-    and requires to carry additional attributes. This results in considerable
-    overhead, which appears justified at this point.
+    files. All perturbed evaluations of the criterion function are
+    distributed across the workers, if available. They are not recorded in
+    the estimation logs.
     """
+    paras_fixed, version = dist_class_attributes(respy_obj, 'paras_fixed',
+        'version')
 
-    model_paras, is_debug, paras_fixed, derivatives = \
-        dist_class_attributes(respy_obj, 'model_paras', 'is_debug',
-            'paras_fixed', 'derivatives')
+    data_array = process(respy_obj).as_matrix()
 
-    # Auxiliary objects
-    coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky = \
-        dist_model_paras(model_paras, is_debug)
+    if version in ['PYTHON', 'NUMBA']:
+        grad = respy_interface(respy_obj, 'gradient', data_array)
+    elif version in ['FORTRAN']:
+        grad = resfort_interface(respy_obj, 'gradient', data_array)
+    else:
+        raise NotImplementedError
 
-    # Construct starting values
-    x_all_start = get_optim_paras(coeffs_a, coeffs_b, coeffs_edu, coeffs_home,
-            shocks_cholesky, 'all', paras_fixed, is_debug)
-
-    x_free_start = get_optim_paras(coeffs_a, coeffs_b, coeffs_edu, coeffs_home,
-            shocks_cholesky, 'free', paras_fixed, is_debug)
-
-    # Construct auxiliary information
-    num_free = len(x_free_start)
-
-    # The information about the gradient is simply added to the original
-    # information later. Note that the original file is read before the
-    # gradient evaluation. This is required as the information otherwise
-    # accounts for the multiple function evaluation during the gradient
-    # approximation scheme.
-    original_lines = open('est.respy.info', 'r').readlines()
-    fmt_ = '{0:<25}{1:>15}\n'
-    original_lines[-5] = fmt_.format(*[' Number of Steps', 0])
-    original_lines[-3] = fmt_.format(*[' Number of Evaluations', num_free])
-
-    # Approximate gradient by forward finite differences.
-    grad, ei = np.zeros((num_free,), float), np.zeros((26,), float)
-    dfunc_eps = derivatives[1]
-
-    # Making sure that the criterion is only evaluated at the relevant
-    # starting values.
-    respy_obj.unlock()
-    respy_obj.set_attr('maxfun', 0)
-    respy_obj.lock()
-
-    _, f0 = estimate(respy_obj)
-
-    for k, i in enumerate(np.where(np.logical_not(paras_fixed))[0].tolist()):
-        x_baseline = x_all_start.copy()
-
-        ei[i] = 1.0
-        d = dfunc_eps * ei
-        respy_obj.update_model_paras(x_baseline + d)
-
-        _, f1 = estimate(respy_obj)
-
-        grad[k] = (f1 - f0) / d[k]
-        ei[i] = 0.0
-
-    grad = np.random.uniform(0, 1, 26 - sum(paras_fixed)).tolist()
+    grad = grad.tolist()
     norm = np.amax(np.abs(grad))
 
     # Write out extended information
-    with open('est.respy.info', 'a') as out_file:
+    with open(get_path('est.respy.info'), 'a') as out_file:
         # Insert information about gradient
         out_file.write('\n\n\n\n Gradient\n\n')
         fmt_ = '{0:>15}    {1:>15}\n\n'
@@ -109,11 +70,14 @@ def dist_input_arguments(parser):
     gradient = args.gradient
     resume = args.resume
     single = args.single
+    cache = args.cache
 
     # Check attributes
     assert (single in [True, False])
     assert (resume in [False, True])
     assert (os.path.exists(init_file))
+    assert (isinstance(cache, int))
+    assert (cache >= 0)
 
     if gradient:
         # The gradient information is only provided if a single function
@@ -124,10 +88,10 @@ def dist_input_arguments(parser):
         assert (os.path.exists('est.respy.info'))
 
     # Finishing
-    return resume, single, init_file, gradient
+    return resume, single, init_file, gradient, cache
 
 
-def scripts_estimate(resume, single, init_file, gradient):
+def scripts_estimate(resume, single, init_file, gradient, cache=0):
     """ Wrapper for the estimation.
     """
     # Read in baseline model specification.
@@ -138,6 +102,18 @@ def scripts_estimate(resume, single, init_file, gradient):
     if resume:
         respy_obj.update_model_paras(get_est_info()['paras_step'])
 
+    # The cache of the criterion function is stored alongside the estimation
+    # logs. It is only reused when resuming a previous estimation run. It is
+    # not available for the FORTRAN version.
+    if cache > 0:
+        fname = get_path('est.respy.cache')
+        if (not resume) and os.path.exists(fname):
+            os.unlink(fname)
+
+        respy_obj.unlock()
+        respy_obj.set_attr('cache', [cache, fname])
+        respy_obj.lock()
+
     # Set maximum iteration count when only an evaluation of the criterion
     # function is requested.
     if single:
@@ -169,6 +145,9 @@ if __name__ == '__main__':
     parser.add_argument('--gradient', action='store_true', dest='gradient',
         default=False, help='gradient information')
 
+    parser.add_argument('--cache', action='store', dest='cache', type=int,
+        default=0, help='size of cache for criterion function')
+
     # Process command line arguments
     args = dist_input_arguments(parser)
 
@@ -1,10 +1,10 @@
 #!/usr/bin/env python
 
-import pickle as pkl
 import argparse
 import os
 
 from respy.python.shared.shared_auxiliary import get_est_info
+from respy.python.shared.shared_store import load_solution
 from respy import simulate
 from respy import RespyCls
 
@@ -29,8 +29,7 @@ def dist_input_arguments(parser):
         assert (os.path.exists('est.respy.info'))
 
     if solved is not None:
-        assert (os.path.exists(solved))
-        assert (update is False)
+        assert (os.path.isdir(solved))
 
     # Finishing
     return update, init_file, file_sim, solved
@@ -40,16 +39,18 @@ def scripts_simulate(update, init_file, file_sim, solved):
     """ Wrapper for the estimation.
     """
     # Read in baseline model specification.
-    if solved is not None:
-        respy_obj = pkl.load(open(solved, 'rb'))
-    else:
-        respy_obj = RespyCls(init_file)
+    respy_obj = RespyCls(init_file)
 
     # Update parametrization of the model if resuming from a previous
     # estimation run.
     if update:
         respy_obj.update_model_paras(get_est_info()['paras_step'])
 
+    # Attach the solution from the store if it is available for the current
+    # parametrization. Otherwise, the model is solved again.
+    if solved is not None:
+        respy_obj = load_solution(respy_obj, solved)
+
     # Update file for output.
     if file_sim is not None:
         respy_obj.unlock()
@@ -76,7 +77,7 @@ if __name__ == '__main__':
         default=None, help='output file')
 
     parser.add_argument('--solved', action='store', dest='solved',
-        default=None, help='use solved class instance')
+        default=None, help='use store of solutions')
 
     # Process command line arguments
     args = dist_input_arguments(parser)
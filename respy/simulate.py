@@ -3,10 +3,16 @@ import os
 
 from respy.python.shared.shared_auxiliary import replace_missing_values
 from respy.python.shared.shared_auxiliary import dist_class_attributes
+from respy.python.shared.shared_auxiliary import get_solution_hash
 from respy.python.shared.shared_auxiliary import add_solution
 from respy.python.simulate.simulate_auxiliary import write_info
+from respy.python.simulate.simulate_auxiliary import write_out_chunks
 from respy.python.simulate.simulate_auxiliary import write_out
 from respy.python.shared.shared_auxiliary import check_dataset
+from respy.python.record.record_solution import record_solution_progress
+from respy.python.shared.shared_store import store_solution
+from respy.python.shared.shared_context import get_path
+from respy.python.shared.shared_store import load_solution
 from respy.fortran.interface import resfort_interface
 from respy.python.interface import respy_interface
 
@@ -17,16 +23,44 @@ def simulate(respy_obj):
     """
     # Cleanup
     for fname in ['sim.respy.log', 'sol.respy.log']:
-        if os.path.exists(fname):
-            os.unlink(fname)
+        if os.path.exists(get_path(fname)):
+            os.unlink(get_path(fname))
 
     # Distribute class attributes
-    is_debug, version, num_agents_sim, is_store = \
+    is_debug, version, num_agents_sim, is_store, chunk_sim = \
         dist_class_attributes(respy_obj, 'is_debug', 'version',
-                'num_agents_sim', 'is_store')
+                'num_agents_sim', 'is_store', 'chunk_sim')
+
+    # The solution attached to the class instance is only used if it is up to
+    # date. Otherwise, it is removed and the model is solved again.
+    is_solved = respy_obj.get_attr('is_solved')
+
+    if is_solved:
+        if respy_obj.get_attr('solution_hash') != get_solution_hash(respy_obj):
+            respy_obj.unlock()
+            respy_obj.reset()
+            respy_obj.lock()
+
+            is_solved = False
+
+        else:
+            # The log records that the attached solution is used instead.
+            record_solution_progress(6)
+
+    # The store of solutions doubles as a cache, so the model is not solved
+    # again if its solution is already available.
+    if is_store and (not is_solved):
+        respy_obj = load_solution(respy_obj, get_path('solution.respy'))
+        is_solved = respy_obj.get_attr('is_solved')
+
+        # The log records where the solution is taken from instead.
+        if is_solved:
+            path = os.path.join(get_path('solution.respy'),
+                respy_obj.get_attr('solution_hash'))
+            record_solution_progress(5, path=os.path.abspath(path))
 
     # Select appropriate interface
-    if version in ['PYTHON']:
+    if version in ['PYTHON', 'NUMBA']:
         solution, data_array = respy_interface(respy_obj, 'simulate')
     elif version in ['FORTRAN']:
         solution, data_array = resfort_interface(respy_obj, 'simulate')
@@ -34,27 +68,32 @@ def simulate(respy_obj):
         raise NotImplementedError
 
     # Attach solution to class instance
-    respy_obj = add_solution(respy_obj, *solution)
+    if not is_solved:
+        respy_obj = add_solution(respy_obj, *solution)
 
-    respy_obj.unlock()
-    respy_obj.set_attr('is_solved', True)
-    respy_obj.lock()
-
-    # Store object to file
+    # Add solution to the store
     if is_store:
-        respy_obj.store('solution.respy.pkl')
-
-    # Create pandas data frame with missing values.
-    data_frame = pd.DataFrame(replace_missing_values(data_array))
+        store_solution(respy_obj, get_path('solution.respy'))
 
     # Wrapping up by running some checks on the dataset and then writing out
-    # the file and some basic information.
-    if is_debug:
-        check_dataset(data_frame, respy_obj, 'sim')
+    # the file and some basic information. The sample is written out as it is
+    # simulated if requested, the draws are then stored on disk.
+    if chunk_sim > 0:
+        write_out_chunks(respy_obj, data_array)
+
+        if os.path.exists(get_path('.draws_sims.respy.dat')):
+            os.unlink(get_path('.draws_sims.respy.dat'))
+
+    else:
+        # Create pandas data frame with missing values.
+        data_frame = pd.DataFrame(replace_missing_values(data_array))
+
+        if is_debug:
+            check_dataset(data_frame, respy_obj, 'sim')
 
-    write_out(respy_obj, data_frame)
+        write_out(respy_obj, data_frame)
 
-    write_info(respy_obj, data_frame)
+        write_info(respy_obj, data_frame)
 
     # Finishing
     return respy_obj
@@ -5,13 +5,15 @@ import numpy as np
 from respy.python.shared.shared_auxiliary import print_init_dict
 from respy.python.shared.shared_constants import IS_PARALLEL
 from respy.python.shared.shared_constants import IS_FORTRAN
+from respy.python.shared.shared_constants import IS_NUMBA
 
 # module-wide variables
 MAX_AGENTS = 1000
 MAX_DRAWS = 100
 MAX_PERIODS = 5
 
-OPTIMIZERS = ['SCIPY-BFGS', 'SCIPY-POWELL', 'FORT-NEWUOA', 'FORT-BFGS']
+OPTIMIZERS = ['SCIPY-BFGS', 'SCIPY-POWELL', 'PYTH-BHHH', 'FORT-NEWUOA',
+    'FORT-BFGS']
 
 
 def generate_init(constraints=None):
@@ -100,7 +102,8 @@ def generate_random_dict(constraints=None):
 
     # DERIVATIVES
     dict_['DERIVATIVES'] = dict()
-    dict_['DERIVATIVES']['version'] = 'FORWARD-DIFFERENCES'
+    dict_['DERIVATIVES']['version'] = np.random.choice(['FORWARD-DIFFERENCES',
+        'CENTRAL-DIFFERENCES'])
     dict_['DERIVATIVES']['eps'] = np.random.uniform(0.0000001, 0.1)
 
     # SCALING
@@ -112,19 +115,21 @@ def generate_random_dict(constraints=None):
     dict_['PARALLELISM'] = dict()
     dict_['PARALLELISM']['procs'] = np.random.randint(2, 5)
 
-    # Parallelism is only supported in FORTRAN implementation.
-    if IS_PARALLEL:
-        dict_['PARALLELISM']['flag'] = np.random.choice([True, False])
-    else:
-        dict_['PARALLELISM']['flag'] = False
+    # Parallelism is supported by all versions. However, the FORTRAN
+    # implementation requires the parallel executables.
+    dict_['PARALLELISM']['flag'] = np.random.choice([True, False])
 
     versions = ['FORTRAN', 'PYTHON']
-    if dict_['PARALLELISM']['flag']:
-        versions = ['FORTRAN']
+    if dict_['PARALLELISM']['flag'] and not IS_PARALLEL:
+        versions = ['PYTHON']
 
     if not IS_FORTRAN:
         versions = ['PYTHON']
 
+    # The NUMBA version is only available if the JIT compiler is installed.
+    if IS_NUMBA:
+        versions += ['NUMBA']
+
     # PROGRAM
     dict_['PROGRAM'] = dict()
     dict_['PROGRAM']['debug'] = 'True'
@@ -137,7 +142,7 @@ def generate_random_dict(constraints=None):
             'FORT-BFGS'])
     else:
         dict_['ESTIMATION']['optimizer'] = np.random.choice(['SCIPY-BFGS',
-            'SCIPY-POWELL'])
+            'SCIPY-POWELL', 'PYTH-BHHH'])
 
     # SIMULATION
     dict_['SIMULATION'] = dict()
@@ -170,6 +175,11 @@ def generate_random_dict(constraints=None):
     dict_['SCIPY-POWELL']['maxfun'] = np.random.randint(1, 100)
     dict_['SCIPY-POWELL']['maxiter'] = np.random.randint(1, 100)
 
+    # PYTH-BHHH
+    dict_['PYTH-BHHH'] = dict()
+    dict_['PYTH-BHHH']['gtol'] = np.random.uniform(0.0000001, 0.1)
+    dict_['PYTH-BHHH']['maxiter'] = np.random.randint(1, 10)
+
     # FORT-NEWUOA
     rhobeg = np.random.uniform(0.0000001, 0.1)
 
@@ -206,7 +216,8 @@ def generate_random_dict(constraints=None):
 
     if ('flag_parallelism' in keys) and ('version' in keys) and constraints[
         'flag_parallelism']:
-            assert constraints['version'] == 'FORTRAN'
+            if constraints['version'] == 'FORTRAN':
+                assert IS_PARALLEL
 
     # Replace interpolation
     if 'flag_interpolation' in constraints.keys():
@@ -253,16 +264,16 @@ def generate_random_dict(constraints=None):
         # Extract objects
         version = constraints['version']
         # Checks
-        assert (version in ['PYTHON', 'FORTRAN'])
+        assert (version in ['PYTHON', 'FORTRAN', 'NUMBA'])
         # Replace in initialization file
         dict_['PROGRAM']['version'] = version
         # Ensure that the constraints are met
-        if version != 'FORTRAN':
+        if (version == 'FORTRAN') and (not IS_PARALLEL):
             dict_['PARALLELISM']['flag'] = False
         if version == 'FORTRAN':
             dict_['ESTIMATION']['optimizer'] = np.random.choice(['FORT-NEWUOA', 'FORT-BFGS'])
         else:
-            dict_['ESTIMATION']['optimizer'] = np.random.choice(['SCIPY-BFGS', 'SCIPY-POWELL'])
+            dict_['ESTIMATION']['optimizer'] = np.random.choice(['SCIPY-BFGS', 'SCIPY-POWELL', 'PYTH-BHHH'])
 
     # Ensure that random deviates do not exceed a certain number. This is
     # useful when aligning the randomness across implementations.
@@ -288,8 +299,11 @@ def generate_random_dict(constraints=None):
         # Replace in initialization file
         dict_['PARALLELISM']['flag'] = flag_parallelism
         # Ensure that the constraints are met
-        if dict_['PARALLELISM']['flag']:
-            dict_['PROGRAM']['version'] = 'FORTRAN'
+        if dict_['PARALLELISM']['flag'] and (not IS_PARALLEL):
+            if dict_['PROGRAM']['version'] == 'FORTRAN':
+                dict_['PROGRAM']['version'] = 'PYTHON'
+                dict_['ESTIMATION']['optimizer'] = np.random.choice([
+                    'SCIPY-BFGS', 'SCIPY-POWELL', 'PYTH-BHHH'])
 
     # Replace parallelism ...
     if 'flag_scaling' in constraints.keys():
@@ -127,6 +127,10 @@ class TestClass(object):
                 fort_debug.f2py_create_state_space(*args)
             py_a, py_b, py_c, py_d = pyth_create_state_space(*args)
 
+            # The FORTRAN containers are of fixed size, while the PYTHON
+            # containers are allocated to the maximum number of states.
+            fort_a = fort_a[:, :fort_d, :]
+
             # Ensure equivalence
             for obj in [[fort_a, py_a], [fort_b, py_b], [fort_c, py_c], [fort_d, py_d]]:
                 np.testing.assert_allclose(obj[0], obj[1])
@@ -264,16 +268,14 @@ class TestClass(object):
         args = (num_periods, edu_start, edu_max, min_idx)
         pyth = pyth_create_state_space(*args)
         f2py = fort_debug.f2py_create_state_space(*args)
-        for i in range(4):
+        np.testing.assert_allclose(pyth[0], f2py[0][:, :f2py[3], :])
+        for i in range(1, 4):
             np.testing.assert_allclose(pyth[i], f2py[i])
 
         # Carry some results from the state space creation for future use.
         states_all, states_number_period = pyth[:2]
         mapping_state_idx, max_states_period = pyth[2:]
 
-        # Cutting to size
-        states_all = states_all[:, :max(states_number_period), :]
-
         # Check calculation of systematic components of payoffs.
         args = (num_periods, states_number_period, states_all, edu_start,
             coeffs_a, coeffs_b, coeffs_edu, coeffs_home, max_states_period)
@@ -425,7 +427,8 @@ class TestClass(object):
 
         # Get the IS_SIMULATED indicator for the subset of points which are
         # used for the predication model.
-        args = (num_points_interp, num_states, period, is_debug)
+        args = (num_points_interp, num_states, period, is_debug,
+            np.random.RandomState(np.random.randint(1, 10000)))
         is_simulated = get_simulated_indicator(*args)
 
         # Construct the exogenous variables for all points of the state
@@ -511,7 +514,7 @@ class TestClass(object):
         # grid to disk which is used for both functions.
         base_args = (num_points_interp, num_states, period, is_debug)
         args = base_args
-        py = get_simulated_indicator(*args)
+        py = get_simulated_indicator(*args + (np.random.RandomState(1), ))
         args = base_args + (num_periods, )
         f90 = fort_debug.wrapper_get_simulated_indicator(*args)
         np.testing.assert_array_equal(f90, 1*py)
@@ -2,13 +2,23 @@ from pandas.util.testing import assert_frame_equal
 
 import numpy as np
 import pandas as pd
+import threading
 import pytest
+import os
 
 from respy.scripts.scripts_estimate import scripts_estimate
 from respy.scripts.scripts_simulate import scripts_simulate
 from respy.scripts.scripts_update import scripts_update
 from respy.scripts.scripts_modify import scripts_modify
+from respy.python.estimate.estimate_auxiliary import get_optim_paras
+from respy.python.shared.shared_auxiliary import dist_class_attributes
+from respy.python.shared.shared_store import load_solution
+from respy.python.shared.shared_auxiliary import dist_model_paras
 from respy.python.process.process_python import process
+from respy.python.shared.shared_constants import IS_FORTRAN
+from respy.python.shared.shared_constants import IS_NUMBA
+from respy import estimate_multistart
+from respy import run_context
 from respy import estimate
 from respy import simulate
 from respy import RespyCls
@@ -193,7 +203,12 @@ class TestClass(object):
             identifiers = np.random.choice(set_, num_draws, replace=False)
             values = np.random.uniform(size=num_draws)
 
-            scripts_estimate(resume, single, init_file, gradient)
+            # The cache is not available for the FORTRAN version.
+            cache = 0
+            if RespyCls(init_file).get_attr('version') != 'FORTRAN':
+                cache = int(np.random.choice([0, 10]))
+
+            scripts_estimate(resume, single, init_file, gradient, cache)
             scripts_update(init_file)
 
             # The error can occur as the RESPY package is actually running an
@@ -221,3 +236,343 @@ class TestClass(object):
         respy_obj = RespyCls('test.respy.ini')
         simulate(respy_obj)
         estimate(respy_obj)
+
+    def test_7(self):
+        """ This test ensures that the cache of the criterion function does not
+        change the course of an estimation, also when it is restored from a
+        previous run.
+        """
+        constr = dict()
+        constr['version'] = np.random.choice(['PYTHON', 'NUMBA'] if IS_NUMBA
+            else ['PYTHON'])
+        constr['maxfun'] = np.random.randint(1, 20)
+
+        generate_init(constr)
+
+        respy_obj = RespyCls('test.respy.ini')
+        simulate(respy_obj)
+
+        base_est_log = None
+
+        for cache in [[0, None], [100, 'est.respy.cache'],
+                [100, 'est.respy.cache']]:
+
+            respy_obj.unlock()
+            respy_obj.set_attr('cache', cache)
+            respy_obj.lock()
+
+            estimate(respy_obj)
+
+            with open('est.respy.log') as in_file:
+                est_log = [line for line in in_file.readlines() if not
+                    line.strip().startswith(('Date', 'Time'))]
+
+            if base_est_log is None:
+                base_est_log = est_log
+            assert est_log == base_est_log
+
+    def test_8(self):
+        """ This test ensures that the estimation from multiple starting values
+        aligns with the separate estimation of each start.
+        """
+        constr = dict()
+        constr['version'] = np.random.choice(['PYTHON', 'NUMBA'] if IS_NUMBA
+            else ['PYTHON'])
+        constr['maxfun'] = np.random.randint(1, 10)
+
+        generate_init(constr)
+
+        respy_obj = RespyCls('test.respy.ini')
+        simulate(respy_obj)
+
+        # Perturb the starting values of the coefficients.
+        model_paras = respy_obj.get_attr('model_paras')
+        paras_fixed = respy_obj.get_attr('paras_fixed')
+
+        coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky = \
+            dist_model_paras(model_paras, True)
+
+        x_all_start = get_optim_paras(coeffs_a, coeffs_b, coeffs_edu,
+            coeffs_home, shocks_cholesky, 'all', paras_fixed, True)
+
+        num_starts = np.random.randint(1, 4)
+        starts = np.tile(x_all_start, (num_starts, 1))
+        starts[:, :16] += np.random.uniform(-0.01, 0.01, (num_starts, 16))
+
+        num_workers = np.random.randint(1, 3)
+        table = estimate_multistart(respy_obj, starts, num_workers)
+
+        assert not np.any(table['Dominated'])
+
+        for i in range(num_starts):
+            respy_obj.unlock()
+            respy_obj.update_model_paras(starts[i, :])
+            respy_obj.lock()
+
+            _, crit_val = estimate(respy_obj)
+
+            np.testing.assert_equal(table['Criterion'][i], crit_val)
+
+        # The FORTRAN version does not stop dominated starts early.
+        respy_obj.unlock()
+        respy_obj.set_attr('version', 'FORTRAN')
+        respy_obj.lock()
+
+        with pytest.raises(AssertionError):
+            estimate_multistart(respy_obj, starts, num_workers, margin=1.0)
+
+    def test_9(self):
+        """ This test ensures that concurrent estimations in separate run
+        contexts do not collide.
+        """
+        versions = ['PYTHON']
+        if IS_NUMBA:
+            versions += ['NUMBA']
+        if IS_FORTRAN:
+            versions += ['FORTRAN']
+
+        constr = dict()
+        constr['version'] = np.random.choice(versions)
+        constr['flag_parallelism'] = False
+        constr['maxfun'] = np.random.randint(0, 5)
+
+        generate_init(constr)
+
+        respy_obj = RespyCls('test.respy.ini')
+        simulate(respy_obj)
+
+        _, base_val = estimate(respy_obj)
+
+        rslts = dict()
+
+        def _estimate(i):
+            with run_context('run_' + str(i)):
+                rslts[i] = estimate(respy_obj)[1]
+
+        threads = []
+        for i in range(3):
+            threads += [threading.Thread(target=_estimate, args=(i,))]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        for i in range(3):
+            np.testing.assert_equal(rslts[i], base_val)
+            assert os.path.exists('run_' + str(i) + '/est.respy.log')
+
+    def test_10(self):
+        """ This test ensures that the simulation in chunks results in the same
+        sample and information about the simulated economy.
+        """
+        constr = dict()
+        constr['version'] = np.random.choice(['PYTHON', 'NUMBA'] if IS_NUMBA
+            else ['PYTHON'])
+
+        generate_init(constr)
+
+        base_data, base_info = None, None
+
+        for is_chunked in [False, True]:
+
+            respy_obj = RespyCls('test.respy.ini')
+
+            file_sim, num_agents_sim = dist_class_attributes(respy_obj,
+                'file_sim', 'num_agents_sim')
+
+            # The checks of the dataset are only run in debug mode. In the
+            # case of chunks, each one is checked on its own.
+            respy_obj.unlock()
+            respy_obj.set_attr('is_debug', True)
+            if is_chunked:
+                respy_obj.set_attr('chunk_sim',
+                    int(np.random.randint(1, num_agents_sim + 5)))
+            respy_obj.lock()
+
+            simulate(respy_obj)
+
+            data_frame = pd.read_csv(file_sim, delim_whitespace=True,
+                header=-1, na_values='.')
+            info = open('data.respy.info').read()
+
+            if base_data is None:
+                base_data, base_info = data_frame, info
+
+            assert_frame_equal(data_frame, base_data)
+            assert info == base_info
+
+    def test_11(self):
+        """ This test ensures that the datasets in the binary format align with
+        the ones in the text format.
+        """
+        constr = dict()
+        constr['maxfun'] = 0
+
+        generate_init(constr)
+
+        base_frame = None
+
+        for fname in ['data.respy.dat', 'data.respy.npy']:
+
+            respy_obj = RespyCls('test.respy.ini')
+
+            respy_obj.unlock()
+            respy_obj.set_attr('file_sim', fname)
+            respy_obj.set_attr('file_est', fname)
+            respy_obj.lock()
+
+            simulate(respy_obj)
+
+            data_frame = process(respy_obj)
+            estimate(respy_obj)
+
+            if base_frame is None:
+                base_frame = data_frame
+
+            # The wages are only stored in full precision in the binary
+            # format.
+            assert data_frame.dtypes.equals(base_frame.dtypes)
+            assert_frame_equal(data_frame.drop(3, axis=1),
+                base_frame.drop(3, axis=1))
+            np.testing.assert_allclose(data_frame[3], base_frame[3],
+                atol=0.005)
+
+    def test_12(self):
+        """ This test ensures that the simulation from an up-to-date solution
+        aligns with the simulation from scratch, while an outdated solution is
+        replaced.
+        """
+        versions = ['PYTHON']
+        if IS_NUMBA:
+            versions += ['NUMBA']
+        if IS_FORTRAN:
+            versions += ['FORTRAN']
+
+        constr = dict()
+        constr['version'] = np.random.choice(versions)
+        constr['flag_parallelism'] = False
+
+        generate_init(constr)
+
+        respy_obj = RespyCls('test.respy.ini')
+        simulate(respy_obj)
+
+        periods_emax = respy_obj.get_attr('periods_emax')
+
+        for label, value in [('seed_sim', np.random.randint(1, 10000)),
+                ('delta', np.random.uniform(0.01, 0.99))]:
+
+            respy_obj.unlock()
+            respy_obj.set_attr(label, value)
+            respy_obj.lock()
+
+            simulate(respy_obj)
+            data_frame = process(respy_obj)
+
+            # The solution is only replaced if it is outdated.
+            is_replaced = (respy_obj.get_attr('periods_emax') is not
+                periods_emax)
+            assert is_replaced == (label == 'delta')
+
+            sol_log = open('sol.respy.log').read()
+            assert ('up to date' not in sol_log) == is_replaced
+
+            base_obj = RespyCls('test.respy.ini')
+            base_obj.unlock()
+            base_obj.set_attr('seed_sim', respy_obj.get_attr('seed_sim'))
+            base_obj.set_attr('delta', respy_obj.get_attr('delta'))
+            base_obj.lock()
+
+            simulate(base_obj)
+
+            assert respy_obj.check_equal_solution(base_obj)
+            assert_frame_equal(process(base_obj), data_frame)
+
+    def test_13(self):
+        """ This test ensures that the solution from the store aligns with
+        the original one and that the model is not solved again.
+        """
+        versions = ['PYTHON']
+        if IS_NUMBA:
+            versions += ['NUMBA']
+        if IS_FORTRAN:
+            versions += ['FORTRAN']
+
+        constr = dict()
+        constr['version'] = np.random.choice(versions)
+        constr['flag_parallelism'] = False
+
+        generate_init(constr)
+
+        respy_obj = RespyCls('test.respy.ini')
+        respy_obj.unlock()
+        respy_obj.set_attr('is_store', True)
+        respy_obj.lock()
+
+        simulate(respy_obj)
+        data_frame = process(respy_obj)
+
+        assert len(os.listdir('solution.respy')) == 1
+
+        # The solution is readable for all users of the store.
+        for dirname in os.listdir('solution.respy'):
+            mode = os.stat(os.path.join('solution.respy', dirname)).st_mode
+            assert (mode == os.stat('solution.respy').st_mode)
+
+        # The store is also available to the simulation script.
+        base_obj = RespyCls('test.respy.ini')
+        base_obj = load_solution(base_obj, 'solution.respy')
+
+        assert respy_obj.check_equal_solution(base_obj)
+
+        scripts_simulate(False, 'test.respy.ini', None, 'solution.respy')
+        assert_frame_equal(process(respy_obj), data_frame)
+
+        # The store doubles as a cache, so the model is not solved again.
+        # Instead, the log records the solution from the store.
+        base_obj = RespyCls('test.respy.ini')
+        base_obj.unlock()
+        base_obj.set_attr('is_store', True)
+        base_obj.lock()
+
+        simulate(base_obj)
+
+        path = os.path.abspath(os.path.join('solution.respy',
+            base_obj.get_attr('solution_hash')))
+        assert ('Solution loaded from ' + path) in open('sol.respy.log').read()
+        assert respy_obj.check_equal_solution(base_obj)
+        assert_frame_equal(process(base_obj), data_frame)
+
+    def test_14(self):
+        """ This test ensures that the memory budget has no effect on the
+        solution and the value of the criterion function.
+        """
+        constr = dict()
+        constr['version'] = np.random.choice(['PYTHON', 'NUMBA'] if IS_NUMBA
+            else ['PYTHON'])
+        constr['maxfun'] = 0
+
+        generate_init(constr)
+
+        base_emax, base_val = None, None
+
+        for memory_budget in [256, 1e-6, np.random.uniform(0.001, 0.1)]:
+
+            respy_obj = RespyCls('test.respy.ini')
+
+            respy_obj.unlock()
+            respy_obj.set_attr('memory_budget', memory_budget)
+            respy_obj.lock()
+
+            simulate(respy_obj)
+            periods_emax = respy_obj.get_attr('periods_emax')
+
+            _, crit_val = estimate(respy_obj)
+
+            if base_val is None:
+                base_emax, base_val = periods_emax, crit_val
+
+            np.testing.assert_equal(periods_emax, base_emax)
+            np.testing.assert_equal(crit_val, base_val)
@@ -1,3 +1,4 @@
+import multiprocessing
 import numpy as np
 import pytest
 
@@ -6,16 +7,26 @@ from codes.auxiliary import compare_est_log
 
 from respy.python.shared.shared_auxiliary import print_init_dict
 from respy.python.shared.shared_constants import IS_PARALLEL
+from respy.python.shared.shared_constants import IS_NUMBA
+from respy.python.process.process_python import process
+from respy.python.estimate.estimate_auxiliary import get_optim_paras
+from respy.python.shared.shared_auxiliary import dist_model_paras
+from respy.fortran.interface import resfort_interface
+from respy.python.interface import respy_interface
 from respy import estimate
 from respy import simulate
 from respy import RespyCls
 
+# The NUMBA version is part of the comparisons if the JIT compiler is
+# available.
+VERSIONS_JIT = ['NUMBA'] if IS_NUMBA else []
+
 
-@pytest.mark.skipif(not IS_PARALLEL, reason='No PARALLELISM available')
 @pytest.mark.usefixtures('fresh_directory', 'set_seed')
 class TestClass(object):
     """ This class groups together some tests.
     """
+    @pytest.mark.skipif(not IS_PARALLEL, reason='No PARALLELISM available')
     def test_1(self):
         """ This test ensures that it makes no difference whether the
         criterion function is evaluated in parallel or not.
@@ -40,6 +51,7 @@ class TestClass(object):
                 base = crit_val
             np.testing.assert_equal(base, crit_val)
 
+    @pytest.mark.skipif(not IS_PARALLEL, reason='No PARALLELISM available')
     def test_2(self):
         """ This test ensures that the record files are identical.
         """
@@ -78,3 +90,207 @@ class TestClass(object):
             if base_est_log is None:
                 base_est_log = open('est.respy.log', 'r').readlines()
             compare_est_log(base_est_log)
+
+    def test_3(self):
+        """ This test ensures that the results and the records of the PYTHON
+        and NUMBA versions are identical whether the backward induction and
+        the evaluation of the likelihood contributions are distributed across
+        the pool of workers or not.
+        """
+        constr = dict()
+        constr['version'] = np.random.choice(['PYTHON'] + VERSIONS_JIT)
+        constr['periods'] = np.random.randint(3, 8)
+        constr['maxfun'] = 0
+
+        init_dict = generate_random_dict(constr)
+
+        base_emax, base_val, base_sol_log = None, None, None
+        for is_parallel in [False, True]:
+
+            init_dict['PARALLELISM']['flag'] = is_parallel
+            print_init_dict(init_dict)
+
+            respy_obj = RespyCls('test.respy.ini')
+
+            respy_obj = simulate(respy_obj)
+            periods_emax = respy_obj.get_attr('periods_emax')
+
+            _, crit_val = estimate(respy_obj)
+
+            if base_emax is None:
+                base_emax = periods_emax
+            np.testing.assert_equal(base_emax, periods_emax)
+
+            if base_val is None:
+                base_val = crit_val
+            np.testing.assert_equal(base_val, crit_val)
+
+            if base_sol_log is None:
+                base_sol_log = open('sol.respy.log', 'r').read()
+            assert open('sol.respy.log', 'r').read() == base_sol_log
+
+    def test_4(self):
+        """ This test ensures that the approximation of the gradient and the
+        records of a gradient-based estimation are identical whether the
+        perturbed evaluations are distributed across the pool of workers or
+        not.
+        """
+        constr = dict()
+        constr['version'] = np.random.choice(['PYTHON'] + VERSIONS_JIT)
+        constr['periods'] = np.random.randint(3, 6)
+        constr['maxfun'] = np.random.randint(1, 30)
+
+        init_dict = generate_random_dict(constr)
+        init_dict['ESTIMATION']['optimizer'] = np.random.choice(['SCIPY-BFGS',
+            'PYTH-BHHH'])
+
+        base_grad, base_est_log = None, None
+        for is_parallel in [False, True]:
+
+            init_dict['PARALLELISM']['flag'] = is_parallel
+            print_init_dict(init_dict)
+
+            respy_obj = RespyCls('test.respy.ini')
+
+            simulate(respy_obj)
+
+            data_array = process(respy_obj).as_matrix()
+
+            sol_log = open('sol.respy.log', 'r').read()
+            grad = respy_interface(respy_obj, 'gradient', data_array)
+
+            # The workers leave the log of the solution to the master.
+            if is_parallel:
+                assert open('sol.respy.log', 'r').read() == sol_log
+
+            if base_grad is None:
+                base_grad = grad
+            np.testing.assert_equal(base_grad, grad)
+
+            estimate(respy_obj)
+
+            # The records are identical except for the time stamps.
+            est_log = [line for line in open('est.respy.log', 'r').readlines()
+                if line.split()[:1] not in [['Date'], ['Time']]]
+
+            if base_est_log is None:
+                base_est_log = est_log
+            assert est_log == base_est_log
+
+    def test_5(self):
+        """ This test ensures that the pool of workers is shut down if a
+        request fails.
+        """
+        constr = dict()
+        constr['version'] = np.random.choice(['PYTHON'] + VERSIONS_JIT)
+        constr['maxfun'] = np.random.randint(1, 30)
+
+        init_dict = generate_random_dict(constr)
+        init_dict['PARALLELISM']['flag'] = True
+        print_init_dict(init_dict)
+
+        respy_obj = RespyCls('test.respy.ini')
+
+        simulate(respy_obj)
+
+        data_array = process(respy_obj).as_matrix()
+
+        # The selected optimizer is checked before any workers are started.
+        # Otherwise, the request fails once the workers are available.
+        respy_obj.unlock()
+        respy_obj.set_attr('optimizer_used', 'FORT-BFGS')
+        respy_obj.lock()
+
+        with pytest.raises(AssertionError):
+            respy_interface(respy_obj, 'estimate', data_array)
+
+        assert multiprocessing.active_children() == []
+
+        with pytest.raises(IndexError):
+            respy_interface(respy_obj, 'batch', data_array, np.zeros(3))
+
+        assert multiprocessing.active_children() == []
+
+    def test_6(self):
+        """ This test ensures that the approximation of the gradient is
+        identical whether the perturbed evaluations are distributed across
+        the pool of workers or not, also if the expected future values are
+        interpolated.
+        """
+        constr = dict()
+        constr['version'] = np.random.choice(['PYTHON'] + VERSIONS_JIT)
+        constr['periods'] = np.random.randint(5, 8)
+        constr['flag_interpolation'] = True
+        constr['points'] = np.random.randint(10, 20)
+        constr['maxfun'] = 0
+
+        init_dict = generate_random_dict(constr)
+
+        base_grad = None
+        for is_parallel in [False, True]:
+
+            init_dict['PARALLELISM']['flag'] = is_parallel
+            print_init_dict(init_dict)
+
+            respy_obj = RespyCls('test.respy.ini')
+
+            simulate(respy_obj)
+
+            data_array = process(respy_obj).as_matrix()
+
+            grad = respy_interface(respy_obj, 'gradient', data_array)
+
+            if base_grad is None:
+                base_grad = grad
+            np.testing.assert_equal(base_grad, grad)
+
+    @pytest.mark.skipif(not IS_PARALLEL, reason='No PARALLELISM available')
+    def test_7(self):
+        """ This test ensures that the evaluation of a batch of parameter
+        vectors and the approximation of the gradient by the FORTRAN version
+        are identical whether the MPI slaves are used or not.
+        """
+        constr = dict()
+        constr['version'] = 'FORTRAN'
+        constr['maxfun'] = 0
+
+        init_dict = generate_random_dict(constr)
+
+        base_crit_vals, base_grad, x_batch = None, None, None
+        for is_parallel in [False, True]:
+
+            init_dict['PARALLELISM']['flag'] = is_parallel
+            print_init_dict(init_dict)
+
+            respy_obj = RespyCls('test.respy.ini')
+
+            simulate(respy_obj)
+
+            data_array = process(respy_obj).as_matrix()
+
+            if x_batch is None:
+                model_paras = respy_obj.get_attr('model_paras')
+                paras_fixed = respy_obj.get_attr('paras_fixed')
+
+                coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky \
+                    = dist_model_paras(model_paras, True)
+
+                x_free_start = get_optim_paras(coeffs_a, coeffs_b, coeffs_edu,
+                    coeffs_home, shocks_cholesky, 'free', paras_fixed, True)
+
+                num_evals = np.random.randint(2, 5)
+                x_batch = np.tile(x_free_start, (num_evals, 1))
+                x_batch += np.random.uniform(-0.01, 0.01, x_batch.shape)
+
+            crit_vals = resfort_interface(respy_obj, 'batch', data_array,
+                x_batch)
+
+            if base_crit_vals is None:
+                base_crit_vals = crit_vals
+            np.testing.assert_equal(base_crit_vals, crit_vals)
+
+            grad = resfort_interface(respy_obj, 'gradient', data_array)
+
+            if base_grad is None:
+                base_grad = grad
+            np.testing.assert_equal(base_grad, grad)
@@ -1,10 +1,27 @@
+from scipy.stats import norm
 import numpy as np
 import pytest
 
 from codes.random_init import generate_init
 
+from respy.python.solve.solve_auxiliary import pyth_calculate_payoffs_systematic
+from respy.python.solve.solve_auxiliary import pyth_backward_induction
+from respy.python.solve.solve_auxiliary import pyth_create_state_space
+from respy.python.evaluate.evaluate_auxiliary import get_smoothed_probability
+from respy.python.shared.shared_auxiliary import dist_class_attributes
 from respy.python.estimate.estimate_auxiliary import get_optim_paras
+from respy.python.shared.shared_auxiliary import dist_model_paras
+from respy.python.evaluate.evaluate_auxiliary import get_obs_index
+from respy.python.evaluate.evaluate_auxiliary import get_normal_pdf
+from respy.python.shared.shared_auxiliary import transform_disturbances
+from respy.python.simulate.simulate_python import pyth_simulate
 from respy.python.shared.shared_auxiliary import dist_optim_paras
+from respy.python.shared.shared_auxiliary import get_total_value
+from respy.python.estimate.estimate_bhhh import fmin_bhhh
+from respy.python.shared.shared_auxiliary import create_draws
+from respy.python.shared.shared_constants import MISSING_FLOAT
+from respy.python.shared.shared_constants import MISSING_INT
+from respy.python.process.process_python import process
 from respy import RespyCls
 from respy import simulate
 
@@ -40,6 +57,10 @@ class TestClass(object):
         edu_max = respy_obj.get_attr('edu_max')
         edu_start = respy_obj.get_attr('edu_start')
 
+        # The container for the states is allocated to the maximum number
+        # of admissible states across all periods.
+        assert (states_all.shape[1] == max(states_number_period))
+
         if edu_max - edu_start < 2:
             return
 
@@ -103,3 +124,287 @@ class TestClass(object):
             base_ini = open('test.respy.ini', 'r').read()
             alt_ini = open('alt.respy.ini', 'r').read()
             assert base_ini == alt_ini
+
+    def test_4(self):
+        """ Testing the compact mapping of the state space against the
+        admissible realizations of the state space.
+        """
+        # Create grid of admissible state space values.
+        num_periods = np.random.randint(1, 10)
+        edu_start = np.random.randint(1, 5)
+        edu_max = edu_start + np.random.randint(1, 5)
+        min_idx = min(num_periods, (edu_max - edu_start + 1))
+
+        states_all, states_number_period, mapping_state_idx, _ = \
+            pyth_create_state_space(num_periods, edu_start, edu_max, min_idx)
+
+        # Scalar and array lookup of all admissible states.
+        for period in range(num_periods):
+            states = states_all[period, :states_number_period[period], :]
+            for k, state in enumerate(states):
+                assert (mapping_state_idx[(period,) + tuple(state)] == k)
+
+            idx = mapping_state_idx[(period,) + tuple(states.T)]
+            np.testing.assert_equal(idx, range(states_number_period[period]))
+
+        # All other realizations are missing in the dense representation.
+        mapping_dense = np.array(mapping_state_idx)
+        assert (mapping_dense.shape == (num_periods, num_periods,
+            num_periods, min_idx, 2))
+        assert (np.sum(mapping_dense != MISSING_INT) ==
+            sum(states_number_period))
+
+        grid = tuple(np.indices(mapping_dense.shape).reshape(5, -1))
+        np.testing.assert_equal(mapping_state_idx[grid], mapping_dense[grid])
+
+        # Coordinates out of bounds are rejected just as by the dense array.
+        for i, size in enumerate(mapping_dense.shape):
+            index = [0, 0, 0, 0, 0]
+            index[i] = size
+            with pytest.raises(IndexError):
+                mapping_state_idx[tuple(index)]
+            with pytest.raises(IndexError):
+                mapping_state_idx[tuple(np.array([value]) for value in index)]
+
+    def test_5(self):
+        """ Testing the precomputed successor states against the lookup of
+        the future states in the dense mapping.
+        """
+        # Create grid of admissible state space values.
+        num_periods = np.random.randint(1, 10)
+        edu_start = np.random.randint(1, 5)
+        edu_max = edu_start + np.random.randint(1, 5)
+        min_idx = min(num_periods, (edu_max - edu_start + 1))
+
+        states_all, states_number_period, mapping_state_idx, _ = \
+            pyth_create_state_space(num_periods, edu_start, edu_max, min_idx)
+
+        mapping_dense = np.array(mapping_state_idx)
+
+        periods_successors = mapping_state_idx.periods_successors
+        periods_inadmissible = mapping_state_idx.periods_inadmissible
+
+        for period in range(num_periods - 1):
+            for k in range(states_number_period[period]):
+                exp_a, exp_b, edu, _ = states_all[period, k, :]
+
+                successors = [
+                    mapping_dense[period + 1, exp_a + 1, exp_b, edu, 0],
+                    mapping_dense[period + 1, exp_a, exp_b + 1, edu, 0],
+                    MISSING_INT,
+                    mapping_dense[period + 1, exp_a, exp_b, edu, 0]]
+
+                is_inadmissible = (edu >= edu_max - edu_start)
+                if not is_inadmissible:
+                    successors[2] = \
+                        mapping_dense[period + 1, exp_a, exp_b, edu + 1, 1]
+
+                assert (periods_inadmissible[period, k] == is_inadmissible)
+                np.testing.assert_equal(periods_successors[period, k, :],
+                    successors)
+
+        # There are no successors in the final period.
+        assert np.all(periods_successors[-1, :, :] == MISSING_INT)
+        assert not np.any(periods_inadmissible[-1, :])
+
+    def test_6(self):
+        """ Testing that the blocks of states in the backward induction do not
+        affect the expected future values.
+        """
+        # Generate random initialization file
+        constraints = dict()
+        constraints['flag_interpolation'] = False
+        constraints['is_myopic'] = False
+
+        generate_init(constraints)
+
+        respy_obj = RespyCls('test.respy.ini')
+
+        num_periods, edu_start, edu_max, min_idx, model_paras, \
+            num_draws_emax, seed_emax, is_debug, delta, num_points_interp = \
+                dist_class_attributes(respy_obj,
+                    'num_periods', 'edu_start', 'edu_max', 'min_idx',
+                    'model_paras', 'num_draws_emax', 'seed_emax', 'is_debug',
+                    'delta', 'num_points_interp')
+
+        coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky = \
+            dist_model_paras(model_paras, is_debug)
+
+        states_all, states_number_period, mapping_state_idx, \
+            max_states_period = pyth_create_state_space(num_periods,
+                edu_start, edu_max, min_idx)
+
+        periods_payoffs_systematic = pyth_calculate_payoffs_systematic(
+            num_periods, states_number_period, states_all, edu_start,
+            coeffs_a, coeffs_b, coeffs_edu, coeffs_home, max_states_period)
+
+        periods_draws_emax = create_draws(num_periods, num_draws_emax,
+            seed_emax, is_debug)
+
+        args = (num_periods, max_states_period, periods_draws_emax,
+            num_draws_emax, states_number_period, periods_payoffs_systematic,
+            edu_max, edu_start, mapping_state_idx, states_all, delta,
+            is_debug, False, num_points_interp, shocks_cholesky)
+
+        # A tiny memory budget results in blocks of a single state.
+        base = pyth_backward_induction(*args)
+        for memory_budget in [1e-6, np.random.uniform(0.001, 0.1)]:
+            alt = pyth_backward_induction(*args + (memory_budget,))
+            np.testing.assert_equal(base, alt)
+
+    def test_7(self):
+        """ Testing the batched auxiliary functions for the evaluation of the
+        likelihood against their scalar counterparts.
+        """
+        # Draw random requests for testing purposes.
+        num_obs, num_draws_prob = np.random.randint(1, 20, size=2)
+        tau = np.random.uniform(0.01, 1000)
+
+        total_payoffs = np.random.normal(size=(num_obs, num_draws_prob, 4))
+        idx = np.random.randint(0, 4, size=num_obs)
+
+        # Smoothed choice probabilities
+        batch = get_smoothed_probability(total_payoffs, idx[:, None], tau)
+        for i in range(num_obs):
+            for s in range(num_draws_prob):
+                scalar = get_smoothed_probability(total_payoffs[i, s, :],
+                    idx[i], tau)
+                np.testing.assert_equal(batch[i, s], scalar)
+
+        # PDF of normal distribution
+        x, mean = np.random.normal(size=(2, num_obs, num_draws_prob))
+        sd = np.random.uniform(0.01, 10)
+
+        np.testing.assert_allclose(get_normal_pdf(x, mean, sd),
+            norm.pdf(x, mean, sd))
+
+    def test_8(self):
+        """ Testing that the observation index maps the estimation sample to
+        the states of the observed agents and groups identical observations.
+        """
+        # Generate random initialization file
+        generate_init()
+
+        respy_obj = RespyCls('test.respy.ini')
+        respy_obj = simulate(respy_obj)
+
+        num_periods, edu_start, num_agents_est, states_all, \
+            mapping_state_idx = dist_class_attributes(respy_obj,
+                'num_periods', 'edu_start', 'num_agents_est', 'states_all',
+                'mapping_state_idx')
+
+        data_array = process(respy_obj).as_matrix()
+
+        obs_index = get_obs_index(data_array, mapping_state_idx,
+            num_agents_est, num_periods, edu_start)
+
+        # The states are all admissible and align with the dataset.
+        periods, states = obs_index['periods'], obs_index['states']
+        assert np.all(states != MISSING_INT)
+
+        coordinates = data_array[:periods.size, 4:].astype(int)
+        coordinates[:, 2] -= edu_start
+
+        np.testing.assert_equal(states_all[periods, states, :], coordinates)
+
+        # Only working observations have a wage.
+        is_working = obs_index['is_working']
+        np.testing.assert_equal(is_working,
+            np.in1d(obs_index['choices'], [1, 2]))
+        assert np.all(np.isfinite(obs_index['wages_log'][is_working]))
+
+        # All observations in the same cell are identical.
+        cells = obs_index['cells']
+        _, first = np.unique(cells, return_index=True)
+        for key_ in ['periods', 'states', 'choices', 'wages_log']:
+            np.testing.assert_equal(obs_index[key_],
+                obs_index[key_][first[cells]])
+
+        # Observations in different cells are distinct.
+        rows = set(zip(*[obs_index[key_] for key_ in ['periods', 'states',
+            'choices', 'wages_log']]))
+        assert (len(rows) == len(first))
+
+    def test_9(self):
+        """ Testing that the BHHH algorithm recovers the maximum likelihood
+        estimates of a normal distribution, where the observations of each
+        agent are independent.
+        """
+        num_agents, num_periods = np.random.randint(50, 100, size=2)
+        sample = np.random.normal(np.random.uniform(-1, 1),
+            np.random.uniform(0.5, 2), size=(num_agents, num_periods))
+
+        def func(x):
+            return norm.pdf(sample, x[0], np.exp(x[1])).flatten()
+
+        def fprime(x):
+            deviations = (sample.flatten() - x[0]) / np.exp(x[1])
+            return np.column_stack((deviations / np.exp(x[1]),
+                deviations ** 2 - 1))
+
+        x, _, _, warnflag = fmin_bhhh(func, fprime, np.zeros(2), (),
+            num_agents, num_periods, 1e-6, 500)
+
+        assert (warnflag == 0)
+        np.testing.assert_allclose(x, [np.mean(sample),
+            np.log(np.std(sample))], atol=1e-4)
+
+    def test_10(self):
+        """ Testing that the simulation of the whole cohort at once is aligned
+        with the traversal of the decision tree by each agent separately.
+        """
+        # Generate random initialization file
+        generate_init()
+
+        respy_obj = RespyCls('test.respy.ini')
+        respy_obj = simulate(respy_obj)
+
+        periods_payoffs_systematic, mapping_state_idx, periods_emax, \
+            states_all, model_paras, num_periods, edu_start, edu_max, delta, \
+            num_agents_sim, seed_sim, is_debug = dist_class_attributes(
+                respy_obj, 'periods_payoffs_systematic', 'mapping_state_idx',
+                'periods_emax', 'states_all', 'model_paras', 'num_periods',
+                'edu_start', 'edu_max', 'delta', 'num_agents_sim', 'seed_sim',
+                'is_debug')
+
+        shocks_cholesky = dist_model_paras(model_paras, is_debug)[-1]
+
+        periods_draws_sims = create_draws(num_periods, num_agents_sim,
+            seed_sim, is_debug)
+
+        dataset = pyth_simulate(periods_payoffs_systematic, mapping_state_idx,
+            periods_emax, states_all, shocks_cholesky, num_periods, edu_start,
+            edu_max, delta, num_agents_sim, periods_draws_sims, seed_sim)
+
+        dataset = dataset.reshape((num_agents_sim, num_periods, 8))
+
+        periods_draws_sims_transformed = [transform_disturbances(
+            periods_draws_sims[period, :, :], shocks_cholesky) for period in
+            range(num_periods)]
+
+        for i in range(num_agents_sim):
+            k = 0
+            for period in range(num_periods):
+                payoffs_systematic = periods_payoffs_systematic[period, k, :]
+                draws = periods_draws_sims_transformed[period][i, :]
+
+                total_payoffs = get_total_value(period, num_periods, delta,
+                    payoffs_systematic, draws, edu_max, edu_start,
+                    mapping_state_idx, periods_emax, k, states_all)
+
+                max_idx = np.argmax(total_payoffs)
+
+                np.testing.assert_equal(dataset[i, period, :3],
+                    [i, period, max_idx + 1])
+                np.testing.assert_equal(dataset[i, period, 4:8],
+                    states_all[period, k, :] + [0, 0, edu_start, 0])
+
+                # Earnings are only recorded for working agents.
+                wage = MISSING_FLOAT
+                if max_idx in [0, 1]:
+                    wage = payoffs_systematic[max_idx] * draws[max_idx]
+                np.testing.assert_equal(dataset[i, period, 3], wage)
+
+                if period != (num_periods - 1):
+                    k = mapping_state_idx.periods_successors[period, k,
+                        max_idx]
@@ -11,13 +11,25 @@ from codes.random_init import generate_init
 from codes.auxiliary import write_draws
 
 from respy.python.solve.solve_auxiliary import pyth_create_state_space
+from respy.python.estimate.estimate_auxiliary import get_optim_paras
+from respy.python.shared.shared_auxiliary import dist_model_paras
 from respy.python.shared.shared_constants import TEST_RESOURCES_DIR
 from respy.python.shared.shared_auxiliary import print_init_dict
+from respy.python.shared.shared_auxiliary import get_log_likl
 from respy.python.shared.shared_constants import IS_FORTRAN
+from respy.python.shared.shared_constants import IS_NUMBA
+from respy.python.process.process_python import process
+from respy.fortran.interface import resfort_interface
+from respy.python.interface import respy_interface
 from respy import estimate
+from respy import evaluate
 from respy import simulate
 from respy import RespyCls
 
+# The NUMBA version is part of the comparisons if the JIT compiler is
+# available.
+VERSIONS_JIT = ['NUMBA'] if IS_NUMBA else []
+
 
 @pytest.mark.skipif(not IS_FORTRAN, reason='No FORTRAN available')
 @pytest.mark.usefixtures('fresh_directory', 'set_seed')
@@ -82,7 +94,7 @@ class TestClass(object):
         # Clean evaluations based on interpolation grid,
         base_val, base_data = None, None
 
-        for version in ['PYTHON', 'FORTRAN']:
+        for version in ['PYTHON', 'FORTRAN'] + VERSIONS_JIT:
             respy_obj = RespyCls('test.respy.ini')
 
             # Modify the version of the program for the different requests.
@@ -145,7 +157,7 @@ class TestClass(object):
         num_periods = init_dict['BASICS']['periods']
         write_draws(num_periods, max_draws)
 
-        for version in ['FORTRAN', 'PYTHON']:
+        for version in ['FORTRAN', 'PYTHON'] + VERSIONS_JIT:
 
             respy_obj.unlock()
 
@@ -172,7 +184,7 @@ class TestClass(object):
         environment is ambiguous or not.
         """
         # Solve specified economy
-        for version in ['FORTRAN', 'PYTHON']:
+        for version in ['FORTRAN', 'PYTHON'] + VERSIONS_JIT:
             respy_obj = RespyCls(TEST_RESOURCES_DIR + '/test_fifth.respy.ini')
 
             respy_obj.unlock()
@@ -197,7 +209,7 @@ class TestClass(object):
         all versions should yield the same result without any additional effort.
         """
         # Solve specified economy
-        for version in ['FORTRAN', 'PYTHON']:
+        for version in ['FORTRAN', 'PYTHON'] + VERSIONS_JIT:
             respy_obj = RespyCls(TEST_RESOURCES_DIR + '/test_fifth.respy.ini')
 
             respy_obj.unlock()
@@ -243,7 +255,7 @@ class TestClass(object):
         num_periods = init_dict['BASICS']['periods']
         write_draws(num_periods, max_draws)
 
-        for version in ['FORTRAN', 'PYTHON']:
+        for version in ['FORTRAN', 'PYTHON'] + VERSIONS_JIT:
 
             respy_obj.unlock()
 
@@ -272,3 +284,176 @@ class TestClass(object):
             if base_est_log is None:
                 base_est_log = open('est.respy.log', 'r').readlines()
             compare_est_log(base_est_log)
+
+    def test_6(self):
+        """ This test ensures that the likelihood contributions are the same
+        for the different versions and align with the criterion function.
+        """
+        max_draws = np.random.randint(10, 100)
+
+        # Generate random initialization file
+        constr = dict()
+        constr['flag_parallelism'] = False
+        constr['max_draws'] = max_draws
+        constr['flag_interpolation'] = False
+        constr['maxfun'] = 0
+
+        init_dict = generate_init(constr)
+
+        num_periods = init_dict['BASICS']['periods']
+        write_draws(num_periods, max_draws)
+
+        respy_obj = RespyCls('test.respy.ini')
+
+        simulate(respy_obj)
+
+        base_contribs = None
+
+        for version in ['FORTRAN', 'PYTHON'] + VERSIONS_JIT:
+
+            respy_obj.unlock()
+
+            respy_obj.set_attr('version', version)
+
+            respy_obj.lock()
+
+            x, crit_val = estimate(respy_obj)
+
+            contribs = evaluate(respy_obj, level='observation')
+
+            if base_contribs is None:
+                base_contribs = contribs
+            np.testing.assert_allclose(base_contribs, contribs)
+
+            # The contributions determine the value of the criterion function.
+            np.testing.assert_allclose(get_log_likl(contribs), crit_val,
+                rtol=1e-05, atol=1e-05)
+
+            # The contributions of an agent are aggregated over all periods.
+            num_agents_est = respy_obj.get_attr('num_agents_est')
+            contribs_agent = evaluate(respy_obj, x, level='agent')
+
+            np.testing.assert_allclose(contribs_agent, np.prod(
+                contribs.reshape(num_agents_est, num_periods), 1))
+
+    def test_7(self):
+        """ This test ensures that the evaluation of the criterion function for
+        a batch of parameter vectors is the same for the different versions
+        and aligns with the evaluation at the starting values.
+        """
+        max_draws = np.random.randint(10, 100)
+
+        # Generate random initialization file
+        constr = dict()
+        constr['flag_parallelism'] = False
+        constr['max_draws'] = max_draws
+        constr['flag_interpolation'] = False
+        constr['maxfun'] = 0
+
+        init_dict = generate_init(constr)
+
+        num_periods = init_dict['BASICS']['periods']
+        write_draws(num_periods, max_draws)
+
+        respy_obj = RespyCls('test.respy.ini')
+
+        simulate(respy_obj)
+
+        data_array = process(respy_obj).as_matrix()
+
+        # The first row of the batch are the starting values.
+        model_paras = respy_obj.get_attr('model_paras')
+        paras_fixed = respy_obj.get_attr('paras_fixed')
+
+        coeffs_a, coeffs_b, coeffs_edu, coeffs_home, shocks_cholesky = \
+            dist_model_paras(model_paras, True)
+
+        x_free_start = get_optim_paras(coeffs_a, coeffs_b, coeffs_edu,
+            coeffs_home, shocks_cholesky, 'free', paras_fixed, True)
+
+        num_evals = np.random.randint(2, 5)
+        x_batch = np.tile(x_free_start, (num_evals, 1))
+        x_batch[1:, :] += np.random.uniform(-0.01, 0.01, (num_evals - 1,
+            len(x_free_start)))
+
+        base_crit_vals = None
+
+        for version in ['FORTRAN', 'PYTHON'] + VERSIONS_JIT:
+
+            respy_obj.unlock()
+
+            respy_obj.set_attr('version', version)
+
+            respy_obj.lock()
+
+            x, crit_val = estimate(respy_obj)
+
+            if version == 'FORTRAN':
+                crit_vals = resfort_interface(respy_obj, 'batch', data_array,
+                    x_batch)
+            else:
+                crit_vals = respy_interface(respy_obj, 'batch', data_array,
+                    x_batch)
+
+            if base_crit_vals is None:
+                base_crit_vals = crit_vals
+            np.testing.assert_allclose(base_crit_vals, crit_vals)
+
+            np.testing.assert_allclose(crit_vals[0], crit_val, rtol=1e-05,
+                atol=1e-05)
+
+    def test_8(self):
+        """ This test ensures that the approximation of the gradient is the
+        same for the different versions and that the perturbed evaluations
+        are not recorded.
+        """
+        max_draws = np.random.randint(10, 100)
+
+        # Generate random initialization file
+        constr = dict()
+        constr['flag_parallelism'] = False
+        constr['max_draws'] = max_draws
+        constr['flag_interpolation'] = False
+        constr['maxfun'] = 0
+
+        init_dict = generate_random_dict(constr)
+
+        # The step size is not too small, so the differences in the evaluation
+        # of the criterion function across versions are not amplified.
+        init_dict['DERIVATIVES']['eps'] = 0.0001
+        print_init_dict(init_dict)
+
+        num_periods = init_dict['BASICS']['periods']
+        write_draws(num_periods, max_draws)
+
+        respy_obj = RespyCls('test.respy.ini')
+
+        simulate(respy_obj)
+
+        data_array = process(respy_obj).as_matrix()
+
+        base_grad = None
+
+        for version in ['FORTRAN', 'PYTHON'] + VERSIONS_JIT:
+
+            respy_obj.unlock()
+
+            respy_obj.set_attr('version', version)
+
+            respy_obj.lock()
+
+            estimate(respy_obj)
+
+            est_log = open('est.respy.log', 'r').read()
+
+            if version == 'FORTRAN':
+                grad = resfort_interface(respy_obj, 'gradient', data_array)
+            else:
+                grad = respy_interface(respy_obj, 'gradient', data_array)
+
+            assert open('est.respy.log', 'r').read() == est_log
+
+            if base_grad is None:
+                base_grad = grad
+            np.testing.assert_allclose(base_grad, grad, rtol=1e-03,
+                atol=1e-03)
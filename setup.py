@@ -54,6 +54,7 @@ def setup_package():
         tests_require=['pytest>=2.9'],
         install_requires=['numpy>=1.11', 'scipy>=0.17', 'pandas>=0.18',
             'statsmodels>=0.6', 'pip>=8.0'],
+        extras_require={'numba': ['numba>=0.45']},
         cmdclass={'build_py': CustomBuildCommand, 'develop':
             CustomDevelopCommand},
         include_package_data=True